@@ -9,11 +9,12 @@ from redis.asyncio import Redis
 from app.supabase_home.client import SupabaseClient
 from app.supabase_home.functions.auth import SupabaseAuthService
 from app.api.deps_supabase import get_current_supabase_superuser
+from app.api.utils.responses import FastJSONResponse
 from app.api.utils.redis_client import get_redis_client
 import logging
 import time
 
-router = APIRouter(tags=["Supabase Auth"])
+router = APIRouter(tags=["Supabase Auth"], default_response_class=FastJSONResponse)
 
 # In-memory store; use Redis/DB for production
 LOCKOUT_TIME = 300  # seconds
@@ -0,0 +1,142 @@
+import inspect
+from typing import Any, Protocol
+
+from fastapi import Depends
+
+from app.api.utils.executor import run_supabase_call
+from app.core.config import settings
+from app.supabase_home.functions.database import SupabaseDatabaseService
+
+from .client import SupabaseClient
+from .filters import to_postgrest
+from .pagination import configured_primary_key
+
+
+class DataService(Protocol):
+    """
+    Database operations behind the /data endpoints; filters use the filter DSL.
+
+    supports_on_conflict tells whether insert_data honours an on_conflict target.
+    """
+
+    supports_on_conflict: bool
+
+    async def fetch_data(
+        self,
+        table: str,
+        select: str = "*",
+        filters: dict[str, Any] | None = None,
+        order: str | None = None,
+        limit: int | None = None,
+        offset: int | None = None,
+    ) -> Any: ...
+
+    async def insert_data(
+        self,
+        table: str,
+        data: dict[str, Any] | list[dict[str, Any]],
+        upsert: bool = False,
+        on_conflict: str | None = None,
+    ) -> Any: ...
+
+    async def update_data(
+        self, table: str, data: dict[str, Any], filters: dict[str, Any]
+    ) -> Any: ...
+
+    async def delete_data(self, table: str, filters: dict[str, Any]) -> Any: ...
+
+    async def call_function(self, name: str, params: dict[str, Any] | None = None) -> Any: ...
+
+    async def primary_key(self, table: str) -> list[str]: ...
+
+
+class SupabaseDataService:
+    """
+    Async view of the Supabase database service for the data API.
+
+    Calls run on the bounded Supabase executor, and filters are rendered from
+    the filter DSL to PostgREST "op.value" parameters (see to_postgrest).
+    """
+
+    def __init__(self, service: SupabaseDatabaseService):
+        self.service = service
+        self.supports_on_conflict = _accepts_keyword(service.insert_data, "on_conflict")
+
+    async def fetch_data(
+        self,
+        table: str,
+        select: str = "*",
+        filters: dict[str, Any] | None = None,
+        order: str | None = None,
+        limit: int | None = None,
+        offset: int | None = None,
+    ) -> Any:
+        return await run_supabase_call(
+            self.service.fetch_data,
+            table,
+            select=select,
+            filters=to_postgrest(filters, table),
+            order=order,
+            limit=limit,
+            offset=offset,
+        )
+
+    async def insert_data(
+        self,
+        table: str,
+        data: dict[str, Any] | list[dict[str, Any]],
+        upsert: bool = False,
+        on_conflict: str | None = None,
+    ) -> Any:
+        if on_conflict and not self.supports_on_conflict:
+            raise ValueError("on_conflict is not supported by the database service")
+        options = {"on_conflict": on_conflict} if on_conflict else {}
+        return await run_supabase_call(
+            self.service.insert_data, table, data=data, upsert=upsert, **options
+        )
+
+    async def update_data(
+        self, table: str, data: dict[str, Any], filters: dict[str, Any]
+    ) -> Any:
+        return await run_supabase_call(
+            self.service.update_data, table, data=data, filters=to_postgrest(filters, table)
+        )
+
+    async def delete_data(self, table: str, filters: dict[str, Any]) -> Any:
+        return await run_supabase_call(
+            self.service.delete_data, table, filters=to_postgrest(filters, table)
+        )
+
+    async def call_function(self, name: str, params: dict[str, Any] | None = None) -> Any:
+        return await run_supabase_call(self.service.call_function, name, params=params)
+
+    async def primary_key(self, table: str) -> list[str]:
+        # PostgREST does not expose table keys, so they come from DATA_PRIMARY_KEYS
+        return configured_primary_key(table)
+
+
+def _accepts_keyword(func: Any, name: str) -> bool:
+    parameters = inspect.signature(func).parameters.values()
+    return any(
+        parameter.name == name or parameter.kind is inspect.Parameter.VAR_KEYWORD
+        for parameter in parameters
+    )
+
+
+def get_supabase_data_service(
+    db_service: SupabaseDatabaseService = Depends(SupabaseClient.get_database_service),
+) -> SupabaseDataService:
+    return SupabaseDataService(db_service)
+
+
+def get_postgres_data_service() -> DataService:
+    # Imported here so Supabase deployments do not need the connection pool package
+    from .postgres import PostgresDatabaseService
+
+    return PostgresDatabaseService()
+
+
+# The data API talks to Postgres directly when the stack has its own database
+get_data_service = (
+    get_postgres_data_service if settings.db_backend == "postgres" else get_supabase_data_service
+)
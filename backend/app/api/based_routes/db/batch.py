@@ -0,0 +1,116 @@
+from typing import TYPE_CHECKING, Annotated, Any, Literal
+
+from pydantic import BaseModel, Field
+
+from .filters import compile_filters
+
+if TYPE_CHECKING:
+    # backends pulls in the Supabase client, which only the routes need
+    from .backends import DataService
+
+# Postgres function applying a batch atomically (see _docs/features/data-api/batch.md)
+BATCH_RPC_FUNCTION = "apply_batch"
+BATCH_MAX_OPERATIONS = 100
+
+
+class BatchInsert(BaseModel):
+    op: Literal["insert"]
+    table: str
+    data: dict[str, Any] | list[dict[str, Any]]
+    upsert: bool = False
+
+
+class BatchUpdate(BaseModel):
+    op: Literal["update"]
+    table: str
+    data: dict[str, Any]
+    # Never empty, so a batch cannot touch every row of a table
+    filters: dict[str, Any] = Field(min_length=1)
+
+
+class BatchDelete(BaseModel):
+    op: Literal["delete"]
+    table: str
+    filters: dict[str, Any] = Field(min_length=1)
+
+
+class BatchRequest(BaseModel):
+    operations: list[
+        Annotated[BatchInsert | BatchUpdate | BatchDelete, Field(discriminator="op")]
+    ] = Field(min_length=1, max_length=BATCH_MAX_OPERATIONS)
+    # Run every operation in one database transaction through the BATCH_RPC_FUNCTION
+    transaction: bool = False
+    stop_on_error: bool = True
+
+
+async def run_batch_transaction(
+    batch: BatchRequest, db_service: "DataService"
+) -> dict[str, Any]:
+    """
+    Apply the whole batch with one call to the BATCH_RPC_FUNCTION.
+
+    The function compares columns for equality (or IS NULL), so only plain
+    filters such as {"id": 7, "deleted_at": null} are accepted.
+
+    Raises:
+        ValueError: If an operation's filters are not plain equality filters
+        Exception: Whatever the database service raised; nothing was applied
+    """
+    for index, operation in enumerate(batch.operations):
+        if isinstance(operation, BatchInsert):
+            continue
+        plan, _ = compile_filters(operation.filters)
+        if not plan.plain:
+            raise ValueError(
+                f"Operation {index}: transactional batches only take equality filters"
+            )
+    results = await db_service.call_function(
+        BATCH_RPC_FUNCTION,
+        params={"operations": [op.model_dump() for op in batch.operations]},
+    )
+    return {
+        "transaction": True,
+        "results": [
+            {"index": index, "status": "ok", "data": data}
+            for index, data in enumerate(results or [])
+        ],
+    }
+
+
+async def run_batch_operations(
+    batch: BatchRequest, db_service: "DataService"
+) -> dict[str, Any]:
+    """
+    Run the operations one after another, reporting each one's outcome.
+
+    With stop_on_error, operations after the first failure are skipped.
+    """
+    results: list[dict[str, Any]] = []
+    failed = False
+    for index, operation in enumerate(batch.operations):
+        if failed and batch.stop_on_error:
+            results.append({"index": index, "status": "skipped"})
+            continue
+        try:
+            if isinstance(operation, BatchInsert):
+                data = await db_service.insert_data(
+                    operation.table,
+                    data=operation.data,
+                    upsert=operation.upsert,
+                )
+            elif isinstance(operation, BatchUpdate):
+                data = await db_service.update_data(
+                    operation.table,
+                    data=operation.data,
+                    filters=operation.filters,
+                )
+            else:
+                data = await db_service.delete_data(
+                    operation.table,
+                    filters=operation.filters,
+                )
+            results.append({"index": index, "status": "ok", "data": data})
+        except Exception as e:
+            failed = True
+            results.append({"index": index, "status": "error", "error": str(e)})
+    return {"transaction": False, "results": results}
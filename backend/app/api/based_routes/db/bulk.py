@@ -0,0 +1,127 @@
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+from typing import Any
+
+from app.api.utils.responses import dumps_json, loads_json
+
+# Defaults for bulk ingest; both bounds apply, whichever a chunk reaches first
+BULK_CHUNK_ROWS = 500
+BULK_CHUNK_BYTES = 1024 * 1024
+BULK_CONCURRENCY = 4
+
+NDJSON_MEDIA_TYPES = ("application/x-ndjson", "application/jsonl", "application/ndjson")
+
+Row = dict[str, Any]
+InsertChunk = Callable[[list[Row]], Awaitable[Any]]
+
+
+def _row_size(row: Row) -> int:
+    return len(dumps_json(row))
+
+
+async def iter_ndjson_rows(stream: AsyncIterator[bytes]) -> AsyncIterator[Row]:
+    """
+    Parse an NDJSON byte stream incrementally, one object per non-empty line.
+
+    Raises:
+        ValueError: If a line is not a JSON object
+    """
+    buffer = b""
+    line_number = 0
+    async for data in stream:
+        buffer += data
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            line_number += 1
+            if line.strip():
+                yield _parse_line(line, line_number)
+    if buffer.strip():
+        yield _parse_line(buffer, line_number + 1)
+
+
+def _parse_line(line: bytes, line_number: int) -> Row:
+    try:
+        row = loads_json(line)
+    except ValueError as e:
+        raise ValueError(f"Invalid JSON on line {line_number}: {str(e)}")
+    if not isinstance(row, dict):
+        raise ValueError(f"Line {line_number} is not a JSON object")
+    return row
+
+
+async def iter_rows(rows: Iterable[Row]) -> AsyncIterator[Row]:
+    for row in rows:
+        yield row
+
+
+async def iter_chunks(
+    rows: AsyncIterator[Row], max_rows: int, max_bytes: int
+) -> AsyncIterator[list[Row]]:
+    """
+    Group rows into chunks bounded by row count and approximate encoded size.
+
+    A single row larger than max_bytes still forms its own chunk.
+    """
+    chunk: list[Row] = []
+    size = 0
+    async for row in rows:
+        row_size = _row_size(row)
+        if chunk and (len(chunk) >= max_rows or size + row_size > max_bytes):
+            yield chunk
+            chunk, size = [], 0
+        chunk.append(row)
+        size += row_size
+    if chunk:
+        yield chunk
+
+
+async def run_chunks(
+    chunks: AsyncIterator[list[Row]], insert_chunk: InsertChunk, concurrency: int
+) -> dict[str, Any]:
+    """
+    Insert chunks concurrently with at most `concurrency` requests in flight.
+
+    The next chunk is only read once a slot frees up, so a streamed upload is
+    consumed at the pace the database accepts it. A failed chunk does not stop
+    the others; chunks still in flight are cancelled if the caller goes away.
+
+    Returns:
+        Per-chunk results plus inserted/failed row counts, and an "error" entry
+        if the input turned out to be malformed part-way through
+    """
+    window = asyncio.Semaphore(concurrency)
+    tasks: list[asyncio.Task] = []
+
+    async def run(index: int, chunk: list[Row]) -> dict[str, Any]:
+        try:
+            await insert_chunk(chunk)
+            return {"chunk": index, "rows": len(chunk), "status": "ok"}
+        except Exception as e:
+            return {"chunk": index, "rows": len(chunk), "status": "error", "error": str(e)}
+        finally:
+            window.release()
+
+    input_error = None
+    try:
+        try:
+            index = 0
+            async for chunk in chunks:
+                await window.acquire()
+                tasks.append(asyncio.create_task(run(index, chunk)))
+                index += 1
+        except ValueError as e:
+            # Chunks already sent still finish; the caller learns where the input broke
+            input_error = str(e)
+        results = await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    summary: dict[str, Any] = {
+        "inserted": sum(r["rows"] for r in results if r["status"] == "ok"),
+        "failed": sum(r["rows"] for r in results if r["status"] == "error"),
+        "chunks": results,
+    }
+    if input_error is not None:
+        summary["error"] = input_error
+    return summary
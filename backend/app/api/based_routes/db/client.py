@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, FastAPI
 from fastapi_limiter.depends import RateLimiter
 
+from app.api.utils.responses import FastJSONResponse
 from app.supabase_home.client import SupabaseClient
 from app.supabase_home.functions.auth import SupabaseAuthService
 from app.supabase_home.functions.database import SupabaseDatabaseService
@@ -11,9 +12,10 @@ from app.supabase_home.functions.storage import SupabaseStorageService
 app = FastAPI(
     title="SupabaseClientBase",
     description="API to interact with current supabase client",
+    default_response_class=FastJSONResponse,
 )
 
-router = APIRouter(tags=["Supabase Client"])
+router = APIRouter(tags=["Supabase Client"], default_response_class=FastJSONResponse)
 
 
 @app.get("/auth")
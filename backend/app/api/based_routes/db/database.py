@@ -1,21 +1,58 @@
 from typing import Any
 
-from fastapi import APIRouter, Depends, FastAPI, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 
+from app.api.utils.executor import run_supabase_call
+from app.api.utils.responses import FastJSONResponse, loads_json
 from app.supabase_home.functions.database import SupabaseDatabaseService
 
+from .bulk import (
+    BULK_CHUNK_BYTES,
+    BULK_CHUNK_ROWS,
+    BULK_CONCURRENCY,
+    NDJSON_MEDIA_TYPES,
+    iter_chunks,
+    iter_ndjson_rows,
+    iter_rows,
+    run_chunks,
+)
+from .backends import DataService, get_data_service
+from .batch import BatchRequest, run_batch_operations, run_batch_transaction
 from .client import SupabaseClient
+from .export import EXPORT_MEDIA_TYPES, ExportFormat, encode_pages, encode_rows
+from .pagination import (
+    decode_cursor,
+    encode_cursor,
+    ensure_selected,
+    iter_keyset_pages,
+    order_clause,
+    parse_order,
+    sort_values,
+    with_keyset_filter,
+)
+from .projection import resolve_select, to_columns
+from .query_cache import cached_query, invalidate_query_cache
 
-router = APIRouter(tags=["Supabase DB"])
+router = APIRouter(tags=["Supabase DB"], default_response_class=FastJSONResponse)
+
+# Rows fetched per round-trip when streaming an export
+EXPORT_PAGE_SIZE = 1000
+# Page size for cursor pagination when the request sets no limit
+DEFAULT_PAGE_LIMIT = 100
 
 app = FastAPI(
-    title="SupabaseDatabaseAPI", description="API to interact with current database"
+    title="SupabaseDatabaseAPI",
+    description="API to interact with current database",
+    default_response_class=FastJSONResponse,
 )
 
 
 class DataFilter(BaseModel):
+    # {"col": value} for equality, {"col": {"gte": 1, "lt": 9}}, {"col": {"in": [...]}},
+    # {"col": {"like": "a%"}}, {"col": {"is": null}}, {"col": {"isnot": null}},
+    # and {"or": [{...}, {...}]} / {"and": [...]}
     filters: dict[str, Any] | None = None
     order: str | None = None
     limit: int | None = None
@@ -42,7 +79,7 @@ class FunctionCall(BaseModel):
 
 @app.exception_handler(Exception)
 async def generic_exception_handler(request, exc):
-    return JSONResponse(
+    return FastJSONResponse(
         status_code=500, content={"message": f"An error occurred: {str(exc)}"}
     )
 
@@ -50,71 +87,296 @@ async def generic_exception_handler(request, exc):
 @app.get("/data/{table}")
 async def fetch_data(
     table: str,
+    request: Request,
     select: str = "*",
     filter_data: DataFilter = Depends(),
-    db_service: SupabaseDatabaseService = Depends(SupabaseClient.get_database_service),
+    export_format: ExportFormat = Query("json", alias="format"),
+    stream: bool = False,
+    page_size: int = Query(EXPORT_PAGE_SIZE, ge=1, le=10_000),
+    cursor: str | None = None,
+    fields: str | None = None,
+    db_service: DataService = Depends(get_data_service),
 ):
     try:
-        return db_service.fetch_data(
+        select = resolve_select(table, select, fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if stream:
+        return await _stream_data(
+            table, select, filter_data, export_format, page_size, db_service
+        )
+    if cursor is not None:
+        page = await _fetch_page(request, table, select, filter_data, cursor, db_service)
+        if export_format == "columns":
+            page["data"] = to_columns(page["data"])
+        return FastJSONResponse(page)
+    key_args = (
+        select,
+        filter_data.filters,
+        filter_data.order,
+        filter_data.limit,
+        filter_data.offset,
+    )
+    try:
+        rows = await cached_query(
+            request,
+            table,
+            key_args,
+            lambda: db_service.fetch_data(
+                table,
+                select=select,
+                filters=filter_data.filters,
+                order=filter_data.order,
+                limit=filter_data.limit,
+                offset=filter_data.offset,
+            ),
+        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if export_format == "json":
+        return FastJSONResponse(rows)
+    return Response(
+        encode_rows(rows, export_format), media_type=EXPORT_MEDIA_TYPES[export_format]
+    )
+
+
+async def _fetch_page(
+    request: Request,
+    table: str,
+    select: str,
+    filter_data: DataFilter,
+    cursor: str,
+    db_service: DataService,
+) -> dict[str, Any]:
+    """
+    Fetch one keyset page; an empty cursor starts from the beginning.
+    """
+    if filter_data.offset:
+        raise HTTPException(
+            status_code=400, detail="offset cannot be combined with cursor pagination"
+        )
+    limit = filter_data.limit or DEFAULT_PAGE_LIMIT
+    try:
+        keys = parse_order(filter_data.order, await db_service.primary_key(table))
+        filters = filter_data.filters
+        if cursor:
+            filters = with_keyset_filter(filters, keys, decode_cursor(cursor, keys))
+        columns = ensure_selected(select, keys)
+        order = order_clause(keys)
+        # One extra row tells whether another page exists
+        rows = await cached_query(
+            request,
+            table,
+            (columns, filters, order, limit + 1, None),
+            lambda: db_service.fetch_data(
+                table,
+                select=columns,
+                filters=filters,
+                order=order,
+                limit=limit + 1,
+            ),
+        )
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(keys, sort_values(rows[-1], keys))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return {"data": rows, "next_cursor": next_cursor}
+
+
+async def _stream_data(
+    table: str,
+    select: str,
+    filter_data: DataFilter,
+    export_format: ExportFormat,
+    page_size: int,
+    db_service: DataService,
+) -> StreamingResponse:
+    if filter_data.offset:
+        raise HTTPException(
+            status_code=400, detail="offset cannot be combined with stream=true"
+        )
+    if export_format == "columns":
+        raise HTTPException(
+            status_code=400, detail="format=columns cannot be combined with stream=true"
+        )
+    try:
+        keys = parse_order(filter_data.order, await db_service.primary_key(table))
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    columns = ensure_selected(select, keys)
+
+    async def fetch_page(filters: dict[str, Any] | None, limit: int):
+        return await db_service.fetch_data(
             table,
-            select=select,
-            filters=filter_data.filters,
-            order=filter_data.order,
-            limit=filter_data.limit,
-            offset=filter_data.offset,
+            select=columns,
+            filters=filters,
+            order=order_clause(keys),
+            limit=limit,
         )
+
+    pages = iter_keyset_pages(
+        fetch_page, filter_data.filters, keys, page_size, max_rows=filter_data.limit
+    )
+    # Fetch the first page before responding so query errors still surface as a 400
+    try:
+        first_page = await anext(pages, None)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+    async def all_pages():
+        if first_page is not None:
+            yield first_page
+            async for page in pages:
+                yield page
+
+    return StreamingResponse(
+        encode_pages(all_pages(), export_format),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+    )
+
+
+@app.post("/data/_batch")
+async def batch_data(
+    batch: BatchRequest,
+    db_service: DataService = Depends(get_data_service),
+):
+    """
+    Run an ordered list of insert/update/delete operations in one request.
+
+    With transaction=true the whole batch is applied by one Postgres function
+    call and either fully commits or fails with a 400. Otherwise operations run
+    one after another; with stop_on_error the ones after a failure are skipped.
+    """
+    tables = {operation.table for operation in batch.operations}
+    try:
+        if batch.transaction:
+            try:
+                result = await run_batch_transaction(batch, db_service)
+            except Exception as e:
+                raise HTTPException(status_code=400, detail=str(e))
+        else:
+            result = await run_batch_operations(batch, db_service)
+        return FastJSONResponse(result)
+    finally:
+        await invalidate_query_cache(*tables)
+
 
 @app.post("/data/{table}")
 async def insert_data(
     table: str,
     insert_data: InsertData,
-    db_service: SupabaseDatabaseService = Depends(SupabaseClient.get_database_service),
+    db_service: DataService = Depends(get_data_service),
 ):
     try:
-        return db_service.insert_data(
-            table, data=insert_data.data, upsert=insert_data.upsert
+        result = await db_service.insert_data(
+            table,
+            data=insert_data.data,
+            upsert=insert_data.upsert,
         )
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
+    await invalidate_query_cache(table)
+    return FastJSONResponse(result)
+
+
+@app.post("/data/{table}/bulk")
+async def bulk_insert_data(
+    table: str,
+    request: Request,
+    upsert: bool = False,
+    on_conflict: str | None = None,
+    chunk_rows: int = Query(BULK_CHUNK_ROWS, ge=1, le=10_000),
+    chunk_bytes: int = Query(BULK_CHUNK_BYTES, ge=1024, le=16 * 1024 * 1024),
+    concurrency: int = Query(BULK_CONCURRENCY, ge=1, le=16),
+    db_service: DataService = Depends(get_data_service),
+):
+    """
+    Bulk insert or upsert rows sent as a JSON array or as NDJSON.
+
+    Rows are split into chunks bounded by chunk_rows and chunk_bytes and sent
+    with at most `concurrency` requests in flight. NDJSON bodies are parsed as
+    they stream in. Responds 207 when some chunks failed.
+    """
+    if on_conflict and not db_service.supports_on_conflict:
+        raise HTTPException(
+            status_code=400, detail="on_conflict is not supported by this database backend"
+        )
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if content_type in NDJSON_MEDIA_TYPES:
+        rows = iter_ndjson_rows(request.stream())
+    else:
+        try:
+            data = loads_json(await request.body())
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid JSON body: {str(e)}")
+        if not isinstance(data, list) or not all(isinstance(row, dict) for row in data):
+            raise HTTPException(status_code=400, detail="Body must be a JSON array of objects")
+        rows = iter_rows(data)
+
+    async def insert_chunk(chunk: list[dict[str, Any]]):
+        return await db_service.insert_data(
+            table,
+            data=chunk,
+            upsert=upsert or bool(on_conflict),
+            on_conflict=on_conflict,
+        )
+
+    summary = await run_chunks(
+        iter_chunks(rows, chunk_rows, chunk_bytes), insert_chunk, concurrency
+    )
+    if summary["inserted"]:
+        await invalidate_query_cache(table)
+    if not summary["chunks"] and "error" in summary:
+        raise HTTPException(status_code=400, detail=summary["error"])
+    status_code = 207 if summary["failed"] or "error" in summary else 200
+    return FastJSONResponse(content=summary, status_code=status_code)
 
 
 @app.patch("/data/{table}")
 async def update_data(
     table: str,
     update_data: UpdateData,
-    db_service: SupabaseDatabaseService = Depends(SupabaseClient.get_database_service),
+    db_service: DataService = Depends(get_data_service),
 ):
     try:
-        return db_service.update_data(
-            table, data=update_data.data, filters=update_data.filters
+        result = await db_service.update_data(
+            table,
+            data=update_data.data,
+            filters=update_data.filters,
         )
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
+    await invalidate_query_cache(table)
+    return FastJSONResponse(result)
 
 
 @app.delete("/data/{table}")
 async def delete_data(
     table: str,
     delete_filter: DeleteFilter,
-    db_service: SupabaseDatabaseService = Depends(SupabaseClient.get_database_service),
+    db_service: DataService = Depends(get_data_service),
 ):
     try:
-        return db_service.delete_data(table, filters=delete_filter.filters)
+        result = await db_service.delete_data(table, filters=delete_filter.filters)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
+    await invalidate_query_cache(table)
+    return FastJSONResponse(result)
 
 
 @app.post("/function/{function_name}")
 async def call_function(
     function_name: str,
     function_call: FunctionCall,
-    db_service: SupabaseDatabaseService = Depends(SupabaseClient.get_database_service),
+    db_service: DataService = Depends(get_data_service),
 ):
     try:
-        return db_service.call_function(function_name, params=function_call.params)
+        result = await db_service.call_function(
+            function_name, params=function_call.params
+        )
+        return FastJSONResponse(result)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -125,9 +387,11 @@ async def create_test_table(
     db_service: SupabaseDatabaseService = Depends(SupabaseClient.get_database_service),
 ):
     try:
-        return db_service.create_test_table(table)
+        result = await run_supabase_call(db_service.create_test_table, table)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
+    await invalidate_query_cache(table)
+    return FastJSONResponse(result)
 
 
 @app.delete("/table/{table}")
@@ -136,6 +400,8 @@ async def delete_table(
     db_service: SupabaseDatabaseService = Depends(SupabaseClient.get_database_service),
 ):
     try:
-        return db_service.delete_table(table)
+        result = await run_supabase_call(db_service.delete_table, table)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
+    await invalidate_query_cache(table)
+    return FastJSONResponse(result)
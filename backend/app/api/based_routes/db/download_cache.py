@@ -0,0 +1,199 @@
+import asyncio
+import collections
+import contextlib
+import dataclasses
+import hashlib
+import os
+import shutil
+import socket
+import tempfile
+from collections.abc import AsyncIterator, Mapping
+
+from prometheus_client import Counter, Gauge
+
+# Read-through disk cache for storage downloads; off unless STORAGE_CACHE_DIR is set
+STORAGE_CACHE_DIR = os.getenv("STORAGE_CACHE_DIR", "")
+STORAGE_CACHE_MAX_BYTES = int(os.getenv("STORAGE_CACHE_MAX_BYTES", 1024 * 1024 * 1024))
+# Larger objects are always streamed from Storage
+STORAGE_CACHE_MAX_OBJECT_BYTES = int(
+    os.getenv("STORAGE_CACHE_MAX_OBJECT_BYTES", 64 * 1024 * 1024)
+)
+
+DOWNLOAD_CACHE_REQUESTS = Counter(
+    "storage_download_cache_requests",
+    "Cacheable storage downloads, by whether they were served from disk",
+    ["result"],
+)
+DOWNLOAD_CACHE_BYTES_SAVED = Counter(
+    "storage_download_cache_bytes_saved",
+    "Object bytes served from the disk cache instead of Supabase Storage",
+)
+DOWNLOAD_CACHE_SIZE_BYTES = Gauge(
+    "storage_download_cache_size_bytes",
+    "Bytes of distinct objects held in the disk cache",
+)
+
+
+@dataclasses.dataclass(frozen=True)
+class CachedObject:
+    digest: str
+    size: int
+    etag: str | None
+    last_modified: str | None
+    content_type: str | None
+
+
+class DownloadCache:
+    """
+    Objects downloaded from Supabase Storage, kept on local disk.
+
+    Files are named by the SHA-256 of their content, so the same bytes under
+    several paths are stored once. Entries are evicted least recently used
+    first once the distinct bytes exceed max_bytes. Each process keeps its
+    own subdirectory, named "<hostname>-<pid>", since the index lives in memory.
+    """
+
+    def __init__(self, directory: str, max_bytes: int, max_object_bytes: int):
+        hostname = socket.gethostname()
+        _remove_stale_directories(directory, hostname)
+        self.directory = os.path.join(directory, f"{hostname}-{os.getpid()}")
+        shutil.rmtree(self.directory, ignore_errors=True)
+        os.makedirs(self.directory)
+        self.max_bytes = max_bytes
+        self.max_object_bytes = max_object_bytes
+        self._entries: collections.OrderedDict[tuple[str, str], CachedObject] = (
+            collections.OrderedDict()
+        )
+        self._references: collections.Counter[str] = collections.Counter()
+        self._blob_sizes: dict[str, int] = {}
+        self._size = 0
+
+    def get(self, bucket_id: str, path: str) -> CachedObject | None:
+        entry = self._entries.get((bucket_id, path))
+        if entry is not None:
+            self._entries.move_to_end((bucket_id, path))
+        return entry
+
+    def file_path(self, entry: CachedObject) -> str:
+        return os.path.join(self.directory, entry.digest)
+
+    @staticmethod
+    def validators(entry: CachedObject) -> dict[str, str]:
+        """
+        Conditional request headers asking Storage whether the cached copy is current.
+        """
+        if entry.etag:
+            return {"if-none-match": entry.etag}
+        return {"if-modified-since": entry.last_modified or ""}
+
+    @staticmethod
+    def record_hit(entry: CachedObject, sent_body: bool) -> None:
+        DOWNLOAD_CACHE_REQUESTS.labels("hit").inc()
+        if sent_body:
+            DOWNLOAD_CACHE_BYTES_SAVED.inc(entry.size)
+
+    @staticmethod
+    def record_miss() -> None:
+        DOWNLOAD_CACHE_REQUESTS.labels("miss").inc()
+
+    def cacheable(self, headers: Mapping[str, str]) -> bool:
+        length = headers.get("content-length", "")
+        return (
+            length.isdigit()
+            and int(length) <= self.max_object_bytes
+            and headers.get("content-encoding", "identity") == "identity"
+            and ("etag" in headers or "last-modified" in headers)
+        )
+
+    async def fill(
+        self,
+        bucket_id: str,
+        path: str,
+        chunks: AsyncIterator[bytes],
+        headers: Mapping[str, str],
+    ) -> AsyncIterator[bytes]:
+        """
+        Pass an object's body through while writing it to the cache.
+
+        The object is only added once the whole body went by; a download cut
+        short leaves nothing behind.
+        """
+        digest = hashlib.sha256()
+        size = 0
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                async for chunk in chunks:
+                    digest.update(chunk)
+                    size += len(chunk)
+                    await asyncio.to_thread(file.write, chunk)
+                    yield chunk
+            entry = CachedObject(
+                digest=digest.hexdigest(),
+                size=size,
+                etag=headers.get("etag"),
+                last_modified=headers.get("last-modified"),
+                content_type=headers.get("content-type"),
+            )
+            self._put((bucket_id, path), entry, temp_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def _put(self, key: tuple[str, str], entry: CachedObject, temp_path: str) -> None:
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._release(previous.digest)
+        if self._references[entry.digest] == 0:
+            os.replace(temp_path, self.file_path(entry))
+            self._blob_sizes[entry.digest] = entry.size
+            self._size += entry.size
+        self._references[entry.digest] += 1
+        self._entries[key] = entry
+        while self._size > self.max_bytes and self._entries:
+            _, evicted = self._entries.popitem(last=False)
+            self._release(evicted.digest)
+        DOWNLOAD_CACHE_SIZE_BYTES.set(self._size)
+
+    def _release(self, digest: str) -> None:
+        self._references[digest] -= 1
+        if self._references[digest] > 0:
+            return
+        del self._references[digest]
+        self._size -= self._blob_sizes.pop(digest)
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(os.path.join(self.directory, digest))
+
+
+def _remove_stale_directories(directory: str, hostname: str) -> None:
+    # Subdirectories left behind by processes on this host that are no longer running.
+    # Other hosts sharing the volume have their own PIDs, so their directories are left alone.
+    if not os.path.isdir(directory):
+        return
+    for name in os.listdir(directory):
+        owner, _, pid = name.rpartition("-")
+        if owner == hostname and pid.isdigit() and not _process_running(int(pid)):
+            shutil.rmtree(os.path.join(directory, name), ignore_errors=True)
+
+
+def _process_running(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Exists, owned by someone else
+        pass
+    return True
+
+
+_cache: DownloadCache | None = None
+
+
+def get_download_cache() -> DownloadCache | None:
+    global _cache
+    if _cache is None and STORAGE_CACHE_DIR:
+        _cache = DownloadCache(
+            STORAGE_CACHE_DIR, STORAGE_CACHE_MAX_BYTES, STORAGE_CACHE_MAX_OBJECT_BYTES
+        )
+    return _cache
@@ -0,0 +1,92 @@
+from collections.abc import Mapping
+
+import httpx
+from fastapi import HTTPException, Request, Response
+from fastapi.responses import FileResponse, StreamingResponse
+from starlette.background import BackgroundTask
+
+from .download_cache import CachedObject, DownloadCache, get_download_cache
+from .storage_client import STORAGE_CHUNK_BYTES, download_headers, open_download
+
+
+async def stream_download(request: Request, bucket_id: str, path: str) -> Response:
+    """
+    Answer a download request from Supabase Storage, or from the disk cache when it is on.
+
+    Range requests always go to Storage, since the cache only serves whole
+    objects. Other requests are checked against a cached copy with the
+    caller's Authorization header, so a copy is only served to callers Storage
+    would serve it to. When the copy is stale, the answer to that check holds
+    the new object and is streamed on, refilling the cache, instead of being
+    fetched a second time.
+    """
+    cache = get_download_cache()
+    authorization = request.headers.get("authorization")
+    if cache is None or "range" in request.headers:
+        upstream = await _open_download(bucket_id, path, request.headers, authorization)
+        return await _relay_download(upstream)
+
+    entry = cache.get(bucket_id, path)
+    cache_headers: Mapping[str, str]
+    if entry is not None:
+        cache_headers = cache.validators(entry)
+    else:
+        # Cached copies are stored unencoded, so ask for the plain body
+        cache_headers = {k: v for k, v in request.headers.items() if k != "accept-encoding"}
+    upstream = await _open_download(bucket_id, path, cache_headers, authorization)
+    if entry is not None and upstream.status_code == 304:
+        await upstream.aclose()
+        return _cached_download(request, cache, entry)
+    cache.record_miss()
+    return await _relay_download(upstream, cache, bucket_id, path)
+
+
+async def _open_download(
+    bucket_id: str, path: str, headers: Mapping[str, str], authorization: str | None
+) -> httpx.Response:
+    try:
+        return await open_download(bucket_id, path, headers, authorization=authorization)
+    except Exception as e:
+        raise HTTPException(status_code=502, detail=str(e))
+
+
+async def _relay_download(
+    upstream: httpx.Response,
+    cache: DownloadCache | None = None,
+    bucket_id: str = "",
+    path: str = "",
+) -> StreamingResponse:
+    """
+    Stream a Storage response to the client, filling the cache on the way when it can.
+    """
+    if upstream.status_code >= 400 and upstream.status_code != 416:
+        detail = (await upstream.aread()).decode(errors="replace")
+        await upstream.aclose()
+        # Storage reports missing objects as 400 as well as 404
+        status_code = 404 if upstream.status_code in (400, 404) else upstream.status_code
+        raise HTTPException(status_code=status_code, detail=detail)
+    body = upstream.aiter_raw(STORAGE_CHUNK_BYTES)
+    if cache is not None and upstream.status_code == 200 and cache.cacheable(upstream.headers):
+        body = cache.fill(bucket_id, path, body, upstream.headers)
+    return StreamingResponse(
+        body,
+        status_code=upstream.status_code,
+        headers=download_headers(upstream),
+        background=BackgroundTask(upstream.aclose),
+    )
+
+
+def _cached_download(request: Request, cache: DownloadCache, entry: CachedObject) -> Response:
+    headers = {"accept-ranges": "bytes"}
+    if entry.etag:
+        headers["etag"] = entry.etag
+    if entry.last_modified:
+        headers["last-modified"] = entry.last_modified
+    if entry.etag and request.headers.get("if-none-match") == entry.etag:
+        cache.record_hit(entry, sent_body=False)
+        return Response(status_code=304, headers=headers)
+    cache.record_hit(entry, sent_body=True)
+    # Whole objects only (Range requests never get here); the server sends the file itself
+    return FileResponse(
+        cache.file_path(entry), media_type=entry.content_type, headers=headers
+    )
@@ -2,15 +2,18 @@ from typing import Any
 
 from fastapi import APIRouter, Depends, FastAPI, HTTPException
 
+from app.api.utils.executor import run_supabase_call
+from app.api.utils.responses import FastJSONResponse
 from app.supabase_home.functions.edge_functions import SupabaseEdgeFunctionsService
 
 from .client import SupabaseClient
 
-router = APIRouter(tags=["Supabase DB"])
+router = APIRouter(tags=["Supabase DB"], default_response_class=FastJSONResponse)
 
 app = FastAPI(
     title="SupabaseEdgeFunctionsAPI",
     description="API to interact with current edge functions",
+    default_response_class=FastJSONResponse,
 )
 
 
@@ -23,10 +26,12 @@ async def invoke_function(
     ),
 ):
     try:
-        response = edge_functions_service.invoke_function(
-            function_name=function_name, body=body
+        response = await run_supabase_call(
+            edge_functions_service.invoke_function,
+            function_name=function_name,
+            body=body,
         )
-        return response
+        return FastJSONResponse(response)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -38,8 +43,8 @@ async def list_functions(
     ),
 ):
     try:
-        functions = edge_functions_service.list_functions()
-        return functions
+        functions = await run_supabase_call(edge_functions_service.list_functions)
+        return FastJSONResponse(functions)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -55,13 +60,14 @@ async def create_function(
     ),
 ):
     try:
-        response = edge_functions_service.create_function(
+        response = await run_supabase_call(
+            edge_functions_service.create_function,
             name=name,
             source_code=source_code,
             verify_jwt=verify_jwt,
             import_map=import_map,
         )
-        return response
+        return FastJSONResponse(response)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -74,8 +80,10 @@ async def delete_function(
     ),
 ):
     try:
-        response = edge_functions_service.delete_function(function_name)
-        return response
+        response = await run_supabase_call(
+            edge_functions_service.delete_function, function_name
+        )
+        return FastJSONResponse(response)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -88,8 +96,10 @@ async def get_function(
     ),
 ):
     try:
-        function = edge_functions_service.get_function(function_name)
-        return function
+        function = await run_supabase_call(
+            edge_functions_service.get_function, function_name
+        )
+        return FastJSONResponse(function)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -105,12 +115,13 @@ async def update_function(
     ),
 ):
     try:
-        response = edge_functions_service.update_function(
+        response = await run_supabase_call(
+            edge_functions_service.update_function,
             function_name=function_name,
             source_code=source_code,
             verify_jwt=verify_jwt,
             import_map=import_map,
         )
-        return response
+        return FastJSONResponse(response)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,81 @@
+import csv
+import io
+from collections.abc import AsyncIterator, Iterable
+from typing import Any, Literal
+
+from app.api.utils.responses import dumps_json as _dumps
+
+from .projection import to_columns
+
+ExportFormat = Literal["json", "ndjson", "csv", "columns"]
+
+EXPORT_MEDIA_TYPES: dict[str, str] = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+    "columns": "application/json",
+}
+
+
+def _csv_value(value: Any) -> Any:
+    # Nested JSON columns are written as JSON text rather than Python reprs
+    return _dumps(value).decode() if isinstance(value, dict | list) else value
+
+
+class _CsvEncoder:
+    def __init__(self) -> None:
+        self.columns: list[str] | None = None
+
+    def encode(self, rows: list[dict[str, Any]]) -> bytes:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        if self.columns is None:
+            if not rows:
+                return b""
+            # Columns come from the first row; later rows are aligned to them
+            self.columns = list(rows[0])
+            writer.writerow(self.columns)
+        for row in rows:
+            writer.writerow([_csv_value(row.get(column)) for column in self.columns])
+        return buffer.getvalue().encode()
+
+
+async def encode_pages(
+    pages: AsyncIterator[list[dict[str, Any]]], export_format: ExportFormat
+) -> AsyncIterator[bytes]:
+    """
+    Encode pages of rows as they arrive, one chunk per page.
+
+    Only the current page is held in memory, so exports of any size run in
+    constant memory when fed from a paged source.
+    """
+    if export_format == "csv":
+        encoder = _CsvEncoder()
+        async for rows in pages:
+            yield encoder.encode(rows)
+    elif export_format == "ndjson":
+        async for rows in pages:
+            yield b"".join(_dumps(row) + b"\n" for row in rows)
+    else:
+        first = True
+        yield b"["
+        async for rows in pages:
+            if rows:
+                chunk = b",".join(_dumps(row) for row in rows)
+                yield chunk if first else b"," + chunk
+                first = False
+        yield b"]"
+
+
+def encode_rows(rows: Iterable[dict[str, Any]], export_format: ExportFormat) -> bytes:
+    """
+    Encode an in-memory result in the given format.
+    """
+    rows = list(rows)
+    if export_format == "csv":
+        return _CsvEncoder().encode(rows)
+    if export_format == "ndjson":
+        return b"".join(_dumps(row) + b"\n" for row in rows)
+    if export_format == "columns":
+        return _dumps(to_columns(rows))
+    return _dumps(rows)
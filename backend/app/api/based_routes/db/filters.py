@@ -0,0 +1,375 @@
+import functools
+import itertools
+import json
+import logging
+import os
+import re
+import threading
+from typing import Any, NamedTuple
+
+logger = logging.getLogger(__name__)
+
+# Compiled filter plans kept per process, keyed by filter shape (structure without values)
+FILTER_PLAN_CACHE_SIZE = int(os.getenv("FILTER_PLAN_CACHE_SIZE", 1024))
+
+_COLUMN_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_LOGICAL = ("and", "or")
+_SQL_OPERATORS = {
+    "eq": "=",
+    "neq": "<>",
+    "gt": ">",
+    "gte": ">=",
+    "lt": "<",
+    "lte": "<=",
+    "like": "LIKE",
+    "ilike": "ILIKE",
+}
+_IS_OPERATORS = {"is": "IS", "isnot": "IS NOT"}
+_OPERATORS = frozenset({*_SQL_OPERATORS, *_IS_OPERATORS, "in"})
+_IS_LITERALS = {"null": "NULL", "true": "TRUE", "false": "FALSE"}
+
+# Characters with a meaning inside PostgREST logic trees; values containing them are quoted
+_RESERVED = set(',()." :')
+
+# How a bound value is written into a PostgREST parameter
+_RAW, _QUOTED, _LIST = "raw", "quoted", "list"
+# Shape of {"col": null}, which binds no value
+_NULL = "null"
+
+
+class FilterPlan(NamedTuple):
+    """
+    A filter shape compiled to both backends.
+
+    sql has one %s placeholder per bound value; params are PostgREST query
+    parameters whose values hold "{n}" slots, formatted per slot_kinds. plain
+    is set when every entry is a column equal to a value or to null.
+    """
+
+    sql: str
+    params: tuple[tuple[str, str], ...]
+    slot_kinds: tuple[str, ...]
+    columns: frozenset[str]
+    plain: bool
+
+
+def check_column(column: str) -> None:
+    if not _COLUMN_NAME.match(column):
+        raise ValueError(f"Invalid column name {column!r}")
+
+
+def _is_literal(value: Any) -> str:
+    if value is None:
+        return "null"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    raise ValueError('"is" and "isnot" only accept null, true or false')
+
+
+def _shape(filters: Any) -> list:
+    """
+    Validate filters and reduce them to their structure, dropping the values.
+
+    Filter objects map columns to either a value (equality) or an object of
+    operators ({"gte": 1, "lt": 10}, {"in": [...]}, {"like": "a%"}, {"is": null},
+    {"isnot": null}),
+    and "and"/"or" to lists of filter objects.
+    """
+    if not isinstance(filters, dict):
+        raise ValueError("Filters must be an object")
+    shape = []
+    for key in sorted(filters):
+        value = filters[key]
+        if key in _LOGICAL:
+            if not isinstance(value, list) or not value:
+                raise ValueError(f'"{key}" takes a non-empty list of filter objects')
+            shape.append([key, [_shape(item) for item in value]])
+            continue
+        check_column(key)
+        if value is None:
+            # Equality with null can only mean IS NULL
+            shape.append([key, _NULL])
+            continue
+        if not isinstance(value, dict):
+            shape.append([key, None])
+            continue
+        if not value:
+            raise ValueError(f"No filter operators given for {key}")
+        operators = []
+        for operator in sorted(value):
+            operand = value[operator]
+            if operator not in _OPERATORS:
+                raise ValueError(f"Unknown filter operator {operator!r} for {key}")
+            if operator in _IS_OPERATORS:
+                operators.append([operator, _is_literal(operand)])
+                continue
+            if operator == "in" and not isinstance(operand, list):
+                raise ValueError(f'"in" filter on {key} takes a list')
+            if operand is None or (operator == "in" and None in operand):
+                raise ValueError(f'Use {{"is": null}} to match null values of {key}')
+            if operator in ("like", "ilike") and not isinstance(operand, str):
+                raise ValueError(f'"{operator}" filter on {key} takes a string')
+            operators.append([operator])
+        shape.append([key, operators])
+    return shape
+
+
+def _values(filters: dict[str, Any], out: list[Any]) -> list[Any]:
+    # Same traversal order as _shape, so values line up with the plan's slots
+    for key in sorted(filters):
+        value = filters[key]
+        if key in _LOGICAL:
+            for item in value:
+                _values(item, out)
+        elif value is None:
+            continue
+        elif not isinstance(value, dict):
+            out.append(value)
+        else:
+            out.extend(value[op] for op in sorted(value) if op not in _IS_OPERATORS)
+    return out
+
+
+class _Compiler:
+    def __init__(self) -> None:
+        self.slots = itertools.count()
+        self.slot_kinds: list[str] = []
+        self.columns: set[str] = set()
+
+    def slot(self, kind: str) -> str:
+        self.slot_kinds.append(kind)
+        return f"{{{next(self.slots)}}}"
+
+    def condition(self, column: str, operator: list[str], direct: bool) -> tuple[str, str, str]:
+        """
+        Compile one column operator to (sql, logic tree term, top-level parameter value).
+        """
+        self.columns.add(column)
+        quoted = f'"{column}"'
+        if operator[0] in _IS_OPERATORS:
+            literal = operator[1]
+            sql = f"{quoted} {_IS_OPERATORS[operator[0]]} {_IS_LITERALS[literal]}"
+            postgrest = f"is.{literal}" if operator[0] == "is" else f"not.is.{literal}"
+            return sql, f"{column}.{postgrest}", postgrest
+        if operator[0] == "in":
+            slot = self.slot(_LIST)
+            return f"{quoted} = ANY(%s)", f"{column}.in.({slot})", f"in.({slot})"
+        slot = self.slot(_RAW if direct else _QUOTED)
+        sql = f"{quoted} {_SQL_OPERATORS[operator[0]]} %s"
+        return sql, f"{column}.{operator[0]}.{slot}", f"{operator[0]}.{slot}"
+
+    def entry(self, key: str, spec: Any, top_level: bool) -> tuple[str, str, str | None]:
+        """
+        Compile one filter object entry to (sql, logic tree term, top-level parameter value).
+
+        The parameter value is None when the entry only fits in a logic tree.
+        """
+        if key in _LOGICAL:
+            items = [self.group(item) for item in spec]
+            sql = "(" + f" {key.upper()} ".join(sql for sql, _ in items) + ")"
+            return sql, f"{key}({','.join(term for _, term in items)})", None
+        if spec == _NULL:
+            return self.condition(key, ["is", "null"], top_level)
+        if spec is None:
+            self.columns.add(key)
+            slot = self.slot(_RAW if top_level else _QUOTED)
+            return f'"{key}" = %s', f"{key}.eq.{slot}", f"eq.{slot}"
+        direct = top_level and len(spec) == 1
+        compiled = [self.condition(key, operator, direct) for operator in spec]
+        if direct:
+            return compiled[0]
+        sql, term = _conjunction([(sql, term) for sql, term, _ in compiled])
+        return sql, term, None
+
+    def group(self, shape: list) -> tuple[str, str]:
+        return _conjunction([self.entry(key, spec, False)[:2] for key, spec in shape])
+
+
+def _conjunction(parts: list[tuple[str, str]]) -> tuple[str, str]:
+    if len(parts) == 1:
+        return parts[0]
+    sql = "(" + " AND ".join(sql for sql, _ in parts) + ")"
+    return sql, f"and({','.join(term for _, term in parts)})"
+
+
+@functools.lru_cache(maxsize=FILTER_PLAN_CACHE_SIZE)
+def _compile(shape_key: str) -> FilterPlan:
+    shape = json.loads(shape_key)
+    compiler = _Compiler()
+    sql_parts: list[str] = []
+    params: list[tuple[str, str]] = []
+    tree_terms: list[str] = []
+    for key, spec in shape:
+        sql, term, param = compiler.entry(key, spec, top_level=True)
+        sql_parts.append(sql)
+        if param is None:
+            tree_terms.append(term)
+        else:
+            params.append((key, param))
+    # Entries that cannot be their own parameter share a single "and" logic tree
+    if tree_terms:
+        params.append(("and", f"({','.join(tree_terms)})"))
+    return FilterPlan(
+        sql=" AND ".join(sql_parts),
+        params=tuple(params),
+        slot_kinds=tuple(compiler.slot_kinds),
+        columns=frozenset(compiler.columns),
+        plain=all(spec is None or spec == _NULL for _, spec in shape),
+    )
+
+
+def compile_filters(filters: dict[str, Any]) -> tuple[FilterPlan, list[Any]]:
+    """
+    Compile filters to a plan plus the values to bind to it.
+
+    Plans are cached by filter shape, so requests that differ only in their
+    values reuse the same compiled plan.
+
+    Raises:
+        ValueError: If the filters are malformed
+    """
+    shape_key = json.dumps(_shape(filters), separators=(",", ":"))
+    return _compile(shape_key), _values(filters, [])
+
+
+def _quote(value: Any) -> str:
+    text = str(value)
+    if _RESERVED.intersection(text) or text in ("null", "true", "false"):
+        escaped = text.replace("\\", "\\\\").replace('"', '\\"')
+        return f'"{escaped}"'
+    return text
+
+
+def _format_value(kind: str, value: Any) -> str:
+    if kind == _LIST:
+        return ",".join(_quote(item) for item in value)
+    if kind == _QUOTED:
+        return _quote(value)
+    return str(value)
+
+
+def to_postgrest(
+    filters: dict[str, Any] | None, table: str | None = None
+) -> dict[str, Any] | None:
+    """
+    Render filters as PostgREST query parameters for the database service.
+
+    Every parameter is in PostgREST's operator form: a column maps to
+    "op.value" ({"id": 7} becomes {"id": "eq.7"}, {"id": None} becomes
+    {"id": "is.null"}), and conditions that need a logic tree share one
+    "and" parameter. The service passes them on to PostgREST as they are.
+    With a table, filters on columns without an index are logged (see check_indexes).
+
+    Raises:
+        ValueError: If the filters are malformed
+    """
+    if not filters:
+        return filters
+    plan, values = compile_filters(filters)
+    if table is not None:
+        check_indexes(table, plan.columns)
+    if len(plan.slot_kinds) != len(values):
+        raise ValueError("Filter values do not match the compiled plan")
+    formatted = [_format_value(kind, value) for kind, value in zip(plan.slot_kinds, values, strict=True)]
+    return {key: template.format(*formatted) for key, template in plan.params}
+
+
+def to_sql(filters: dict[str, Any] | None, table: str | None = None) -> tuple[str, list[Any]]:
+    """
+    Render filters as a SQL WHERE fragment with %s placeholders and its parameters.
+
+    "in" values are bound as one array parameter, so the fragment text only
+    depends on the filter shape.
+
+    Raises:
+        ValueError: If the filters are malformed
+    """
+    if not filters:
+        return "TRUE", []
+    plan, values = compile_filters(filters)
+    if table is not None:
+        check_indexes(table, plan.columns)
+    return plan.sql, values
+
+
+# Columns leading an index, per table, from load_index_catalog; None until loaded
+_indexed_columns: dict[str, frozenset[str]] | None = None
+_warned: set[tuple[str, str]] = set()
+_warned_lock = threading.Lock()
+
+_INDEX_CATALOG_QUERY = """
+SELECT c.relname, a.attname
+FROM pg_index i
+JOIN pg_class c ON c.oid = i.indrelid
+JOIN pg_namespace n ON n.oid = c.relnamespace
+JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = i.indkey[0]
+WHERE n.nspname = :schema
+"""
+
+
+def set_index_catalog(indexed: dict[str, Any] | None) -> None:
+    """
+    Replace the known indexed columns; None turns unindexed-filter warnings off.
+    """
+    global _indexed_columns
+    _indexed_columns = (
+        None if indexed is None else {table: frozenset(cols) for table, cols in indexed.items()}
+    )
+    with _warned_lock:
+        _warned.clear()
+
+
+def load_index_catalog() -> bool:
+    """
+    Read the leading column of every index in POSTGRES_DATA_SCHEMA from Postgres.
+
+    Blocking; meant to run once at startup. Does nothing when no Postgres
+    connection is configured.
+
+    Returns:
+        Whether the catalog was loaded
+    """
+    from sqlalchemy import text
+    from sqlalchemy.exc import SQLAlchemyError
+
+    from app.core.config import settings
+    from app.core.db import engine
+
+    if engine is None:
+        return False
+    indexed: dict[str, set[str]] = {}
+    try:
+        with engine.connect() as connection:
+            for table, column in connection.execute(
+                text(_INDEX_CATALOG_QUERY), {"schema": settings.POSTGRES_DATA_SCHEMA}
+            ):
+                indexed.setdefault(table, set()).add(column)
+    except SQLAlchemyError as e:
+        logger.warning(f"Could not load index catalog: {str(e)}")
+        return False
+    set_index_catalog(indexed)
+    logger.info(f"Loaded index catalog for {len(indexed)} tables")
+    return True
+
+
+def check_indexes(table: str, columns: frozenset[str]) -> list[str]:
+    """
+    Warn, once per column, about filters on columns that lead no index.
+
+    Tables missing from the catalog (views, other schemas) are not checked.
+
+    Returns:
+        The unindexed columns
+    """
+    if _indexed_columns is None or table not in _indexed_columns:
+        return []
+    unindexed = sorted(columns - _indexed_columns[table])
+    for column in unindexed:
+        with _warned_lock:
+            if (table, column) in _warned:
+                continue
+            _warned.add((table, column))
+        logger.warning(
+            f"Filter on {table}.{column} has no supporting index and may scan the whole table"
+        )
+    return unindexed
@@ -0,0 +1,201 @@
+import base64
+import binascii
+import json
+import os
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import Any
+
+# Keyset tiebreaker of tables without a DATA_PRIMARY_KEYS entry
+DEFAULT_PRIMARY_KEY = ["id"]
+
+OrderKey = tuple[str, bool, bool]
+FetchPage = Callable[[dict[str, Any] | None, int], Awaitable[list[dict[str, Any]]]]
+
+
+def _parse_primary_keys(value: str) -> dict[str, list[str]]:
+    primary_keys = {}
+    for item in value.split(";"):
+        table, _, columns = item.strip().partition("=")
+        if table and columns:
+            primary_keys[table] = [c.strip() for c in columns.split(",") if c.strip()]
+    return primary_keys
+
+
+# Primary keys of tables not keyed by "id", for backends that cannot look them up,
+# e.g. DATA_PRIMARY_KEYS="memberships=org_id,user_id;countries=code"
+_configured_primary_keys: dict[str, list[str]] = _parse_primary_keys(
+    os.getenv("DATA_PRIMARY_KEYS", "")
+)
+
+
+def configured_primary_key(table: str) -> list[str]:
+    return _configured_primary_keys.get(table, DEFAULT_PRIMARY_KEY)
+
+
+def parse_order(order: str | None, primary_key: list[str]) -> list[OrderKey]:
+    """
+    Parse a PostgREST order clause ("created_at.desc.nullslast,id") into keyset sort keys.
+
+    Primary key columns missing from the clause are appended so the ordering
+    is total. Without nullsfirst/nullslast, NULLs sort the way Postgres puts
+    them: last when ascending, first when descending.
+
+    Returns:
+        List of (column, descending, nulls first) triples
+    """
+    keys: list[OrderKey] = []
+    for part in (order or "").split(","):
+        column, *modifiers = part.strip().split(".")
+        if not column:
+            continue
+        desc = "desc" in modifiers
+        if "nullsfirst" in modifiers:
+            nulls_first = True
+        elif "nullslast" in modifiers:
+            nulls_first = False
+        else:
+            nulls_first = desc
+        keys.append((column, desc, nulls_first))
+    ordered = {column for column, _, _ in keys}
+    desc = keys[-1][1] if keys else False
+    for column in primary_key:
+        if column not in ordered:
+            keys.append((column, desc, desc))
+    return keys
+
+
+def order_clause(keys: list[OrderKey]) -> str:
+    return ",".join(
+        f"{column}.{'desc' if desc else 'asc'}.{'nullsfirst' if nulls_first else 'nullslast'}"
+        for column, desc, nulls_first in keys
+    )
+
+
+def ensure_selected(select: str, keys: list[OrderKey]) -> str:
+    """
+    Add the sort key columns to a select list, since keyset paging reads them from each row.
+    """
+    if select.strip() == "*":
+        return select
+    selected = {column.strip() for column in select.split(",")}
+    missing = [column for column, _, _ in keys if column not in selected]
+    return ",".join([select, *missing]) if missing else select
+
+
+def _equal(value: Any) -> dict[str, Any]:
+    return {"is": None} if value is None else {"eq": value}
+
+
+def _after(column: str, desc: bool, nulls_first: bool, value: Any) -> dict[str, Any] | None:
+    # Filter for values of one column sorting strictly after value; None if nothing does
+    if value is None:
+        return {column: {"isnot": None}} if nulls_first else None
+    condition = {column: {"lt" if desc else "gt": value}}
+    if nulls_first:
+        return condition
+    return {"or": [condition, {column: {"is": None}}]}
+
+
+def keyset_condition(keys: list[OrderKey], values: list[Any]) -> dict[str, Any]:
+    """
+    Build a filter selecting rows strictly after the given sort values.
+
+    For keys (a asc, b desc) and values (x, y) this is
+    a > x OR (a = x AND b < y), the expanded form of the row comparison,
+    with NULLs compared by IS and placed where the ordering puts them.
+
+    Raises:
+        ValueError: If no row can sort after the values
+    """
+    disjuncts = []
+    for i, (column, desc, nulls_first) in enumerate(keys):
+        after = _after(column, desc, nulls_first, values[i])
+        if after is None:
+            continue
+        condition = {c: _equal(v) for (c, _, _), v in zip(keys[:i], values[:i], strict=True)}
+        condition.update(after)
+        disjuncts.append(condition)
+    if not disjuncts:
+        raise ValueError("Keyset pagination requires non-null primary key values")
+    return disjuncts[0] if len(disjuncts) == 1 else {"or": disjuncts}
+
+
+def with_keyset_filter(
+    filters: dict[str, Any] | None, keys: list[OrderKey], values: list[Any]
+) -> dict[str, Any]:
+    """
+    Combine request filters with the keyset condition.
+    """
+    condition = keyset_condition(keys, values)
+    return {"and": [filters, condition]} if filters else condition
+
+
+def sort_values(row: dict[str, Any], keys: list[OrderKey]) -> list[Any]:
+    try:
+        return [row[column] for column, _, _ in keys]
+    except KeyError as e:
+        raise ValueError(f"Keyset pagination requires column {e} in every row")
+
+
+def encode_cursor(keys: list[OrderKey], values: list[Any]) -> str:
+    """
+    Encode the last row's sort values as an opaque, URL-safe cursor token.
+    """
+    payload = json.dumps({"o": order_clause(keys), "v": values}, default=str)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: list[OrderKey]) -> list[Any]:
+    """
+    Decode a cursor token back into sort values.
+
+    Raises:
+        ValueError: If the token is malformed or was issued for a different ordering
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        order, values = payload["o"], payload["v"]
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        raise ValueError("Invalid pagination cursor")
+    if order != order_clause(keys) or not isinstance(values, list) or len(values) != len(keys):
+        raise ValueError("Pagination cursor does not match the requested order")
+    return values
+
+
+async def iter_keyset_pages(
+    fetch_page: FetchPage,
+    filters: dict[str, Any] | None,
+    keys: list[OrderKey],
+    page_size: int,
+    max_rows: int | None = None,
+) -> AsyncIterator[list[dict[str, Any]]]:
+    """
+    Walk a table page by page, each page starting strictly after the previous one's last row.
+
+    Every page is an indexed range scan of page_size rows, so the cost does not
+    grow with depth the way OFFSET does.
+
+    Args:
+        fetch_page: Called with (filters, limit), returns rows in keyset order
+        filters: Request filters every page must also match
+        keys: Sort keys from parse_order
+        page_size: Rows fetched per round-trip
+        max_rows: Stop after this many rows in total
+
+    Yields:
+        Non-empty lists of rows
+    """
+    remaining = max_rows
+    page_filters = filters
+    while remaining is None or remaining > 0:
+        limit = page_size if remaining is None else min(page_size, remaining)
+        rows = await fetch_page(page_filters, limit)
+        if not rows:
+            return
+        yield rows
+        if len(rows) < limit:
+            return
+        if remaining is not None:
+            remaining -= len(rows)
+        page_filters = with_keyset_filter(filters, keys, sort_values(rows[-1], keys))
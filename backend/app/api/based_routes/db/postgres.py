@@ -0,0 +1,292 @@
+import asyncio
+from typing import Any
+
+from psycopg import sql
+from psycopg.conninfo import make_conninfo
+from psycopg.rows import dict_row
+from psycopg.types.json import Jsonb
+from psycopg_pool import AsyncConnectionPool
+
+from app.core.config import settings
+
+from .filters import check_column, to_sql
+
+_pool: AsyncConnectionPool | None = None
+_pool_lock = asyncio.Lock()
+
+# Primary key columns per table, used as upsert conflict targets and keyset tiebreakers
+_primary_keys: dict[str, list[str]] = {}
+
+_PRIMARY_KEY_QUERY = """
+SELECT a.attname
+FROM pg_index i
+JOIN pg_class c ON c.oid = i.indrelid
+JOIN pg_namespace n ON n.oid = c.relnamespace
+JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = ANY(i.indkey)
+WHERE n.nspname = %s AND c.relname = %s AND i.indisprimary
+ORDER BY array_position(i.indkey::int2[], a.attnum)
+"""
+
+
+def _names(value: str) -> frozenset[str]:
+    return frozenset(name.strip() for name in value.split(",") if name.strip())
+
+
+_exposed_tables = _names(settings.POSTGRES_DATA_TABLES)
+_exposed_functions = _names(settings.POSTGRES_DATA_FUNCTIONS)
+
+
+async def get_pool() -> AsyncConnectionPool:
+    """
+    Get the process-wide async connection pool, opening it on first use.
+
+    Sized by POSTGRES_POOL_MIN_SIZE and POSTGRES_POOL_MAX_SIZE. Connections
+    run in autocommit mode and return rows as dicts.
+    """
+    global _pool
+    if _pool is None:
+        async with _pool_lock:
+            if _pool is None:
+                pool = AsyncConnectionPool(
+                    make_conninfo(
+                        host=settings.POSTGRES_SERVER,
+                        port=settings.POSTGRES_PORT,
+                        user=settings.POSTGRES_USER,
+                        password=settings.POSTGRES_PASSWORD,
+                        dbname=settings.POSTGRES_DB,
+                    ),
+                    min_size=settings.POSTGRES_POOL_MIN_SIZE,
+                    max_size=settings.POSTGRES_POOL_MAX_SIZE,
+                    kwargs={"autocommit": True, "row_factory": dict_row},
+                    open=False,
+                )
+                await pool.open()
+                _pool = pool
+    return _pool
+
+
+async def close_pool() -> None:
+    global _pool
+    if _pool is not None:
+        await _pool.close()
+        _pool = None
+
+
+def _select_list(select: str) -> sql.Composable:
+    if select.strip() == "*":
+        return sql.SQL("*")
+    columns = [column.strip() for column in select.split(",") if column.strip()]
+    for column in columns:
+        # Embedded resources, aliases and casts are PostgREST features
+        check_column(column)
+    return sql.SQL(", ").join(map(sql.Identifier, columns))
+
+
+def _order_by(order: str | None) -> sql.Composable:
+    """
+    Translate a PostgREST order clause ("created_at.desc.nullslast,id") to ORDER BY.
+    """
+    terms = []
+    for part in (order or "").split(","):
+        column, *modifiers = part.strip().split(".")
+        if not column:
+            continue
+        check_column(column)
+        term = sql.SQL("{} DESC" if "desc" in modifiers else "{} ASC").format(
+            sql.Identifier(column)
+        )
+        if "nullsfirst" in modifiers:
+            term = sql.SQL("{} NULLS FIRST").format(term)
+        elif "nullslast" in modifiers:
+            term = sql.SQL("{} NULLS LAST").format(term)
+        terms.append(term)
+    if not terms:
+        return sql.SQL("")
+    return sql.SQL(" ORDER BY {}").format(sql.SQL(", ").join(terms))
+
+
+def _table(table: str) -> sql.Identifier:
+    """
+    Qualify a table with POSTGRES_DATA_SCHEMA, refusing tables outside POSTGRES_DATA_TABLES.
+    """
+    if _exposed_tables and table not in _exposed_tables:
+        raise ValueError(f"Table {table} is not exposed by the data API")
+    return sql.Identifier(settings.POSTGRES_DATA_SCHEMA, table)
+
+
+def _function(name: str) -> sql.Identifier:
+    if name not in _exposed_functions:
+        raise ValueError(f"Function {name} is not exposed by the data API")
+    return sql.Identifier(settings.POSTGRES_DATA_SCHEMA, name)
+
+
+def _function_argument(value: Any) -> Any:
+    # Objects, and lists holding objects or lists, go in as jsonb rather than Postgres arrays
+    if isinstance(value, dict) or (
+        isinstance(value, list) and any(isinstance(item, dict | list) for item in value)
+    ):
+        return Jsonb(value)
+    return value
+
+
+def _row_columns(rows: list[dict[str, Any]]) -> list[str]:
+    columns: dict[str, None] = {}
+    for row in rows:
+        columns.update(dict.fromkeys(row))
+    for column in columns:
+        check_column(column)
+    return list(columns)
+
+
+class PostgresDatabaseService:
+    """
+    The data API's database operations run directly against Postgres.
+
+    Mirrors the Supabase database service: same arguments, filters in the
+    filter DSL, and the same list-of-rows results. Statements are built from
+    the filter shape only, with every value bound as a parameter, and are
+    executed with prepare=True so each connection reuses its server-side plan.
+
+    The pool connects as POSTGRES_USER, so only tables and functions of
+    POSTGRES_DATA_SCHEMA in the POSTGRES_DATA_TABLES and POSTGRES_DATA_FUNCTIONS
+    allowlists are reachable, always schema-qualified.
+    """
+
+    supports_on_conflict = True
+
+    async def _execute(
+        self, query: sql.Composable, params: list[Any] | dict[str, Any]
+    ) -> list[dict[str, Any]]:
+        pool = await get_pool()
+        async with pool.connection() as connection:
+            cursor = await connection.execute(query, params, prepare=True)
+            return await cursor.fetchall() if cursor.description else []
+
+    async def fetch_data(
+        self,
+        table: str,
+        select: str = "*",
+        filters: dict[str, Any] | None = None,
+        order: str | None = None,
+        limit: int | None = None,
+        offset: int | None = None,
+    ) -> list[dict[str, Any]]:
+        where, params = to_sql(filters, table)
+        # LIMIT NULL is no limit, so the statement text does not depend on paging
+        query = sql.SQL("SELECT {} FROM {} WHERE {}{} LIMIT %s OFFSET %s").format(
+            _select_list(select), _table(table), sql.SQL(where), _order_by(order)
+        )
+        return await self._execute(query, [*params, limit, offset or 0])
+
+    async def insert_data(
+        self,
+        table: str,
+        data: dict[str, Any] | list[dict[str, Any]],
+        upsert: bool = False,
+        on_conflict: str | None = None,
+    ) -> list[dict[str, Any]]:
+        target = _table(table)
+        rows = data if isinstance(data, list) else [data]
+        if not rows:
+            return []
+        columns = _row_columns(rows)
+        column_list = sql.SQL(", ").join(map(sql.Identifier, columns))
+        # One statement and one parameter for any number of rows; missing keys insert NULL
+        query = sql.SQL(
+            "INSERT INTO {table} ({columns}) SELECT {columns} "
+            "FROM jsonb_populate_recordset(NULL::{table}, %s)"
+        ).format(table=target, columns=column_list)
+        if upsert or on_conflict:
+            query = sql.SQL("{} {}").format(
+                query, await self._on_conflict(table, columns, on_conflict)
+            )
+        query = sql.SQL("{} RETURNING *").format(query)
+        return await self._execute(query, [Jsonb(rows)])
+
+    async def _on_conflict(
+        self, table: str, columns: list[str], on_conflict: str | None
+    ) -> sql.Composable:
+        if on_conflict:
+            target = [column.strip() for column in on_conflict.split(",") if column.strip()]
+            for column in target:
+                check_column(column)
+        else:
+            target = await self.primary_key(table)
+        updates = [column for column in columns if column not in target]
+        if not updates:
+            return sql.SQL("ON CONFLICT ({}) DO NOTHING").format(
+                sql.SQL(", ").join(map(sql.Identifier, target))
+            )
+        return sql.SQL("ON CONFLICT ({}) DO UPDATE SET {}").format(
+            sql.SQL(", ").join(map(sql.Identifier, target)),
+            sql.SQL(", ").join(
+                sql.SQL("{0} = EXCLUDED.{0}").format(sql.Identifier(column))
+                for column in updates
+            ),
+        )
+
+    async def primary_key(self, table: str) -> list[str]:
+        if table not in _primary_keys:
+            # Refuse tables outside the allowlist before asking the catalog
+            _table(table)
+            rows = await self._execute(
+                sql.SQL(_PRIMARY_KEY_QUERY), [settings.POSTGRES_DATA_SCHEMA, table]
+            )
+            if not rows:
+                raise ValueError(f"Table {table} has no primary key")
+            _primary_keys[table] = [row["attname"] for row in rows]
+        return _primary_keys[table]
+
+    async def update_data(
+        self, table: str, data: dict[str, Any], filters: dict[str, Any]
+    ) -> list[dict[str, Any]]:
+        if not filters:
+            raise ValueError("Updates require filters")
+        columns = _row_columns([data])
+        if not columns:
+            raise ValueError("No columns to update")
+        where, params = to_sql(filters, table)
+        column_list = sql.SQL(", ").join(map(sql.Identifier, columns))
+        query = sql.SQL(
+            "UPDATE {table} SET ({columns}) = "
+            "(SELECT {columns} FROM jsonb_populate_record(NULL::{table}, %s)) "
+            "WHERE {where} RETURNING *"
+        ).format(table=_table(table), columns=column_list, where=sql.SQL(where))
+        return await self._execute(query, [Jsonb(data), *params])
+
+    async def delete_data(
+        self, table: str, filters: dict[str, Any]
+    ) -> list[dict[str, Any]]:
+        if not filters:
+            raise ValueError("Deletes require filters")
+        where, params = to_sql(filters, table)
+        query = sql.SQL("DELETE FROM {} WHERE {} RETURNING *").format(
+            _table(table), sql.SQL(where)
+        )
+        return await self._execute(query, params)
+
+    async def call_function(self, name: str, params: dict[str, Any] | None = None) -> Any:
+        """
+        Call a database function with named arguments.
+
+        Like PostgREST RPC, a scalar function returns its value and a set or
+        table function returns a list of rows. JSON objects and arrays of them
+        are passed as jsonb.
+        """
+        function = _function(name)
+        params = {key: _function_argument(value) for key, value in (params or {}).items()}
+        for key in params:
+            check_column(key)
+        arguments = sql.SQL(", ").join(
+            sql.SQL("{} => {}").format(sql.Identifier(key), sql.Placeholder(key))
+            for key in params
+        )
+        query = sql.SQL("SELECT * FROM {}({})").format(function, arguments)
+        pool = await get_pool()
+        async with pool.connection() as connection:
+            cursor = await connection.execute(query, params, prepare=True)
+            rows = await cursor.fetchall()
+            columns = [column.name for column in cursor.description or []]
+        if columns == [name]:
+            return rows[0][name] if rows else None
+        return rows
@@ -0,0 +1,75 @@
+import os
+import re
+from typing import Any
+
+_COLUMN_NAME = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def _parse_projections(value: str) -> dict[str, str]:
+    projections = {}
+    for item in value.split(";"):
+        table, _, columns = item.strip().partition("=")
+        if table and columns:
+            projections[table] = ",".join(c.strip() for c in columns.split(",") if c.strip())
+    return projections
+
+
+# Columns returned when a request leaves select at "*",
+# e.g. DATA_DEFAULT_PROJECTIONS="profiles=id,username,avatar_url;orders=id,status,total"
+_default_projections: dict[str, str] = _parse_projections(
+    os.getenv("DATA_DEFAULT_PROJECTIONS", "")
+)
+
+
+def set_default_projection(table: str, columns: list[str] | None) -> None:
+    """
+    Set the columns returned for a table when the request does not choose any.
+
+    Args:
+        table: Table name
+        columns: Column names, or None to return every column again
+    """
+    if columns is None:
+        _default_projections.pop(table, None)
+    else:
+        _default_projections[table] = ",".join(columns)
+
+
+def parse_fields(fields: str) -> list[str]:
+    """
+    Parse a sparse fieldset ("id,name,created_at") into column names.
+
+    Raises:
+        ValueError: If a field is not a plain column name
+    """
+    columns = [field.strip() for field in fields.split(",") if field.strip()]
+    if not columns or not all(_COLUMN_NAME.match(column) for column in columns):
+        raise ValueError(f"fields must be a comma-separated list of column names, got {fields!r}")
+    return columns
+
+
+def resolve_select(table: str, select: str, fields: str | None) -> str:
+    """
+    Pick the select list for a query: fields, then an explicit select, then the table default.
+    """
+    if fields is not None:
+        return ",".join(parse_fields(fields))
+    if select.strip() == "*":
+        return _default_projections.get(table, select)
+    return select
+
+
+def to_columns(rows: list[dict[str, Any]]) -> dict[str, list[Any]]:
+    """
+    Turn a list of row objects into one array per column.
+
+    Columns appear in first-seen order; rows missing a column get None.
+    """
+    columns: dict[str, list[Any]] = {}
+    for index, row in enumerate(rows):
+        for column in row:
+            if column not in columns:
+                columns[column] = [None] * index
+        for column, values in columns.items():
+            values.append(row.get(column))
+    return columns
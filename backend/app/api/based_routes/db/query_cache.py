@@ -0,0 +1,128 @@
+import json
+import os
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+from starlette.requests import Request
+
+from app.caching.utils.invalidation import ainvalidate_tags
+from app.caching.utils.keys import credential_identity, hash_key_material
+from app.caching.utils.redis_cache import aget_or_set_cache, ainvalidate_cache
+
+T = TypeVar("T")
+
+QUERY_CACHE_PREFIX = "db_query"
+
+
+def _parse_table_ttls(value: str) -> dict[str, int]:
+    ttls = {}
+    for item in value.split(","):
+        table, _, ttl = item.strip().partition("=")
+        if table:
+            ttls[table] = int(ttl or 60)
+    return ttls
+
+
+# Tables opted into the query cache, e.g. QUERY_CACHE_TABLES="products=300,categories=3600"
+_table_ttls: dict[str, int] = _parse_table_ttls(os.getenv("QUERY_CACHE_TABLES", ""))
+
+
+def enable_query_cache(table: str, ttl: int = 60) -> None:
+    """
+    Cache fetch_data results for a table.
+
+    Args:
+        table: Table name
+        ttl: Seconds a cached result may be served
+    """
+    _table_ttls[table] = ttl
+
+
+def disable_query_cache(table: str) -> None:
+    _table_ttls.pop(table, None)
+
+
+def query_cache_ttl(table: str) -> int | None:
+    return _table_ttls.get(table)
+
+
+def _table_tag(table: str) -> str:
+    return f"{QUERY_CACHE_PREFIX}:{table}"
+
+
+def _normalize_select(select: str) -> str:
+    return ",".join(column.strip() for column in select.split(",") if column.strip())
+
+
+def query_scope(request: Request) -> str:
+    """
+    Identify whose view of the data a query result is.
+
+    Results may be filtered by row level security, so they are never shared
+    between callers: anonymous requests share one scope, and everyone else is
+    scoped by a hash of their credentials, as in the HTTP response cache.
+    """
+    return credential_identity(request.headers) or "anon"
+
+
+def query_cache_key(
+    table: str,
+    select: str,
+    filters: dict[str, Any] | None,
+    order: str | None,
+    limit: int | None,
+    offset: int | None,
+    scope: str,
+) -> str:
+    """
+    Build the cache key for a fetch_data call from its normalized arguments.
+    """
+    material = json.dumps(
+        [_normalize_select(select), filters or {}, order or "", limit, offset or 0, scope],
+        sort_keys=True,
+        default=str,
+        separators=(",", ":"),
+    )
+    return f"{QUERY_CACHE_PREFIX}:{table}:{hash_key_material(material.encode())}"
+
+
+async def cached_query(
+    request: Request,
+    table: str,
+    key_args: tuple[str, dict[str, Any] | None, str | None, int | None, int | None],
+    fetch: Callable[[], Awaitable[T]],
+) -> T:
+    """
+    Read a fetch_data result through the query cache when the table is opted in.
+
+    This is the only cache in front of the /data endpoints; they are not
+    marked for the HTTP response cache.
+
+    Requests with "Cache-Control: no-cache" skip the cached copy and replace it
+    with the fresh result. Concurrent misses for the same key run one query.
+
+    Args:
+        request: The incoming request, for the caller scope and bypass header
+        table: Table name
+        key_args: (select, filters, order, limit, offset) as sent to fetch_data
+        fetch: Runs the query
+    """
+    ttl = query_cache_ttl(table)
+    if ttl is None:
+        return await fetch()
+    key = query_cache_key(table, *key_args, scope=query_scope(request))
+    if "no-cache" in request.headers.get("cache-control", ""):
+        await ainvalidate_cache(key)
+    return await aget_or_set_cache(
+        key, fetch, expire_seconds=ttl, single_flight=True, tags=[_table_tag(table)]
+    )
+
+
+async def invalidate_query_cache(*tables: str) -> int:
+    """
+    Drop every cached query result for the given tables.
+
+    Returns:
+        The number of cached results deleted
+    """
+    return await ainvalidate_tags(*(_table_tag(table) for table in tables))
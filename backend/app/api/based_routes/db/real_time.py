@@ -3,14 +3,16 @@ from typing import Any
 from fastapi import APIRouter, Depends, FastAPI, HTTPException
 from pydantic import BaseModel
 
+from app.api.utils.responses import FastJSONResponse
 from app.supabase_home.client import SupabaseClient
 from app.supabase_home.functions.realtime import SupabaseRealtimeService
 
-router = APIRouter(tags=["Supabase DB"])
+router = APIRouter(tags=["Supabase DB"], default_response_class=FastJSONResponse)
 
 app = FastAPI(
     title="SupabaseRealtimeAPI",
     description="API to interact with current Realtime functions",
+    default_response_class=FastJSONResponse,
 )
 
 
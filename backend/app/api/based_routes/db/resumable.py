@@ -0,0 +1,100 @@
+import dataclasses
+import logging
+import uuid
+
+from redis.asyncio.lock import Lock
+from redis.exceptions import LockNotOwnedError
+
+from app.caching.utils.redis_cache import get_async_redis
+
+UPLOAD_STATE_PREFIX = "storage_upload"
+# Supabase Storage discards unfinished resumable uploads after a day
+UPLOAD_STATE_TTL = 24 * 60 * 60
+# Supabase Storage expects every resumable chunk but the last to be exactly this size
+TUS_CHUNK_BYTES = 6 * 1024 * 1024
+# Longest a single chunk may hold the upload's lock
+UPLOAD_LOCK_TIMEOUT = 10 * 60
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass
+class UploadState:
+    upload_id: str
+    bucket_id: str
+    path: str
+    length: int
+    location: str
+    content_type: str = ""
+    offset: int = 0
+    # credential_identity of the caller that started the upload, "" when anonymous
+    owner: str = ""
+
+
+def _state_key(upload_id: str) -> str:
+    return f"{UPLOAD_STATE_PREFIX}:{upload_id}"
+
+
+async def save_upload(state: UploadState) -> None:
+    redis = get_async_redis()
+    key = _state_key(state.upload_id)
+    async with redis.pipeline(transaction=True) as pipe:
+        pipe.hset(key, mapping={k: str(v) for k, v in dataclasses.asdict(state).items()})
+        pipe.expire(key, UPLOAD_STATE_TTL)
+        await pipe.execute()
+
+
+async def create_upload(
+    bucket_id: str,
+    path: str,
+    length: int,
+    location: str,
+    content_type: str | None,
+    owner: str | None = None,
+) -> UploadState:
+    state = UploadState(
+        upload_id=uuid.uuid4().hex,
+        bucket_id=bucket_id,
+        path=path,
+        length=length,
+        location=location,
+        content_type=content_type or "",
+        owner=owner or "",
+    )
+    await save_upload(state)
+    return state
+
+
+async def get_upload(upload_id: str) -> UploadState | None:
+    raw = await get_async_redis().hgetall(_state_key(upload_id))
+    if not raw:
+        return None
+    fields = {key.decode(): value.decode() for key, value in raw.items()}
+    return UploadState(
+        **{**fields, "length": int(fields["length"]), "offset": int(fields["offset"])}
+    )
+
+
+async def set_upload_offset(upload_id: str, offset: int) -> None:
+    await get_async_redis().hset(_state_key(upload_id), "offset", str(offset))
+
+
+async def delete_upload(upload_id: str) -> None:
+    await get_async_redis().delete(_state_key(upload_id))
+
+
+def upload_lock(upload_id: str) -> Lock:
+    """
+    Lock held while a chunk is appended; Supabase Storage takes chunks strictly in order.
+    """
+    return get_async_redis().lock(f"{_state_key(upload_id)}:lock", timeout=UPLOAD_LOCK_TIMEOUT)
+
+
+async def release_upload_lock(lock: Lock) -> None:
+    """
+    Release a chunk lock; one that already timed out is left alone, the chunk is stored.
+    """
+    try:
+        await lock.release()
+    except LockNotOwnedError:
+        logger.warning("Upload lock %s expired before the chunk finished", lock.name)
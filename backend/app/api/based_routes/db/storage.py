@@ -1,11 +1,99 @@
-from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
-from fastapi.responses import JSONResponse, StreamingResponse
-from pydantic import BaseModel
-
+from collections.abc import AsyncIterator, Callable
+from typing import Any
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+)
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from starlette.background import BackgroundTask
+
+from app.api.utils.executor import run_supabase_call
+from app.api.utils.responses import FastJSONResponse
+from app.caching.utils.keys import credential_identity
+from app.caching.utils.response_cache import cache_response, invalidates_response_cache
+from app.core.config import settings
 from app.supabase_home.client import SupabaseClient
 from app.supabase_home.functions.storage import SupabaseStorageService
 
-router = APIRouter(tags=["Supabase DB"])
+from .downloads import stream_download
+from .resumable import (
+    TUS_CHUNK_BYTES,
+    UploadState,
+    create_upload,
+    delete_upload,
+    get_upload,
+    release_upload_lock,
+    set_upload_offset,
+    upload_lock,
+)
+from .storage_batch import (
+    STORAGE_BATCH_CONCURRENCY,
+    STORAGE_BATCH_MAX_ITEMS,
+    STORAGE_DELETE_CHUNK,
+    chunked,
+    encode_progress,
+    invalidate_when_done,
+    run_batch,
+    summarize,
+)
+from .storage_client import (
+    TUS_VERSION,
+    UploadTooLarge,
+    iter_upload_file,
+    limit_size,
+    tus_create,
+    tus_offset,
+    tus_patch,
+    upload_stream,
+)
+
+router = APIRouter(tags=["Supabase DB"], default_response_class=FastJSONResponse)
+
+# The upload body is read by the route itself, so document it here
+_UPLOAD_REQUEST_BODY = {
+    "requestBody": {
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "properties": {"file": {"type": "string", "format": "binary"}},
+                    "required": ["file"],
+                }
+            },
+            "application/octet-stream": {"schema": {"type": "string", "format": "binary"}},
+        },
+        "required": True,
+    }
+}
+
+_BATCH_UPLOAD_REQUEST_BODY = {
+    "requestBody": {
+        "content": {
+            "multipart/form-data": {
+                "schema": {
+                    "type": "object",
+                    "properties": {
+                        "files": {
+                            "type": "array",
+                            "items": {"type": "string", "format": "binary"},
+                        }
+                    },
+                    "required": ["files"],
+                }
+            }
+        },
+        "required": True,
+    }
+}
+
 
 class BucketCreate(BaseModel):
     bucket_id: str
@@ -20,7 +108,21 @@ class BucketUpdate(BaseModel):
     allowed_mime_types: list[str] | None = None
 
 
+class PathPair(BaseModel):
+    source_path: str
+    destination_path: str
+
+
+class BatchPathPairs(BaseModel):
+    items: list[PathPair] = Field(min_length=1, max_length=STORAGE_BATCH_MAX_ITEMS)
+
+
+class BatchPaths(BaseModel):
+    paths: list[str] = Field(min_length=1, max_length=STORAGE_BATCH_MAX_ITEMS)
+
+
 @router.post("/buckets")
+@invalidates_response_cache("buckets")
 async def create_bucket(
     bucket: BucketCreate,
     storage_service: SupabaseStorageService = Depends(
@@ -28,18 +130,20 @@ async def create_bucket(
     ),
 ):
     try:
-        result = storage_service.create_bucket(
+        result = await run_supabase_call(
+            storage_service.create_bucket,
             bucket_id=bucket.bucket_id,
             public=bucket.public,
             file_size_limit=bucket.file_size_limit,
             allowed_mime_types=bucket.allowed_mime_types,
         )
-        return JSONResponse(content=result, status_code=201)
+        return FastJSONResponse(content=result, status_code=201)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/buckets/{bucket_id}")
+@cache_response(expire_seconds=60, resources=["buckets", "bucket:{bucket_id}"])
 async def get_bucket(
     bucket_id: str,
     storage_service: SupabaseStorageService = Depends(
@@ -47,26 +151,28 @@ async def get_bucket(
     ),
 ):
     try:
-        result = storage_service.get_bucket(bucket_id)
-        return JSONResponse(content=result)
+        result = await run_supabase_call(storage_service.get_bucket, bucket_id)
+        return FastJSONResponse(content=result)
     except Exception as e:
         raise HTTPException(status_code=404, detail=str(e))
 
 
 @router.get("/buckets")
+@cache_response(expire_seconds=60, resources=["buckets"])
 async def list_buckets(
     storage_service: SupabaseStorageService = Depends(
         SupabaseClient.get_storage_service
     ),
 ):
     try:
-        result = storage_service.list_buckets()
-        return JSONResponse(content=result)
+        result = await run_supabase_call(storage_service.list_buckets)
+        return FastJSONResponse(content=result)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.put("/buckets/{bucket_id}")
+@invalidates_response_cache("buckets", "bucket:{bucket_id}")
 async def update_bucket(
     bucket_id: str,
     bucket: BucketUpdate,
@@ -75,18 +181,20 @@ async def update_bucket(
     ),
 ):
     try:
-        result = storage_service.update_bucket(
+        result = await run_supabase_call(
+            storage_service.update_bucket,
             bucket_id=bucket_id,
             public=bucket.public,
             file_size_limit=bucket.file_size_limit,
             allowed_mime_types=bucket.allowed_mime_types,
         )
-        return JSONResponse(content=result)
+        return FastJSONResponse(content=result)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.delete("/buckets/{bucket_id}")
+@invalidates_response_cache("buckets", "bucket:{bucket_id}")
 async def delete_bucket(
     bucket_id: str,
     storage_service: SupabaseStorageService = Depends(
@@ -94,13 +202,14 @@ async def delete_bucket(
     ),
 ):
     try:
-        result = storage_service.delete_bucket(bucket_id)
-        return JSONResponse(content=result)
+        result = await run_supabase_call(storage_service.delete_bucket, bucket_id)
+        return FastJSONResponse(content=result)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.post("/buckets/{bucket_id}/empty")
+@invalidates_response_cache("bucket:{bucket_id}")
 async def empty_bucket(
     bucket_id: str,
     storage_service: SupabaseStorageService = Depends(
@@ -108,52 +217,253 @@ async def empty_bucket(
     ),
 ):
     try:
-        result = storage_service.empty_bucket(bucket_id)
-        return JSONResponse(content=result)
+        result = await run_supabase_call(storage_service.empty_bucket, bucket_id)
+        return FastJSONResponse(content=result)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.post("/buckets/{bucket_id}/upload")
+@router.post("/buckets/{bucket_id}/upload", openapi_extra=_UPLOAD_REQUEST_BODY)
+@invalidates_response_cache("bucket:{bucket_id}")
 async def upload_file(
     bucket_id: str,
+    request: Request,
     path: str = Query(...),
-    file: UploadFile = File(...),
-    storage_service: SupabaseStorageService = Depends(
-        SupabaseClient.get_storage_service
-    ),
+    upsert: bool = False,
 ):
+    """
+    Upload a file sent as multipart form data (field "file") or as the raw body.
+
+    The file is forwarded to Supabase Storage chunk by chunk instead of being
+    read into memory. Uploads over STORAGE_MAX_UPLOAD_BYTES get a 413, before
+    any of the body is read when Content-Length already gives it away. Storage
+    sees the caller's Authorization header, so the bucket's policies apply.
+    """
+    max_bytes = settings.STORAGE_MAX_UPLOAD_BYTES
+    declared_length = request.headers.get("content-length", "")
+    if declared_length.isdigit() and int(declared_length) > max_bytes:
+        raise HTTPException(status_code=413, detail=str(UploadTooLarge(max_bytes)))
+
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith("multipart/form-data") and not declared_length.isdigit():
+        # The form parser spools the whole part before anything is checked against the limit
+        raise HTTPException(
+            status_code=411, detail="Multipart uploads need a Content-Length header"
+        )
+    form = None
     try:
-        file_content = await file.read()
-        result = storage_service.upload_file(
-            bucket_id=bucket_id,
-            path=path,
-            file_data=file_content,
-            content_type=file.content_type,
+        if content_type.startswith("multipart/form-data"):
+            # Starlette spools the part to a temporary file past 1MB; it is sent on from there
+            form = await request.form(max_files=1)
+            file = form.get("file")
+            if not isinstance(file, UploadFile):
+                raise ValueError('Missing "file" form field')
+            chunks, length, file_type = iter_upload_file(file), file.size, file.content_type
+        else:
+            chunks = request.stream()
+            length = int(declared_length) if declared_length.isdigit() else None
+            file_type = content_type or None
+        result = await upload_stream(
+            bucket_id,
+            path,
+            limit_size(chunks, max_bytes),
+            content_type=file_type,
+            content_length=length,
+            upsert=upsert,
+            authorization=request.headers.get("authorization"),
         )
-        return JSONResponse(content=result, status_code=201)
+        return FastJSONResponse(content=result, status_code=201)
+    except UploadTooLarge as e:
+        raise HTTPException(status_code=413, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        if form is not None:
+            await form.close()
 
 
-@router.get("/buckets/{bucket_id}/download")
-async def download_file(
+@router.post("/buckets/{bucket_id}/uploads")
+async def create_resumable_upload(
     bucket_id: str,
+    request: Request,
     path: str = Query(...),
-    storage_service: SupabaseStorageService = Depends(
-        SupabaseClient.get_storage_service
-    ),
+    upsert: bool = False,
+    content_type: str | None = None,
+    upload_length: int = Header(..., alias="Upload-Length", ge=0),
 ):
+    """
+    Start a resumable (TUS) upload of upload_length bytes.
+
+    Send the bytes with PATCH to the returned Location, check progress with
+    HEAD after an interruption, then POST to .../finalize. Chunks go in order,
+    TUS_CHUNK_BYTES each except the last. The upload belongs to the caller:
+    later requests must send the same Authorization header (or cookies).
+    """
+    if upload_length > settings.STORAGE_MAX_UPLOAD_BYTES:
+        raise HTTPException(
+            status_code=413, detail=str(UploadTooLarge(settings.STORAGE_MAX_UPLOAD_BYTES))
+        )
     try:
-        file_content, content_type = storage_service.download_file(
-            bucket_id=bucket_id, path=path
+        location = await tus_create(
+            bucket_id,
+            path,
+            upload_length,
+            content_type,
+            upsert,
+            authorization=request.headers.get("authorization"),
+        )
+        state = await create_upload(
+            bucket_id,
+            path,
+            upload_length,
+            location,
+            content_type,
+            owner=credential_identity(request.headers),
         )
-        return StreamingResponse(iter([file_content]), media_type=content_type)
     except Exception as e:
-        raise HTTPException(status_code=404, detail=str(e))
+        raise HTTPException(status_code=400, detail=str(e))
+    url = request.url_for(
+        "append_resumable_upload", bucket_id=bucket_id, upload_id=state.upload_id
+    )
+    return FastJSONResponse(
+        content={
+            "upload_id": state.upload_id,
+            "offset": 0,
+            "length": upload_length,
+            "chunk_size": TUS_CHUNK_BYTES,
+        },
+        status_code=201,
+        headers={"Location": str(url), "Tus-Resumable": TUS_VERSION, "Upload-Offset": "0"},
+    )
+
+
+async def _get_upload_state(bucket_id: str, upload_id: str, request: Request) -> UploadState:
+    state = await get_upload(upload_id)
+    # Someone else's upload is reported exactly like a missing one
+    owner = credential_identity(request.headers) or ""
+    if state is None or state.bucket_id != bucket_id or state.owner != owner:
+        raise HTTPException(status_code=404, detail="Upload not found or expired")
+    return state
+
+
+def _upload_headers(state: UploadState) -> dict[str, str]:
+    return {
+        "Tus-Resumable": TUS_VERSION,
+        "Upload-Offset": str(state.offset),
+        "Upload-Length": str(state.length),
+        "Cache-Control": "no-store",
+    }
+
+
+@router.head("/buckets/{bucket_id}/uploads/{upload_id}")
+async def get_resumable_upload_offset(bucket_id: str, upload_id: str, request: Request):
+    """
+    Report how many bytes of the upload Storage has, to resume from there.
+    """
+    state = await _get_upload_state(bucket_id, upload_id, request)
+    try:
+        state.offset = await tus_offset(
+            state.location, authorization=request.headers.get("authorization")
+        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    await set_upload_offset(upload_id, state.offset)
+    return Response(status_code=200, headers=_upload_headers(state))
+
+
+@router.patch("/buckets/{bucket_id}/uploads/{upload_id}")
+async def append_resumable_upload(
+    bucket_id: str,
+    upload_id: str,
+    request: Request,
+    upload_offset: int = Header(..., alias="Upload-Offset", ge=0),
+):
+    """
+    Append the request body to the upload at Upload-Offset, streaming it through.
+    """
+    if request.headers.get("content-type") != "application/offset+octet-stream":
+        raise HTTPException(
+            status_code=415, detail="Content-Type must be application/offset+octet-stream"
+        )
+    state = await _get_upload_state(bucket_id, upload_id, request)
+    authorization = request.headers.get("authorization")
+    lock = upload_lock(upload_id)
+    if not await lock.acquire(blocking=False):
+        raise HTTPException(status_code=409, detail="A chunk is already being uploaded")
+    try:
+        if upload_offset != state.offset:
+            # Storage may have taken a chunk whose response never reached us
+            state.offset = await tus_offset(state.location, authorization=authorization)
+            await set_upload_offset(upload_id, state.offset)
+        if upload_offset != state.offset:
+            return Response(status_code=409, headers=_upload_headers(state))
+        declared_length = request.headers.get("content-length", "")
+        state.offset = await tus_patch(
+            state.location,
+            state.offset,
+            limit_size(request.stream(), state.length - state.offset),
+            int(declared_length) if declared_length.isdigit() else None,
+            authorization=authorization,
+        )
+        await set_upload_offset(upload_id, state.offset)
+    except UploadTooLarge:
+        raise HTTPException(status_code=413, detail="Chunk runs past the upload length")
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    finally:
+        await release_upload_lock(lock)
+    return Response(status_code=204, headers=_upload_headers(state))
+
+
+@router.post("/buckets/{bucket_id}/uploads/{upload_id}/finalize")
+@invalidates_response_cache("bucket:{bucket_id}")
+async def finalize_resumable_upload(bucket_id: str, upload_id: str, request: Request):
+    """
+    Confirm every byte arrived and close the upload.
+    """
+    state = await _get_upload_state(bucket_id, upload_id, request)
+    try:
+        offset = await tus_offset(
+            state.location, authorization=request.headers.get("authorization")
+        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if offset != state.length:
+        state.offset = offset
+        await set_upload_offset(upload_id, offset)
+        return FastJSONResponse(
+            content={"detail": f"Upload incomplete: {offset} of {state.length} bytes"},
+            status_code=409,
+            headers=_upload_headers(state),
+        )
+    await delete_upload(upload_id)
+    return FastJSONResponse(
+        content={"Key": f"{bucket_id}/{state.path}", "size": state.length}, status_code=201
+    )
+
+
+@router.get("/buckets/{bucket_id}/download")
+async def download_file(
+    bucket_id: str,
+    request: Request,
+    path: str = Query(...),
+):
+    """
+    Stream an object from Supabase Storage in STORAGE_CHUNK_BYTES chunks.
+
+    Range, If-Range, If-None-Match and If-Modified-Since are forwarded, so
+    clients can seek (206 Partial Content) and revalidate (304). Content-Length,
+    ETag and Last-Modified are passed back for clients and CDNs to cache on.
+
+    With STORAGE_CACHE_DIR set, whole downloads are also kept on local disk and
+    later requests are served from there once Storage confirms the ETag (or
+    Last-Modified) still matches, see stream_download.
+    """
+    return await stream_download(request, bucket_id, path)
 
 
 @router.get("/buckets/{bucket_id}/files")
+@cache_response(expire_seconds=30, resources=["bucket:{bucket_id}"])
 async def list_files(
     bucket_id: str,
     path: str = Query(""),
@@ -164,15 +474,17 @@ async def list_files(
     ),
 ):
     try:
-        result = storage_service.list_files(
+        result = await run_supabase_call(
+            storage_service.list_files,
             bucket_id=bucket_id, path=path, limit=limit, offset=offset
         )
-        return JSONResponse(content=result)
+        return FastJSONResponse(content=result)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.post("/buckets/{bucket_id}/move")
+@invalidates_response_cache("bucket:{bucket_id}")
 async def move_file(
     bucket_id: str,
     source_path: str = Query(...),
@@ -182,17 +494,19 @@ async def move_file(
     ),
 ):
     try:
-        result = storage_service.move_file(
+        result = await run_supabase_call(
+            storage_service.move_file,
             bucket_id=bucket_id,
             source_path=source_path,
             destination_path=destination_path,
         )
-        return JSONResponse(content=result)
+        return FastJSONResponse(content=result)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.post("/buckets/{bucket_id}/copy")
+@invalidates_response_cache("bucket:{bucket_id}")
 async def copy_file(
     bucket_id: str,
     source_path: str = Query(...),
@@ -202,17 +516,19 @@ async def copy_file(
     ),
 ):
     try:
-        result = storage_service.copy_file(
+        result = await run_supabase_call(
+            storage_service.copy_file,
             bucket_id=bucket_id,
             source_path=source_path,
             destination_path=destination_path,
         )
-        return JSONResponse(content=result)
+        return FastJSONResponse(content=result)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.delete("/buckets/{bucket_id}/files")
+@invalidates_response_cache("bucket:{bucket_id}")
 async def delete_files(
     bucket_id: str,
     paths: list[str] = Query(...),
@@ -221,12 +537,203 @@ async def delete_files(
     ),
 ):
     try:
-        result = storage_service.delete_file(bucket_id=bucket_id, paths=paths)
-        return JSONResponse(content=result)
+        result = await run_supabase_call(
+            storage_service.delete_file, bucket_id=bucket_id, paths=paths
+        )
+        return FastJSONResponse(content=result)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
+def _item_result(index: int, error: str | None, **fields: Any) -> dict[str, Any]:
+    result = {"index": index, **fields, "status": "ok" if error is None else "error"}
+    if error is not None:
+        result["error"] = error
+    return result
+
+
+async def _batch_response(
+    bucket_id: str,
+    results: AsyncIterator[dict[str, Any]],
+    total: int,
+    stream: bool,
+    cleanup: BackgroundTask | None = None,
+) -> Response:
+    """
+    Return per-item results as one JSON summary (207 if any failed), or with
+    stream=true as NDJSON progress events sent as items finish.
+
+    A streamed batch invalidates the bucket's cached responses again once it
+    ends, since the route's marker fired before any item ran.
+    """
+    if stream:
+        progress = encode_progress(results, total)
+        return StreamingResponse(
+            invalidate_when_done(progress, f"bucket:{bucket_id}"),
+            media_type="application/x-ndjson",
+            background=cleanup,
+        )
+    try:
+        summary = summarize([result async for result in results])
+    finally:
+        if cleanup is not None:
+            await cleanup()
+    return FastJSONResponse(content=summary, status_code=207 if summary["failed"] else 200)
+
+
+async def _transfer_files(
+    transfer: Callable[..., Any],
+    bucket_id: str,
+    batch: BatchPathPairs,
+    concurrency: int,
+    stream: bool,
+) -> Response:
+    async def run(pair: PathPair) -> None:
+        await run_supabase_call(
+            transfer,
+            bucket_id=bucket_id,
+            source_path=pair.source_path,
+            destination_path=pair.destination_path,
+        )
+
+    async def results():
+        async for index, pair, error in run_batch(batch.items, run, concurrency):
+            yield _item_result(
+                index,
+                error,
+                source_path=pair.source_path,
+                destination_path=pair.destination_path,
+            )
+
+    return await _batch_response(bucket_id, results(), len(batch.items), stream)
+
+
+@router.post("/buckets/{bucket_id}/batch/move")
+@invalidates_response_cache("bucket:{bucket_id}")
+async def batch_move_files(
+    bucket_id: str,
+    batch: BatchPathPairs,
+    concurrency: int = Query(STORAGE_BATCH_CONCURRENCY, ge=1, le=32),
+    stream: bool = False,
+    storage_service: SupabaseStorageService = Depends(
+        SupabaseClient.get_storage_service
+    ),
+):
+    """
+    Move many objects, `concurrency` at a time, reporting a status per pair.
+    """
+    return await _transfer_files(
+        storage_service.move_file, bucket_id, batch, concurrency, stream
+    )
+
+
+@router.post("/buckets/{bucket_id}/batch/copy")
+@invalidates_response_cache("bucket:{bucket_id}")
+async def batch_copy_files(
+    bucket_id: str,
+    batch: BatchPathPairs,
+    concurrency: int = Query(STORAGE_BATCH_CONCURRENCY, ge=1, le=32),
+    stream: bool = False,
+    storage_service: SupabaseStorageService = Depends(
+        SupabaseClient.get_storage_service
+    ),
+):
+    """
+    Copy many objects, `concurrency` at a time, reporting a status per pair.
+    """
+    return await _transfer_files(
+        storage_service.copy_file, bucket_id, batch, concurrency, stream
+    )
+
+
+@router.post("/buckets/{bucket_id}/batch/delete")
+@invalidates_response_cache("bucket:{bucket_id}")
+async def batch_delete_files(
+    bucket_id: str,
+    batch: BatchPaths,
+    concurrency: int = Query(STORAGE_BATCH_CONCURRENCY, ge=1, le=32),
+    stream: bool = False,
+    storage_service: SupabaseStorageService = Depends(
+        SupabaseClient.get_storage_service
+    ),
+):
+    """
+    Delete many objects in STORAGE_DELETE_CHUNK-sized calls run concurrently.
+
+    Each path reports the status of the call that removed it.
+    """
+
+    async def remove(paths: list[str]) -> None:
+        await run_supabase_call(
+            storage_service.delete_file, bucket_id=bucket_id, paths=paths
+        )
+
+    async def results():
+        chunks = chunked(batch.paths, STORAGE_DELETE_CHUNK)
+        async for index, paths, error in run_batch(chunks, remove, concurrency):
+            for offset, path in enumerate(paths):
+                yield _item_result(index * STORAGE_DELETE_CHUNK + offset, error, path=path)
+
+    return await _batch_response(bucket_id, results(), len(batch.paths), stream)
+
+
+@router.post(
+    "/buckets/{bucket_id}/batch/upload", openapi_extra=_BATCH_UPLOAD_REQUEST_BODY
+)
+@invalidates_response_cache("bucket:{bucket_id}")
+async def batch_upload_files(
+    bucket_id: str,
+    request: Request,
+    prefix: str = "",
+    upsert: bool = False,
+    concurrency: int = Query(STORAGE_BATCH_CONCURRENCY, ge=1, le=32),
+    stream: bool = False,
+):
+    """
+    Upload every file of a multipart "files" field under prefix, streaming
+    each one to Storage with `concurrency` uploads in flight.
+
+    Each file is subject to STORAGE_MAX_UPLOAD_BYTES and is uploaded with the
+    caller's Authorization header.
+    """
+    if not request.headers.get("content-length", "").isdigit():
+        # The form parser spools every part before anything is checked against the limit
+        raise HTTPException(
+            status_code=411, detail="Multipart uploads need a Content-Length header"
+        )
+    authorization = request.headers.get("authorization")
+    form = await request.form(max_files=STORAGE_BATCH_MAX_ITEMS)
+    files = [file for file in form.getlist("files") if isinstance(file, UploadFile)]
+    if not files:
+        await form.close()
+        raise HTTPException(status_code=400, detail='No files in the "files" form field')
+    max_bytes = settings.STORAGE_MAX_UPLOAD_BYTES
+
+    def object_name(file: UploadFile) -> str:
+        return "/".join(part for part in (prefix.strip("/"), file.filename or "") if part)
+
+    async def upload(file: UploadFile) -> None:
+        if not file.filename:
+            raise ValueError("File has no filename")
+        await upload_stream(
+            bucket_id,
+            object_name(file),
+            limit_size(iter_upload_file(file), max_bytes),
+            content_type=file.content_type,
+            content_length=file.size,
+            upsert=upsert,
+            authorization=authorization,
+        )
+
+    async def results():
+        async for index, file, error in run_batch(files, upload, concurrency):
+            yield _item_result(index, error, path=object_name(file))
+
+    return await _batch_response(
+        bucket_id, results(), len(files), stream, cleanup=BackgroundTask(form.close)
+    )
+
+
 @router.post("/buckets/{bucket_id}/sign")
 async def create_signed_url(
     bucket_id: str,
@@ -237,10 +744,11 @@ async def create_signed_url(
     ),
 ):
     try:
-        result = storage_service.create_signed_url(
+        result = await run_supabase_call(
+            storage_service.create_signed_url,
             bucket_id=bucket_id, path=path, expires_in=expires_in
         )
-        return JSONResponse(content=result)
+        return FastJSONResponse(content=result)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -255,10 +763,11 @@ async def create_signed_urls(
     ),
 ):
     try:
-        result = storage_service.create_signed_urls(
+        result = await run_supabase_call(
+            storage_service.create_signed_urls,
             bucket_id=bucket_id, paths=paths, expires_in=expires_in
         )
-        return JSONResponse(content=result)
+        return FastJSONResponse(content=result)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -272,10 +781,11 @@ async def create_signed_upload_url(
     ),
 ):
     try:
-        result = storage_service.create_signed_upload_url(
+        result = await run_supabase_call(
+            storage_service.create_signed_upload_url,
             bucket_id=bucket_id, path=path
         )
-        return JSONResponse(content=result)
+        return FastJSONResponse(content=result)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -289,7 +799,9 @@ async def get_public_url(
     ),
 ):
     try:
-        result = storage_service.get_public_url(bucket_id=bucket_id, path=path)
-        return JSONResponse(content={"public_url": result})
+        result = await run_supabase_call(
+            storage_service.get_public_url, bucket_id=bucket_id, path=path
+        )
+        return FastJSONResponse(content={"public_url": result})
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
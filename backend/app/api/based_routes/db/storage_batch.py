@@ -0,0 +1,101 @@
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+from typing import Any, TypeVar
+
+from app.api.utils.responses import dumps_json
+from app.caching.utils.response_cache import ainvalidate_response_cache
+
+T = TypeVar("T")
+
+# Defaults for batch storage operations
+STORAGE_BATCH_CONCURRENCY = 8
+STORAGE_BATCH_MAX_ITEMS = 10_000
+# Storage removes at most this many objects per call
+STORAGE_DELETE_CHUNK = 1000
+
+BatchResult = tuple[int, T, str | None]
+
+
+async def run_batch(
+    items: list[T], operation: Callable[[T], Awaitable[Any]], concurrency: int
+) -> AsyncIterator[BatchResult]:
+    """
+    Run operation on every item with at most `concurrency` in flight.
+
+    A failed item does not stop the others. Closing the iterator early
+    cancels the operations still running.
+
+    Yields:
+        (index, item, error message or None) as each item finishes
+    """
+    window = asyncio.Semaphore(concurrency)
+    finished: asyncio.Queue[BatchResult] = asyncio.Queue()
+    tasks: set[asyncio.Task] = set()
+
+    async def run(index: int, item: T) -> None:
+        try:
+            await operation(item)
+            result: BatchResult = (index, item, None)
+        except Exception as e:
+            result = (index, item, str(e) or type(e).__name__)
+        finally:
+            window.release()
+        finished.put_nowait(result)
+
+    async def feed() -> None:
+        for index, item in enumerate(items):
+            await window.acquire()
+            task = asyncio.create_task(run(index, item))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+
+    feeder = asyncio.create_task(feed())
+    try:
+        for _ in items:
+            yield await finished.get()
+    finally:
+        feeder.cancel()
+        for task in list(tasks):
+            task.cancel()
+
+
+def chunked(values: list[str], size: int) -> list[list[str]]:
+    return [values[i : i + size] for i in range(0, len(values), size)]
+
+
+def summarize(results: Iterable[dict[str, Any]]) -> dict[str, Any]:
+    ordered = sorted(results, key=lambda result: result["index"])
+    failed = sum(1 for result in ordered if result["status"] == "error")
+    return {"succeeded": len(ordered) - failed, "failed": failed, "results": ordered}
+
+
+async def encode_progress(
+    results: AsyncIterator[dict[str, Any]], total: int
+) -> AsyncIterator[bytes]:
+    """
+    Encode per-item results as NDJSON progress events, ending with a summary line.
+    """
+    succeeded = failed = 0
+    async for result in results:
+        if result["status"] == "error":
+            failed += 1
+        else:
+            succeeded += 1
+        yield dumps_json({**result, "done": succeeded + failed, "total": total}) + b"\n"
+    yield dumps_json({"succeeded": succeeded, "failed": failed, "total": total}) + b"\n"
+
+
+async def invalidate_when_done(
+    chunks: AsyncIterator[bytes], *resources: str
+) -> AsyncIterator[bytes]:
+    """
+    Pass a streamed body through, then invalidate cached responses for resources.
+
+    An invalidates_response_cache marker fires as a streamed response starts,
+    before the items have run; this drops what was cached in the meantime.
+    """
+    try:
+        async for chunk in chunks:
+            yield chunk
+    finally:
+        await ainvalidate_response_cache(*resources)
@@ -0,0 +1,231 @@
+import base64
+from collections.abc import AsyncIterator, Mapping
+from typing import Any
+from urllib.parse import quote
+
+import httpx
+from starlette.datastructures import UploadFile
+
+from app.core.config import settings
+
+# Bytes read from an upload and forwarded upstream at a time
+STORAGE_CHUNK_BYTES = 1024 * 1024
+# Protocol version of Supabase Storage's resumable (TUS) upload endpoint
+TUS_VERSION = "1.0.0"
+
+# Conditional and range headers forwarded on downloads, and what is passed back
+DOWNLOAD_REQUEST_HEADERS = (
+    "range",
+    "if-range",
+    "if-none-match",
+    "if-modified-since",
+    "accept-encoding",
+)
+DOWNLOAD_RESPONSE_HEADERS = (
+    "content-type",
+    "content-length",
+    "content-range",
+    "content-encoding",
+    "accept-ranges",
+    "etag",
+    "last-modified",
+    "cache-control",
+)
+
+_client: httpx.AsyncClient | None = None
+
+
+class UploadTooLarge(Exception):
+    def __init__(self, max_bytes: int):
+        super().__init__(f"Upload exceeds the maximum size of {max_bytes} bytes")
+        self.max_bytes = max_bytes
+
+
+def get_storage_http_client() -> httpx.AsyncClient:
+    """
+    Get the shared async HTTP client for the Supabase Storage REST API.
+
+    Only connecting is time-limited; large bodies may take as long as they need.
+    The client carries no credentials of its own: every request sends the
+    caller's, see _auth_headers.
+    """
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            base_url=f"{str(settings.SUPABASE_URL).rstrip('/')}/storage/v1",
+            timeout=httpx.Timeout(None, connect=10.0),
+        )
+    return _client
+
+
+async def close_storage_http_client() -> None:
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def _auth_headers(authorization: str | None) -> dict[str, str]:
+    """
+    Act as the caller: forward their Authorization header, or fall back to the
+    anon key, so Storage applies the bucket's policies to them.
+    """
+    key = settings.SUPABASE_ANON_KEY or ""
+    return {"Authorization": authorization or f"Bearer {key}", "apikey": key}
+
+
+def object_path(bucket_id: str, path: str) -> str:
+    return f"/object/{quote(bucket_id, safe='')}/{quote(path.lstrip('/'))}"
+
+
+async def limit_size(chunks: AsyncIterator[bytes], max_bytes: int) -> AsyncIterator[bytes]:
+    """
+    Pass chunks through, raising UploadTooLarge once more than max_bytes went by.
+    """
+    total = 0
+    async for chunk in chunks:
+        total += len(chunk)
+        if total > max_bytes:
+            raise UploadTooLarge(max_bytes)
+        yield chunk
+
+
+async def iter_upload_file(
+    file: UploadFile, chunk_size: int = STORAGE_CHUNK_BYTES
+) -> AsyncIterator[bytes]:
+    while chunk := await file.read(chunk_size):
+        yield chunk
+
+
+async def upload_stream(
+    bucket_id: str,
+    path: str,
+    chunks: AsyncIterator[bytes],
+    content_type: str | None = None,
+    content_length: int | None = None,
+    upsert: bool = False,
+    authorization: str | None = None,
+) -> Any:
+    """
+    Upload an object to Supabase Storage from an async stream of chunks.
+
+    Without a content length the body is sent with chunked transfer encoding,
+    so only one chunk is held in memory at a time either way.
+
+    Raises:
+        httpx.HTTPStatusError: If Storage rejects the upload
+        UploadTooLarge: If chunks comes from limit_size and runs over
+    """
+    headers = {
+        **_auth_headers(authorization),
+        "Content-Type": content_type or "application/octet-stream",
+        "x-upsert": "true" if upsert else "false",
+    }
+    if content_length is not None:
+        headers["Content-Length"] = str(content_length)
+    response = await get_storage_http_client().post(
+        object_path(bucket_id, path), content=chunks, headers=headers
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+async def open_download(
+    bucket_id: str,
+    path: str,
+    headers: Mapping[str, str],
+    authorization: str | None = None,
+) -> httpx.Response:
+    """
+    Start downloading an object; the body is left unread for the caller to stream.
+
+    Range and conditional headers from the client are forwarded, so the
+    response may be a 206, 304 or 416. The caller must close the response.
+    """
+    forwarded = {name: headers[name] for name in DOWNLOAD_REQUEST_HEADERS if name in headers}
+    # Body bytes are relayed as-is, so only ask for encodings the client accepts
+    forwarded.setdefault("accept-encoding", "identity")
+    forwarded.update(_auth_headers(authorization))
+    client = get_storage_http_client()
+    request = client.build_request("GET", object_path(bucket_id, path), headers=forwarded)
+    return await client.send(request, stream=True)
+
+
+def download_headers(response: httpx.Response) -> dict[str, str]:
+    headers = response.headers
+    return {name: headers[name] for name in DOWNLOAD_RESPONSE_HEADERS if name in headers}
+
+
+def _tus_metadata(**values: str) -> str:
+    return ",".join(
+        f"{key} {base64.b64encode(value.encode()).decode()}" for key, value in values.items()
+    )
+
+
+async def tus_create(
+    bucket_id: str,
+    path: str,
+    length: int,
+    content_type: str | None,
+    upsert: bool,
+    authorization: str | None = None,
+) -> str:
+    """
+    Create a resumable upload in Supabase Storage.
+
+    Returns:
+        The upstream upload URL that chunks are sent to
+    """
+    response = await get_storage_http_client().post(
+        "/upload/resumable",
+        headers={
+            **_auth_headers(authorization),
+            "Tus-Resumable": TUS_VERSION,
+            "Upload-Length": str(length),
+            "Upload-Metadata": _tus_metadata(
+                bucketName=bucket_id,
+                objectName=path.lstrip("/"),
+                contentType=content_type or "application/octet-stream",
+            ),
+            "x-upsert": "true" if upsert else "false",
+        },
+    )
+    response.raise_for_status()
+    return response.headers["Location"]
+
+
+async def tus_offset(location: str, authorization: str | None = None) -> int:
+    """
+    Ask Supabase Storage how many bytes of a resumable upload it has stored.
+    """
+    response = await get_storage_http_client().head(
+        location, headers={**_auth_headers(authorization), "Tus-Resumable": TUS_VERSION}
+    )
+    response.raise_for_status()
+    return int(response.headers["Upload-Offset"])
+
+
+async def tus_patch(
+    location: str,
+    offset: int,
+    chunks: AsyncIterator[bytes],
+    content_length: int | None,
+    authorization: str | None = None,
+) -> int:
+    """
+    Append a chunk to a resumable upload, streaming it through.
+
+    Returns:
+        The upload offset after the chunk
+    """
+    headers = {
+        **_auth_headers(authorization),
+        "Tus-Resumable": TUS_VERSION,
+        "Upload-Offset": str(offset),
+        "Content-Type": "application/offset+octet-stream",
+    }
+    if content_length is not None:
+        headers["Content-Length"] = str(content_length)
+    response = await get_storage_http_client().patch(location, content=chunks, headers=headers)
+    response.raise_for_status()
+    return int(response.headers["Upload-Offset"])
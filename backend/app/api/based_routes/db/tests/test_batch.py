@@ -0,0 +1,137 @@
+import pytest
+from pydantic import ValidationError
+
+from app.api.based_routes.db.batch import (
+    BATCH_MAX_OPERATIONS,
+    BATCH_RPC_FUNCTION,
+    BatchRequest,
+    run_batch_operations,
+    run_batch_transaction,
+)
+
+
+class FakeDataService:
+    def __init__(self, fail_on: str | None = None):
+        self.fail_on = fail_on
+        self.calls = []
+
+    async def _record(self, op, table, **kwargs):
+        self.calls.append((op, table, kwargs))
+        if table == self.fail_on:
+            raise RuntimeError(f"{op} on {table} failed")
+        return [{"table": table}]
+
+    async def insert_data(self, table, data, upsert=False, on_conflict=None):
+        return await self._record("insert", table, data=data, upsert=upsert)
+
+    async def update_data(self, table, data, filters):
+        return await self._record("update", table, data=data, filters=filters)
+
+    async def delete_data(self, table, filters):
+        return await self._record("delete", table, filters=filters)
+
+    async def call_function(self, name, params=None):
+        self.calls.append(("rpc", name, params))
+        return [[{"id": 1}], [], [{"id": 2}]]
+
+
+def _batch(**options):
+    return BatchRequest(
+        operations=[
+            {"op": "insert", "table": "orders", "data": {"total": 120}},
+            {
+                "op": "update",
+                "table": "customers",
+                "data": {"vip": True},
+                "filters": {"id": 7},
+            },
+            {"op": "delete", "table": "carts", "filters": {"customer_id": 7}},
+        ],
+        **options,
+    )
+
+
+@pytest.mark.anyio
+async def test_run_batch_operations_runs_in_order():
+    service = FakeDataService()
+    result = await run_batch_operations(_batch(), service)
+    assert [call[:2] for call in service.calls] == [
+        ("insert", "orders"),
+        ("update", "customers"),
+        ("delete", "carts"),
+    ]
+    assert result["transaction"] is False
+    assert [r["status"] for r in result["results"]] == ["ok", "ok", "ok"]
+    assert result["results"][1]["data"] == [{"table": "customers"}]
+
+
+@pytest.mark.anyio
+async def test_run_batch_operations_skips_after_a_failure():
+    service = FakeDataService(fail_on="customers")
+    result = await run_batch_operations(_batch(), service)
+    assert [r["status"] for r in result["results"]] == ["ok", "error", "skipped"]
+    assert result["results"][1]["error"] == "update on customers failed"
+    assert len(service.calls) == 2
+
+
+@pytest.mark.anyio
+async def test_run_batch_operations_can_continue_after_a_failure():
+    service = FakeDataService(fail_on="customers")
+    result = await run_batch_operations(_batch(stop_on_error=False), service)
+    assert [r["status"] for r in result["results"]] == ["ok", "error", "ok"]
+
+
+@pytest.mark.anyio
+async def test_run_batch_transaction_is_one_function_call():
+    service = FakeDataService()
+    result = await run_batch_transaction(_batch(transaction=True), service)
+    [(kind, name, params)] = service.calls
+    assert (kind, name) == ("rpc", BATCH_RPC_FUNCTION)
+    assert [op["op"] for op in params["operations"]] == ["insert", "update", "delete"]
+    assert result == {
+        "transaction": True,
+        "results": [
+            {"index": 0, "status": "ok", "data": [{"id": 1}]},
+            {"index": 1, "status": "ok", "data": []},
+            {"index": 2, "status": "ok", "data": [{"id": 2}]},
+        ],
+    }
+
+
+def test_batch_request_validates_operations():
+    with pytest.raises(ValidationError):
+        BatchRequest(operations=[])
+    with pytest.raises(ValidationError):
+        BatchRequest(operations=[{"op": "truncate", "table": "orders"}])
+    with pytest.raises(ValidationError):
+        BatchRequest(
+            operations=[
+                {"op": "delete", "table": "t", "filters": {"id": i}}
+                for i in range(BATCH_MAX_OPERATIONS + 1)
+            ]
+        )
+
+
+@pytest.mark.anyio
+async def test_run_batch_transaction_only_takes_equality_filters():
+    service = FakeDataService()
+    batch = BatchRequest(
+        transaction=True,
+        operations=[
+            {"op": "delete", "table": "carts", "filters": {"id": 1, "deleted_at": None}},
+            {"op": "delete", "table": "carts", "filters": {"id": {"gt": 1}}},
+        ],
+    )
+    with pytest.raises(ValueError, match="Operation 1"):
+        await run_batch_transaction(batch, service)
+    assert service.calls == []
+
+
+def test_batch_updates_and_deletes_need_filters():
+    for operation in (
+        {"op": "delete", "table": "carts", "filters": {}},
+        {"op": "update", "table": "carts", "data": {"a": 1}, "filters": {}},
+        {"op": "delete", "table": "carts"},
+    ):
+        with pytest.raises(ValidationError):
+            BatchRequest(operations=[operation])
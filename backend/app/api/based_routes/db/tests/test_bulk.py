@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+
+from app.api.based_routes.db.bulk import (
+    iter_chunks,
+    iter_ndjson_rows,
+    iter_rows,
+    run_chunks,
+)
+
+
+async def _stream(*parts):
+    for part in parts:
+        yield part
+
+
+async def _collect(items):
+    return [item async for item in items]
+
+
+@pytest.mark.anyio
+async def test_iter_ndjson_rows_handles_lines_split_across_chunks():
+    stream = _stream(b'{"id": 1}\n{"id"', b': 2}\n\n{"id": 3}')
+    assert await _collect(iter_ndjson_rows(stream)) == [{"id": 1}, {"id": 2}, {"id": 3}]
+
+
+@pytest.mark.anyio
+async def test_iter_ndjson_rows_reports_the_broken_line():
+    with pytest.raises(ValueError, match="Line 2"):
+        await _collect(iter_ndjson_rows(_stream(b'{"id": 1}\n[1]\n')))
+    with pytest.raises(ValueError, match="Invalid JSON on line 1"):
+        await _collect(iter_ndjson_rows(_stream(b"{nope\n")))
+
+
+@pytest.mark.anyio
+async def test_iter_chunks_bounds_rows_and_bytes():
+    rows = [{"id": i} for i in range(5)]
+    chunks = await _collect(iter_chunks(iter_rows(rows), max_rows=2, max_bytes=1024))
+    assert chunks == [rows[:2], rows[2:4], rows[4:]]
+
+    # {"id":0} is 8 bytes, so two rows fit in 16
+    chunks = await _collect(iter_chunks(iter_rows(rows), max_rows=100, max_bytes=16))
+    assert [len(chunk) for chunk in chunks] == [2, 2, 1]
+
+    big = [{"blob": "x" * 100}]
+    assert await _collect(iter_chunks(iter_rows(big), max_rows=10, max_bytes=10)) == [big]
+
+
+@pytest.mark.anyio
+async def test_run_chunks_counts_failed_chunks_and_input_errors():
+    async def insert_chunk(chunk):
+        if chunk[0]["id"] == 2:
+            raise RuntimeError("duplicate key")
+
+    async def chunks():
+        yield [{"id": 0}, {"id": 1}]
+        yield [{"id": 2}]
+        raise ValueError("Line 4 is not a JSON object")
+
+    summary = await run_chunks(chunks(), insert_chunk, concurrency=2)
+    assert summary["inserted"] == 2
+    assert summary["failed"] == 1
+    assert summary["error"] == "Line 4 is not a JSON object"
+    assert [chunk["status"] for chunk in summary["chunks"]] == ["ok", "error"]
+
+
+@pytest.mark.anyio
+async def test_run_chunks_limits_concurrency():
+    running = peak = 0
+
+    async def insert_chunk(_chunk):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    chunks = iter_chunks(iter_rows([{"id": i} for i in range(20)]), 1, 1024)
+    summary = await run_chunks(chunks, insert_chunk, concurrency=3)
+    assert summary["inserted"] == 20
+    assert peak == 3
+
+
+@pytest.mark.anyio
+async def test_run_chunks_cancels_chunks_in_flight_when_cancelled():
+    started = asyncio.Event()
+    cancelled = []
+
+    async def insert_chunk(chunk):
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(chunk[0]["id"])
+            raise
+
+    # The second chunk waits for a slot, so the cancel lands before gather is reached
+    chunks = iter_chunks(iter_rows([{"id": i} for i in range(2)]), 1, 1024)
+    run = asyncio.ensure_future(run_chunks(chunks, insert_chunk, concurrency=1))
+    await started.wait()
+    await asyncio.sleep(0)
+    run.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await run
+    await asyncio.sleep(0)
+    assert cancelled == [0]
@@ -0,0 +1,123 @@
+import os
+import socket
+import subprocess
+import sys
+
+import pytest
+
+from app.api.based_routes.db.download_cache import CachedObject, DownloadCache
+
+
+async def _stream(*parts):
+    for part in parts:
+        yield part
+
+
+async def _fill(cache, path, body, headers=None):
+    headers = headers or {"etag": f'"{path}"', "content-type": "text/plain"}
+    chunks = [chunk async for chunk in cache.fill("docs", path, _stream(*body), headers)]
+    return b"".join(chunks)
+
+
+def _dead_pid() -> int:
+    process = subprocess.Popen([sys.executable, "-c", "pass"])
+    process.wait()
+    return process.pid
+
+
+@pytest.mark.anyio
+async def test_fill_passes_the_body_through_and_caches_it(tmp_path):
+    cache = DownloadCache(str(tmp_path), max_bytes=1024, max_object_bytes=1024)
+
+    assert await _fill(cache, "a.txt", [b"hello ", b"world"]) == b"hello world"
+
+    entry = cache.get("docs", "a.txt")
+    assert entry.size == 11
+    assert entry.etag == '"a.txt"'
+    assert entry.content_type == "text/plain"
+    with open(cache.file_path(entry), "rb") as file:
+        assert file.read() == b"hello world"
+    assert os.listdir(cache.directory) == [entry.digest]
+
+
+@pytest.mark.anyio
+async def test_download_cut_short_leaves_nothing_behind(tmp_path):
+    cache = DownloadCache(str(tmp_path), max_bytes=1024, max_object_bytes=1024)
+
+    fill = cache.fill("docs", "a.txt", _stream(b"hello ", b"world"), {"etag": '"1"'})
+    assert await anext(fill) == b"hello "
+    await fill.aclose()
+
+    assert cache.get("docs", "a.txt") is None
+    assert os.listdir(cache.directory) == []
+
+
+@pytest.mark.anyio
+async def test_same_content_under_two_paths_is_stored_once(tmp_path):
+    cache = DownloadCache(str(tmp_path), max_bytes=1024, max_object_bytes=1024)
+
+    await _fill(cache, "a.txt", [b"same"])
+    await _fill(cache, "b.txt", [b"same"])
+
+    assert cache.get("docs", "a.txt").digest == cache.get("docs", "b.txt").digest
+    assert len(os.listdir(cache.directory)) == 1
+    assert cache._size == 4
+
+
+@pytest.mark.anyio
+async def test_least_recently_used_objects_are_evicted(tmp_path):
+    cache = DownloadCache(str(tmp_path), max_bytes=10, max_object_bytes=10)
+
+    await _fill(cache, "a.txt", [b"aaaa"])
+    await _fill(cache, "b.txt", [b"bbbb"])
+    cache.get("docs", "a.txt")
+    await _fill(cache, "c.txt", [b"cccc"])
+
+    assert cache.get("docs", "b.txt") is None
+    assert cache.get("docs", "a.txt") is not None
+    assert cache.get("docs", "c.txt") is not None
+    assert cache._size == 8
+    assert len(os.listdir(cache.directory)) == 2
+
+
+def test_cacheable_needs_a_known_plain_body_and_a_validator(tmp_path):
+    cache = DownloadCache(str(tmp_path), max_bytes=1024, max_object_bytes=10)
+
+    assert cache.cacheable({"content-length": "10", "etag": '"1"'})
+    assert cache.cacheable({"content-length": "10", "last-modified": "yesterday"})
+    assert not cache.cacheable({"content-length": "11", "etag": '"1"'})
+    assert not cache.cacheable({"etag": '"1"'})
+    assert not cache.cacheable({"content-length": "10"})
+    assert not cache.cacheable(
+        {"content-length": "10", "etag": '"1"', "content-encoding": "gzip"}
+    )
+
+
+def test_validators_prefer_the_etag():
+    entry = CachedObject("d", 1, '"1"', "yesterday", None)
+    assert DownloadCache.validators(entry) == {"if-none-match": '"1"'}
+    entry = CachedObject("d", 1, None, "yesterday", None)
+    assert DownloadCache.validators(entry) == {"if-modified-since": "yesterday"}
+
+
+def test_each_process_gets_a_directory_named_by_host_and_pid(tmp_path):
+    cache = DownloadCache(str(tmp_path), max_bytes=1024, max_object_bytes=1024)
+    assert os.path.basename(cache.directory) == f"{socket.gethostname()}-{os.getpid()}"
+
+
+def test_only_this_hosts_stale_directories_are_removed(tmp_path):
+    hostname = socket.gethostname()
+    dead_pid = _dead_pid()
+    stale = tmp_path / f"{hostname}-{dead_pid}"
+    live = tmp_path / f"{hostname}-{os.getppid()}"
+    other_host = tmp_path / f"other-host-{dead_pid}"
+    unrelated = tmp_path / str(dead_pid)
+    for directory in (stale, live, other_host, unrelated):
+        directory.mkdir()
+
+    DownloadCache(str(tmp_path), max_bytes=1024, max_object_bytes=1024)
+
+    assert not stale.exists()
+    assert live.exists()
+    assert other_host.exists()
+    assert unrelated.exists()
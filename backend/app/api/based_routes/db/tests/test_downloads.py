@@ -0,0 +1,163 @@
+import httpx
+import pytest
+from fastapi import FastAPI, Request
+
+from app.api.based_routes.db import downloads, storage_client
+from app.api.based_routes.db.download_cache import DownloadCache
+from app.api.based_routes.db.downloads import stream_download
+
+app = FastAPI()
+
+
+@app.get("/buckets/{bucket_id}/download")
+async def download_file(bucket_id: str, path: str, request: Request):
+    return await stream_download(request, bucket_id, path)
+
+
+class _Body(httpx.AsyncByteStream):
+    # Unlike content=bytes, which httpx reads up front, this can be streamed with aiter_raw
+    def __init__(self, data: bytes):
+        self.data = data
+
+    async def __aiter__(self):
+        yield self.data
+
+
+def _response(status_code: int, body: bytes, headers: dict[str, str]) -> httpx.Response:
+    headers = {**headers, "content-length": str(len(body))}
+    return httpx.Response(status_code, stream=_Body(body), headers=headers)
+
+
+class FakeStorage:
+    """
+    Stands in for Supabase Storage: serves one object and honours If-None-Match and Range.
+    """
+
+    def __init__(self, body: bytes, etag: str = '"v1"'):
+        self.body = body
+        self.etag = etag
+        self.requests: list[httpx.Request] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        headers = {"etag": self.etag, "content-type": "text/plain"}
+        if request.headers.get("if-none-match") == self.etag:
+            return httpx.Response(304, headers=headers)
+        if "range" in request.headers:
+            start, end = map(int, request.headers["range"].removeprefix("bytes=").split("-"))
+            headers["content-range"] = f"bytes {start}-{end}/{len(self.body)}"
+            return _response(206, self.body[start : end + 1], headers)
+        return _response(200, self.body, headers)
+
+
+@pytest.fixture
+def storage(monkeypatch):
+    fake = FakeStorage(b"hello world")
+    client = httpx.AsyncClient(
+        base_url="https://project.supabase.co/storage/v1",
+        transport=httpx.MockTransport(fake),
+    )
+    monkeypatch.setattr(storage_client, "_client", client)
+    return fake
+
+
+@pytest.fixture
+def cache(monkeypatch, tmp_path):
+    cache = DownloadCache(str(tmp_path), max_bytes=1024, max_object_bytes=1024)
+    monkeypatch.setattr(downloads, "get_download_cache", lambda: cache)
+    return cache
+
+
+async def _get(headers=None):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.get(
+            "/buckets/docs/download", params={"path": "a.txt"}, headers=headers
+        )
+
+
+@pytest.mark.anyio
+async def test_without_a_cache_the_object_is_relayed(storage):
+    response = await _get({"authorization": "Bearer user-jwt"})
+
+    assert response.status_code == 200
+    assert response.content == b"hello world"
+    assert response.headers["etag"] == '"v1"'
+    assert storage.requests[0].headers["authorization"] == "Bearer user-jwt"
+
+
+@pytest.mark.anyio
+async def test_cached_copy_is_served_from_disk_after_a_304(storage, cache):
+    await _get()
+    assert cache.get("docs", "a.txt") is not None
+
+    response = await _get({"authorization": "Bearer user-jwt"})
+
+    assert response.status_code == 200
+    assert response.content == b"hello world"
+    assert response.headers["etag"] == '"v1"'
+    validation = storage.requests[1]
+    assert validation.headers["if-none-match"] == '"v1"'
+    assert validation.headers["authorization"] == "Bearer user-jwt"
+    assert len(storage.requests) == 2
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("storage", "cache")
+async def test_client_revalidation_of_a_cached_copy_gets_a_304():
+    await _get()
+
+    response = await _get({"if-none-match": '"v1"'})
+
+    assert response.status_code == 304
+    assert response.content == b""
+
+
+@pytest.mark.anyio
+@pytest.mark.usefixtures("cache")
+async def test_range_requests_on_a_cached_object_go_to_storage(storage):
+    await _get()
+
+    response = await _get({"range": "bytes=6-10"})
+
+    assert response.status_code == 206
+    assert response.content == b"world"
+    assert response.headers["content-range"] == "bytes 6-10/11"
+    ranged = storage.requests[1]
+    assert ranged.headers["range"] == "bytes=6-10"
+    assert "if-none-match" not in ranged.headers
+
+
+@pytest.mark.anyio
+async def test_changed_object_is_streamed_from_the_validation_and_refills_the_cache(
+    storage, cache
+):
+    await _get()
+    storage.body, storage.etag = b"new content", '"v2"'
+
+    response = await _get()
+
+    assert response.status_code == 200
+    assert response.content == b"new content"
+    # The validation request's 200 was the download; Storage was not asked again
+    assert len(storage.requests) == 2
+    entry = cache.get("docs", "a.txt")
+    assert entry.etag == '"v2"'
+    with open(cache.file_path(entry), "rb") as file:
+        assert file.read() == b"new content"
+
+
+@pytest.mark.anyio
+async def test_missing_objects_are_reported_as_404(monkeypatch, cache):
+    client = httpx.AsyncClient(
+        base_url="https://project.supabase.co/storage/v1",
+        transport=httpx.MockTransport(
+            lambda request: _response(400, b"Object not found", {})
+        ),
+    )
+    monkeypatch.setattr(storage_client, "_client", client)
+
+    response = await _get()
+
+    assert response.status_code == 404
+    assert cache.get("docs", "a.txt") is None
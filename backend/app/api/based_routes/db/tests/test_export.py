@@ -0,0 +1,76 @@
+import csv
+import io
+import json
+
+import pytest
+
+from app.api.based_routes.db.export import encode_pages, encode_rows
+
+ROWS = [
+    {"id": 1, "name": "ada", "tags": ["a", "b"]},
+    {"id": 2, "name": "grace", "tags": []},
+    {"id": 3, "name": "linus", "tags": None},
+]
+
+
+async def _pages(*pages):
+    for page in pages:
+        yield page
+
+
+async def _collect(chunks):
+    return [chunk async for chunk in chunks]
+
+
+@pytest.mark.anyio
+async def test_encode_pages_json_is_one_array_across_pages():
+    chunks = await _collect(encode_pages(_pages(ROWS[:2], [], ROWS[2:]), "json"))
+    assert json.loads(b"".join(chunks)) == ROWS
+    # One chunk per non-empty page, plus the brackets
+    assert len(chunks) == 4
+
+
+@pytest.mark.anyio
+async def test_encode_pages_json_without_rows_is_an_empty_array():
+    chunks = await _collect(encode_pages(_pages(), "json"))
+    assert b"".join(chunks) == b"[]"
+
+
+@pytest.mark.anyio
+async def test_encode_pages_ndjson_is_one_line_per_row():
+    chunks = await _collect(encode_pages(_pages(ROWS[:1], ROWS[1:]), "ndjson"))
+    lines = b"".join(chunks).splitlines()
+    assert [json.loads(line) for line in lines] == ROWS
+    assert len(chunks) == 2
+
+
+@pytest.mark.anyio
+async def test_encode_pages_csv_writes_the_header_once():
+    later = [{"name": "margaret", "id": 4, "extra": "dropped"}]
+    chunks = await _collect(encode_pages(_pages([], ROWS, later), "csv"))
+    records = list(csv.reader(io.StringIO(b"".join(chunks).decode())))
+    assert records == [
+        ["id", "name", "tags"],
+        ["1", "ada", '["a","b"]'],
+        ["2", "grace", "[]"],
+        ["3", "linus", ""],
+        ["4", "margaret", ""],
+    ]
+
+
+def test_encode_rows_matches_the_streamed_formats():
+    assert json.loads(encode_rows(ROWS, "json")) == ROWS
+    assert [json.loads(line) for line in encode_rows(ROWS, "ndjson").splitlines()] == ROWS
+    assert encode_rows(iter(ROWS), "csv").decode().splitlines()[0] == "id,name,tags"
+
+
+def test_encode_rows_columns_transposes_the_result():
+    assert json.loads(encode_rows(ROWS, "columns")) == {
+        "id": [1, 2, 3],
+        "name": ["ada", "grace", "linus"],
+        "tags": [["a", "b"], [], None],
+    }
+
+
+def test_encode_rows_csv_without_rows_is_empty():
+    assert encode_rows([], "csv") == b""
@@ -0,0 +1,94 @@
+import logging
+
+import pytest
+
+from app.api.based_routes.db.filters import (
+    check_indexes,
+    compile_filters,
+    set_index_catalog,
+    to_postgrest,
+    to_sql,
+)
+
+
+def test_to_sql_binds_every_value():
+    where, params = to_sql({"status": "open", "total": {"gte": 10, "lt": 99}})
+    assert where == '"status" = %s AND ("total" >= %s AND "total" < %s)'
+    assert params == ["open", 10, 99]
+    assert to_sql(None) == ("TRUE", [])
+
+
+def test_to_sql_logic_trees_and_lists():
+    where, params = to_sql({"or": [{"id": {"in": [1, 2]}}, {"name": {"ilike": "a%"}}]})
+    assert where == '("id" = ANY(%s) OR "name" ILIKE %s)'
+    assert params == [[1, 2], "a%"]
+
+
+def test_to_postgrest_always_uses_operator_form():
+    assert to_postgrest({"id": 7, "name": "a,b"}) == {"id": "eq.7", "name": "eq.a,b"}
+    assert to_postgrest({"id": {"in": [1, "x,y"]}, "deleted": {"is": None}}) == {
+        "deleted": "is.null",
+        "id": 'in.(1,"x,y")',
+    }
+    assert to_postgrest({}) == {}
+
+
+def test_to_postgrest_quotes_values_inside_logic_trees():
+    assert to_postgrest({"or": [{"name": "a,b"}, {"age": {"gt": 3}}], "id": 1}) == {
+        "id": "eq.1",
+        "and": '(or(name.eq."a,b",age.gt.3))',
+    }
+
+
+def test_null_equality_is_null():
+    assert to_sql({"deleted_at": None, "id": 4}) == ('"deleted_at" IS NULL AND "id" = %s', [4])
+    assert to_postgrest({"deleted_at": None}) == {"deleted_at": "is.null"}
+    assert to_postgrest({"or": [{"a": None}, {"b": 1}]}) == {"and": "(or(a.is.null,b.eq.1))"}
+    plan, values = compile_filters({"deleted_at": None, "id": 4})
+    assert plan.plain and values == [4]
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [{"a": {"eq": None}}, {"a": {"gt": None}}, {"a": {"in": [1, None]}}],
+)
+def test_null_with_other_operators_is_rejected(filters):
+    with pytest.raises(ValueError, match='"is": null'):
+        to_sql(filters)
+
+
+@pytest.mark.parametrize(
+    "filters",
+    [
+        {"bad column": 1},
+        {"a": {"between": [1, 2]}},
+        {"a": {}},
+        {"or": []},
+        {"a": {"in": 3}},
+        {"a": {"is": "maybe"}},
+        ["a"],
+    ],
+)
+def test_malformed_filters_are_rejected(filters):
+    with pytest.raises(ValueError):
+        to_sql(filters)
+
+
+def test_plans_are_shared_between_values_and_plain_is_tracked():
+    first, _ = compile_filters({"id": 1})
+    second, values = compile_filters({"id": 2})
+    assert first is second and values == [2]
+    assert not compile_filters({"id": {"gt": 1}})[0].plain
+    assert compile_filters({"id": {"isnot": None}})[0].sql == '"id" IS NOT NULL'
+
+
+def test_check_indexes_warns_once_per_column(caplog):
+    set_index_catalog({"orders": ["id"]})
+    try:
+        with caplog.at_level(logging.WARNING):
+            assert check_indexes("orders", frozenset({"id", "status"})) == ["status"]
+            to_sql({"status": "x"}, "orders")
+        assert sum("orders.status" in r.message for r in caplog.records) == 1
+        assert check_indexes("views", frozenset({"anything"})) == []
+    finally:
+        set_index_catalog(None)
@@ -0,0 +1,142 @@
+import contextlib
+
+import pytest
+from psycopg.types.json import Jsonb
+
+from app.api.based_routes.db import postgres
+from app.api.based_routes.db.postgres import PostgresDatabaseService
+
+
+class FakeCursor:
+    def __init__(self, rows, columns):
+        self.rows = rows
+        self.description = [type("Column", (), {"name": name}) for name in columns]
+
+    async def fetchall(self):
+        return self.rows
+
+
+class FakeConnection:
+    def __init__(self, rows, columns):
+        self.rows = rows
+        self.columns = columns
+        self.executed = []
+
+    async def execute(self, query, params, prepare=False):
+        self.executed.append((query.as_string(None), params, prepare))
+        return FakeCursor(self.rows, self.columns)
+
+
+class FakePool:
+    def __init__(self, rows=(), columns=("id",)):
+        self.conn = FakeConnection(list(rows), list(columns))
+
+    @contextlib.asynccontextmanager
+    async def connection(self):
+        yield self.conn
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    fake = FakePool()
+
+    async def get_pool():
+        return fake
+
+    monkeypatch.setattr(postgres, "get_pool", get_pool)
+    monkeypatch.setattr(postgres, "_exposed_tables", frozenset())
+    monkeypatch.setattr(postgres, "_primary_keys", {"orders": ["id"]})
+    return fake
+
+
+@pytest.mark.anyio
+async def test_fetch_data_builds_a_schema_qualified_select(pool):
+    await PostgresDatabaseService().fetch_data(
+        "orders",
+        select="id,total",
+        filters={"status": "open", "total": {"gt": 5}},
+        order="created_at.desc.nullslast,id",
+        limit=10,
+    )
+    [(query, params, prepare)] = pool.conn.executed
+    assert query == (
+        'SELECT "id", "total" FROM "public"."orders" '
+        'WHERE "status" = %s AND "total" > %s '
+        'ORDER BY "created_at" DESC NULLS LAST, "id" ASC LIMIT %s OFFSET %s'
+    )
+    assert params == ["open", 5, 10, 0]
+    assert prepare is True
+
+
+@pytest.mark.anyio
+async def test_fetch_data_rejects_unsafe_columns(pool):
+    with pytest.raises(ValueError):
+        await PostgresDatabaseService().fetch_data("orders", select="id; drop table x")
+    with pytest.raises(ValueError):
+        await PostgresDatabaseService().fetch_data("orders", order="id desc")
+    assert pool.conn.executed == []
+
+
+@pytest.mark.anyio
+async def test_insert_data_is_one_statement_with_an_upsert_target(pool):
+    rows = [{"id": 1, "total": 5}, {"id": 2, "note": "x"}]
+    await PostgresDatabaseService().insert_data("orders", rows, upsert=True)
+    [(query, params, _)] = pool.conn.executed
+    assert query == (
+        'INSERT INTO "public"."orders" ("id", "total", "note") SELECT "id", "total", "note" '
+        'FROM jsonb_populate_recordset(NULL::"public"."orders", %s) '
+        'ON CONFLICT ("id") DO UPDATE SET "total" = EXCLUDED."total", "note" = EXCLUDED."note" '
+        "RETURNING *"
+    )
+    assert isinstance(params[0], Jsonb) and params[0].obj == rows
+
+
+@pytest.mark.anyio
+async def test_update_and_delete_require_filters(pool):
+    service = PostgresDatabaseService()
+    with pytest.raises(ValueError):
+        await service.update_data("orders", {"total": 1}, {})
+    with pytest.raises(ValueError):
+        await service.delete_data("orders", {})
+    await service.delete_data("orders", {"id": {"in": [1, 2]}})
+    assert pool.conn.executed[-1][:2] == (
+        'DELETE FROM "public"."orders" WHERE "id" = ANY(%s) RETURNING *',
+        [[1, 2]],
+    )
+
+
+@pytest.mark.anyio
+async def test_tables_outside_the_allowlist_are_refused(pool, monkeypatch):
+    monkeypatch.setattr(postgres, "_exposed_tables", frozenset({"orders"}))
+    service = PostgresDatabaseService()
+    await service.fetch_data("orders")
+    for call in (
+        service.fetch_data("pg_authid"),
+        service.insert_data("secrets", {"a": 1}),
+        service.delete_data("secrets", {"id": 1}),
+        service.primary_key("secrets"),
+    ):
+        with pytest.raises(ValueError, match="not exposed"):
+            await call
+    assert len(pool.conn.executed) == 1
+
+
+@pytest.mark.anyio
+async def test_call_function_is_allowlisted_and_passes_json_as_jsonb(pool):
+    service = PostgresDatabaseService()
+    operations = [{"op": "delete", "table": "carts", "filters": {"id": 1}}]
+    await service.call_function("apply_batch", {"operations": operations})
+    [(query, params, _)] = pool.conn.executed
+    assert query == 'SELECT * FROM "public"."apply_batch"("operations" => %(operations)s)'
+    assert isinstance(params["operations"], Jsonb)
+    assert params["operations"].obj == operations
+
+    with pytest.raises(ValueError, match="not exposed"):
+        await service.call_function("pg_read_file", {"filename": "/etc/passwd"})
+
+
+def test_function_arguments_keep_scalar_lists_as_arrays():
+    assert postgres._function_argument([1, 2]) == [1, 2]
+    assert postgres._function_argument("x") == "x"
+    assert isinstance(postgres._function_argument({"a": 1}), Jsonb)
+    assert isinstance(postgres._function_argument([[1], [2]]), Jsonb)
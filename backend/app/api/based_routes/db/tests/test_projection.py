@@ -0,0 +1,54 @@
+import pytest
+
+from app.api.based_routes.db.projection import (
+    _parse_projections,
+    parse_fields,
+    resolve_select,
+    set_default_projection,
+    to_columns,
+)
+
+
+@pytest.fixture
+def profiles_projection():
+    set_default_projection("profiles", ["id", "username"])
+    yield
+    set_default_projection("profiles", None)
+
+
+def test_parse_projections_reads_the_env_format():
+    assert _parse_projections("profiles=id, username ;orders=id,status;broken") == {
+        "profiles": "id,username",
+        "orders": "id,status",
+    }
+
+
+def test_parse_fields_accepts_only_column_names():
+    assert parse_fields(" id, name ,") == ["id", "name"]
+    for fields in ("", "id,owner(name)", "id::text", "*"):
+        with pytest.raises(ValueError):
+            parse_fields(fields)
+
+
+@pytest.mark.usefixtures("profiles_projection")
+def test_resolve_select_prefers_fields_then_select_then_default():
+    assert resolve_select("profiles", "*", "id,bio") == "id,bio"
+    assert resolve_select("profiles", "id,avatar_url", None) == "id,avatar_url"
+    assert resolve_select("profiles", "*", None) == "id,username"
+    assert resolve_select("orders", "*", None) == "*"
+
+
+@pytest.mark.usefixtures("profiles_projection")
+def test_set_default_projection_can_be_cleared():
+    set_default_projection("profiles", None)
+    assert resolve_select("profiles", "*", None) == "*"
+
+
+def test_to_columns_fills_missing_values():
+    rows = [{"id": 1, "name": "a"}, {"id": 2}, {"id": 3, "bio": "x"}]
+    assert to_columns(rows) == {
+        "id": [1, 2, 3],
+        "name": ["a", None, None],
+        "bio": [None, None, "x"],
+    }
+    assert to_columns([]) == {}
@@ -0,0 +1,84 @@
+import pytest
+from starlette.requests import Request
+
+from app.api.based_routes.db.query_cache import (
+    cached_query,
+    disable_query_cache,
+    enable_query_cache,
+    invalidate_query_cache,
+    query_cache_key,
+    query_scope,
+)
+from app.caching.utils.redis_cache import redis_cache
+from app.caching.utils.response_cache import _auth_identity
+
+
+@pytest.fixture(autouse=True)
+def clear_redis_cache():
+    redis_cache.flushdb()
+    enable_query_cache("products", ttl=60)
+    yield
+    disable_query_cache("products")
+    redis_cache.flushdb()
+
+
+def _request(**headers):
+    raw = [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw})
+
+
+class Counter:
+    def __init__(self):
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        return [{"id": self.calls}]
+
+
+def test_query_scope_matches_the_response_cache_identity():
+    request = _request(authorization="Bearer token")
+    assert query_scope(request) == _auth_identity(request.headers)
+    assert query_scope(_request(cookie="session=1")) != query_scope(request)
+    assert query_scope(_request()) == "anon"
+
+
+def test_query_cache_key_normalizes_arguments():
+    key = query_cache_key("products", "id, name", {"b": 1, "a": 2}, None, 10, None, "anon")
+    assert key == query_cache_key("products", "id,name", {"a": 2, "b": 1}, "", 10, 0, "anon")
+    assert key != query_cache_key("products", "id,name", {"a": 2, "b": 1}, "", 10, 0, "other")
+    assert key.startswith("db_query:products:")
+
+
+@pytest.mark.anyio
+async def test_cached_query_reads_through_per_caller():
+    fetch = Counter()
+    args = ("*", {"id": 1}, None, None, None)
+    alice = _request(authorization="Bearer alice")
+    assert await cached_query(alice, "products", args, fetch) == [{"id": 1}]
+    assert await cached_query(alice, "products", args, fetch) == [{"id": 1}]
+    assert fetch.calls == 1
+    assert await cached_query(_request(authorization="Bearer bob"), "products", args, fetch) == [
+        {"id": 2}
+    ]
+
+
+@pytest.mark.anyio
+async def test_cached_query_skips_tables_not_opted_in():
+    fetch = Counter()
+    args = ("*", None, None, None, None)
+    await cached_query(_request(), "orders", args, fetch)
+    await cached_query(_request(), "orders", args, fetch)
+    assert fetch.calls == 2
+
+
+@pytest.mark.anyio
+async def test_cached_query_no_cache_and_invalidation_refresh_the_result():
+    fetch = Counter()
+    args = ("*", None, None, None, None)
+    await cached_query(_request(), "products", args, fetch)
+    assert await cached_query(_request(cache_control="no-cache"), "products", args, fetch) == [
+        {"id": 2}
+    ]
+    assert await invalidate_query_cache("products") == 1
+    assert await cached_query(_request(), "products", args, fetch) == [{"id": 3}]
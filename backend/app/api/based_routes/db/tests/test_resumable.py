@@ -0,0 +1,71 @@
+import pytest
+from redis.exceptions import LockNotOwnedError
+
+from app.api.based_routes.db.resumable import (
+    UPLOAD_STATE_TTL,
+    create_upload,
+    delete_upload,
+    get_upload,
+    release_upload_lock,
+    set_upload_offset,
+    upload_lock,
+)
+from app.caching.utils.redis_cache import get_async_redis, redis_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_redis_cache():
+    redis_cache.flushdb()
+    yield
+    redis_cache.flushdb()
+
+
+@pytest.mark.anyio
+async def test_upload_state_round_trips_with_its_owner():
+    state = await create_upload(
+        "docs", "a.pdf", 9, "https://storage/upload/abc", None, owner="caller-hash"
+    )
+
+    stored = await get_upload(state.upload_id)
+    assert stored == state
+    assert stored.owner == "caller-hash"
+    assert stored.content_type == ""
+    ttl = await get_async_redis().ttl(f"storage_upload:{state.upload_id}")
+    assert 0 < ttl <= UPLOAD_STATE_TTL
+
+
+@pytest.mark.anyio
+async def test_anonymous_uploads_have_an_empty_owner():
+    state = await create_upload("docs", "a.pdf", 9, "https://storage/upload/abc", "text/plain")
+    assert (await get_upload(state.upload_id)).owner == ""
+
+
+@pytest.mark.anyio
+async def test_offset_updates_and_delete():
+    state = await create_upload("docs", "a.pdf", 9, "https://storage/upload/abc", None)
+
+    await set_upload_offset(state.upload_id, 6)
+    assert (await get_upload(state.upload_id)).offset == 6
+
+    await delete_upload(state.upload_id)
+    assert await get_upload(state.upload_id) is None
+
+
+@pytest.mark.anyio
+async def test_upload_lock_admits_one_chunk_at_a_time():
+    assert await upload_lock("abc").acquire(blocking=False)
+    assert not await upload_lock("abc").acquire(blocking=False)
+    assert await upload_lock("other").acquire(blocking=False)
+
+
+class _ExpiredLock:
+    name = "storage_upload:abc:lock"
+
+    async def release(self):
+        raise LockNotOwnedError("Cannot release a lock that's no longer owned")
+
+
+@pytest.mark.anyio
+async def test_releasing_an_expired_lock_does_not_raise():
+    # The chunk made it to Storage; a lock that timed out meanwhile is no error
+    await release_upload_lock(_ExpiredLock())
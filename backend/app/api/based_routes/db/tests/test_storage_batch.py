@@ -0,0 +1,152 @@
+import asyncio
+
+import orjson
+import pytest
+
+from app.api.based_routes.db import storage_batch
+from app.api.based_routes.db.storage_batch import (
+    chunked,
+    encode_progress,
+    invalidate_when_done,
+    run_batch,
+    summarize,
+)
+
+
+async def _stream(*parts):
+    for part in parts:
+        yield part
+
+
+async def _collect(items):
+    return [item async for item in items]
+
+
+@pytest.mark.anyio
+async def test_run_batch_reports_every_item_and_keeps_going_after_failures():
+    async def operation(item):
+        if item == "b":
+            raise ValueError("no such object")
+
+    results = await _collect(run_batch(["a", "b", "c"], operation, concurrency=2))
+
+    assert sorted(results) == [(0, "a", None), (1, "b", "no such object"), (2, "c", None)]
+
+
+@pytest.mark.anyio
+async def test_run_batch_keeps_at_most_concurrency_in_flight():
+    running = peak = 0
+
+    async def operation(_item):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+
+    results = await _collect(run_batch(list(range(10)), operation, concurrency=3))
+
+    assert len(results) == 10
+    assert peak == 3
+
+
+@pytest.mark.anyio
+async def test_run_batch_names_errors_without_a_message():
+    async def operation(_item):
+        raise TimeoutError()
+
+    assert await _collect(run_batch(["a"], operation, concurrency=1)) == [
+        (0, "a", "TimeoutError")
+    ]
+
+
+@pytest.mark.anyio
+async def test_closing_run_batch_early_cancels_running_operations():
+    cancelled = []
+
+    async def operation(item):
+        if item == 0:
+            return
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(item)
+            raise
+
+    results = run_batch([0, 1, 2], operation, concurrency=3)
+    assert await anext(results) == (0, 0, None)
+    await results.aclose()
+    await asyncio.sleep(0)
+
+    assert sorted(cancelled) == [1, 2]
+
+
+def test_chunked_splits_into_fixed_size_chunks():
+    assert chunked(["a", "b", "c", "d", "e"], 2) == [["a", "b"], ["c", "d"], ["e"]]
+    assert chunked([], 2) == []
+
+
+def test_summarize_orders_results_and_counts_failures():
+    summary = summarize(
+        [
+            {"index": 1, "status": "error", "error": "boom"},
+            {"index": 0, "status": "ok"},
+        ]
+    )
+
+    assert summary == {
+        "succeeded": 1,
+        "failed": 1,
+        "results": [
+            {"index": 0, "status": "ok"},
+            {"index": 1, "status": "error", "error": "boom"},
+        ],
+    }
+
+
+@pytest.mark.anyio
+async def test_encode_progress_emits_ndjson_events_and_a_summary():
+    results = _stream({"index": 0, "status": "ok"}, {"index": 1, "status": "error"})
+
+    lines = await _collect(encode_progress(results, total=2))
+
+    assert all(line.endswith(b"\n") for line in lines)
+    assert [orjson.loads(line) for line in lines] == [
+        {"index": 0, "status": "ok", "done": 1, "total": 2},
+        {"index": 1, "status": "error", "done": 2, "total": 2},
+        {"succeeded": 1, "failed": 1, "total": 2},
+    ]
+
+
+@pytest.mark.anyio
+async def test_invalidate_when_done_invalidates_after_the_last_chunk(monkeypatch):
+    events = []
+
+    async def invalidate(*resources):
+        events.append(("invalidate", resources))
+        return 0
+
+    monkeypatch.setattr(storage_batch, "ainvalidate_response_cache", invalidate)
+
+    async for chunk in invalidate_when_done(_stream(b"a", b"b"), "bucket:docs"):
+        events.append(chunk)
+
+    assert events == [b"a", b"b", ("invalidate", ("bucket:docs",))]
+
+
+@pytest.mark.anyio
+async def test_invalidate_when_done_invalidates_when_the_stream_stops_early(monkeypatch):
+    invalidated = []
+
+    async def invalidate(*resources):
+        invalidated.extend(resources)
+        return 0
+
+    monkeypatch.setattr(storage_batch, "ainvalidate_response_cache", invalidate)
+
+    body = invalidate_when_done(_stream(b"a", b"b"), "bucket:docs")
+    assert await anext(body) == b"a"
+    assert invalidated == []
+    await body.aclose()
+
+    assert invalidated == ["bucket:docs"]
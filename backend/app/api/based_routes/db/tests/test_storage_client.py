@@ -0,0 +1,183 @@
+import httpx
+import pytest
+
+from app.api.based_routes.db import storage_client
+from app.api.based_routes.db.storage_client import (
+    UploadTooLarge,
+    download_headers,
+    limit_size,
+    open_download,
+    tus_create,
+    tus_offset,
+    tus_patch,
+    upload_stream,
+)
+from app.core.config import settings
+
+
+@pytest.fixture
+def storage(monkeypatch):
+    """
+    Route the shared storage client to a handler that records every request.
+    """
+    requests = []
+    responses = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        request.read()
+        requests.append(request)
+        return responses.get(request.method, httpx.Response(200, json={}))
+
+    client = httpx.AsyncClient(
+        base_url="https://project.supabase.co/storage/v1",
+        transport=httpx.MockTransport(handler),
+    )
+    monkeypatch.setattr(storage_client, "_client", client)
+    return requests, responses
+
+
+async def _stream(*parts):
+    for part in parts:
+        yield part
+
+
+async def _collect(items):
+    return [item async for item in items]
+
+
+@pytest.mark.anyio
+async def test_upload_stream_acts_as_the_caller(storage):
+    requests, responses = storage
+    responses["POST"] = httpx.Response(200, json={"Key": "avatars/a.png"})
+
+    result = await upload_stream(
+        "avatars",
+        "/a.png",
+        _stream(b"ab", b"cd"),
+        content_type="image/png",
+        content_length=4,
+        authorization="Bearer user-jwt",
+    )
+
+    assert result == {"Key": "avatars/a.png"}
+    request = requests[0]
+    assert request.url.path == "/storage/v1/object/avatars/a.png"
+    assert request.headers["authorization"] == "Bearer user-jwt"
+    assert request.headers["apikey"] == settings.SUPABASE_ANON_KEY
+    assert request.headers["content-type"] == "image/png"
+    assert request.headers["x-upsert"] == "false"
+    assert request.content == b"abcd"
+
+
+@pytest.mark.anyio
+async def test_requests_without_a_caller_token_use_the_anon_key(storage):
+    requests, _ = storage
+    await upload_stream("avatars", "a.png", _stream(b"x"))
+
+    assert requests[0].headers["authorization"] == f"Bearer {settings.SUPABASE_ANON_KEY}"
+    assert settings.SUPABASE_SERVICE_ROLE_KEY not in requests[0].headers.values()
+
+
+@pytest.mark.anyio
+async def test_upload_stream_raises_when_storage_refuses(storage):
+    _, responses = storage
+    responses["POST"] = httpx.Response(403, json={"message": "row-level security"})
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await upload_stream("avatars", "a.png", _stream(b"x"), authorization="Bearer u")
+
+
+@pytest.mark.anyio
+async def test_tus_requests_act_as_the_caller(storage):
+    requests, responses = storage
+    location = "https://project.supabase.co/storage/v1/upload/resumable/abc"
+    responses["POST"] = httpx.Response(201, headers={"Location": location})
+    responses["HEAD"] = httpx.Response(200, headers={"Upload-Offset": "6"})
+    responses["PATCH"] = httpx.Response(204, headers={"Upload-Offset": "9"})
+
+    assert await tus_create("docs", "/a.pdf", 9, None, True, authorization="Bearer u") == location
+    assert await tus_offset(location, authorization="Bearer u") == 6
+    assert await tus_patch(location, 6, _stream(b"xyz"), 3, authorization="Bearer u") == 9
+
+    create, head, patch = requests
+    assert all(r.headers["authorization"] == "Bearer u" for r in requests)
+    assert create.headers["upload-length"] == "9"
+    assert create.headers["x-upsert"] == "true"
+    assert head.url == location
+    assert patch.headers["upload-offset"] == "6"
+    assert patch.headers["content-type"] == "application/offset+octet-stream"
+    assert patch.content == b"xyz"
+
+
+@pytest.mark.anyio
+async def test_limit_size_stops_once_the_limit_is_passed():
+    assert await _collect(limit_size(_stream(b"ab", b"cd"), 4)) == [b"ab", b"cd"]
+
+    seen = []
+    with pytest.raises(UploadTooLarge):
+        async for chunk in limit_size(_stream(b"ab", b"cd", b"ef"), 5):
+            seen.append(chunk)
+    assert seen == [b"ab", b"cd"]
+
+
+@pytest.mark.anyio
+async def test_open_download_forwards_range_and_conditional_headers(storage):
+    requests, responses = storage
+    responses["GET"] = httpx.Response(
+        206, content=b"cd", headers={"Content-Range": "bytes 2-3/4"}
+    )
+    client_headers = {
+        "range": "bytes=2-3",
+        "if-none-match": '"v1"',
+        "cookie": "session=1",
+        "authorization": "Bearer spoofed",
+    }
+
+    response = await open_download(
+        "avatars", "dir/a b.png", client_headers, authorization="Bearer user-jwt"
+    )
+    try:
+        assert response.status_code == 206
+        assert await response.aread() == b"cd"
+    finally:
+        await response.aclose()
+
+    request = requests[0]
+    assert request.url.raw_path == b"/storage/v1/object/avatars/dir/a%20b.png"
+    assert request.headers["range"] == "bytes=2-3"
+    assert request.headers["if-none-match"] == '"v1"'
+    assert request.headers["authorization"] == "Bearer user-jwt"
+    assert "cookie" not in request.headers
+    # Without an Accept-Encoding from the client the body is asked for unencoded
+    assert request.headers["accept-encoding"] == "identity"
+
+
+@pytest.mark.anyio
+async def test_open_download_keeps_the_client_accept_encoding(storage):
+    requests, _ = storage
+    response = await open_download("avatars", "a.png", {"accept-encoding": "gzip"})
+    await response.aclose()
+    assert requests[0].headers["accept-encoding"] == "gzip"
+
+
+def test_download_headers_passes_back_only_cache_and_range_headers():
+    response = httpx.Response(
+        206,
+        headers={
+            "Content-Type": "image/png",
+            "Content-Length": "2",
+            "Content-Range": "bytes 2-3/4",
+            "ETag": '"v1"',
+            "Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT",
+            "Set-Cookie": "upstream=1",
+            "X-Kong-Upstream-Latency": "3",
+        },
+    )
+
+    assert download_headers(response) == {
+        "content-type": "image/png",
+        "content-length": "2",
+        "content-range": "bytes 2-3/4",
+        "etag": '"v1"',
+        "last-modified": "Wed, 01 Jan 2025 00:00:00 GMT",
+    }
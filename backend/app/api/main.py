@@ -47,7 +47,7 @@ from app.api.based_routes.vapi.assistants import router as vapi_assistants_route
 from app.api.based_routes.vapi.calls import router as vapi_calls_router
 from app.api.based_routes.vapi.voice import router as vapi_voice_router
 from app.api.based_routes.vapi.webhooks import router as vapi_webhooks_router
-from app.api.routes.db import private
+from app.api.routes.db import cache, private
 from app.core.config import settings
 
 # from app.supabase_home.client import SupabaseClient
@@ -168,6 +168,7 @@ api_router.include_router(ghl_upload_contact_router)
 api_router.include_router(ghl_apply_tag_router)
 api_router.include_router(ghl_schedule_appointment_router)
 api_router.include_router(theharvester_router, prefix="/osint/theharvester")
+api_router.include_router(cache.router)
 
 if settings.ENVIRONMENT == "local":
     api_router.include_router(private.router)
@@ -0,0 +1,68 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends, Query
+
+from app.api.deps import get_current_active_superuser
+from app.caching.utils.metrics import OTHER_PREFIX, get_traffic_stats
+from app.caching.utils.redis_cache import get_async_redis
+
+router = APIRouter(prefix="/cache", tags=["cache"])
+
+
+async def _sample_memory(sample_size: int) -> dict[str, dict[str, int]]:
+    """
+    Estimate Redis memory per key prefix from a SCAN sample of keys.
+    """
+    client = get_async_redis()
+    keys: list[bytes] = []
+    async for key in client.scan_iter(count=min(sample_size, 1000)):
+        keys.append(key)
+        if len(keys) >= sample_size:
+            break
+
+    pipe = client.pipeline(transaction=False)
+    for key in keys:
+        pipe.memory_usage(key)
+    usages = await pipe.execute(raise_on_error=False)
+
+    memory: dict[str, dict[str, int]] = {}
+    for key, usage in zip(keys, usages, strict=True):
+        # Split locally: metrics.key_prefix would spend the label budget on every sampled key
+        name = key.decode(errors="replace") if isinstance(key, bytes) else key
+        prefix = name.split(":", 1)[0] or OTHER_PREFIX
+        stats = memory.setdefault(prefix, {"keys": 0, "bytes": 0})
+        stats["keys"] += 1
+        stats["bytes"] += usage if isinstance(usage, int) else 0
+    return memory
+
+
+def _hit_ratio(stats: dict[str, float]) -> float | None:
+    lookups = stats["hits"] + stats["misses"]
+    return stats["hits"] / lookups if lookups else None
+
+
+@router.get("/stats/", dependencies=[Depends(get_current_active_superuser)])
+async def cache_stats(
+    limit: int = Query(20, ge=1, le=100),
+    sample_size: int = Query(1000, ge=1, le=10_000),
+) -> dict[str, Any]:
+    """
+    Top cache key prefixes by sampled Redis memory and by this worker's traffic.
+    """
+    memory = await _sample_memory(sample_size)
+    traffic = get_traffic_stats()
+
+    by_memory = sorted(memory.items(), key=lambda item: item[1]["bytes"], reverse=True)
+    by_traffic = sorted(
+        traffic.items(),
+        key=lambda item: item[1]["hits"] + item[1]["misses"],
+        reverse=True,
+    )
+    return {
+        "sampled_keys": sum(stats["keys"] for stats in memory.values()),
+        "by_memory": [{"prefix": prefix, **stats} for prefix, stats in by_memory[:limit]],
+        "by_traffic": [
+            {"prefix": prefix, **stats, "hit_ratio": _hit_ratio(stats)}
+            for prefix, stats in by_traffic[:limit]
+        ],
+    }
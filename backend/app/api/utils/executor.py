@@ -0,0 +1,91 @@
+import asyncio
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
+from prometheus_client import Gauge, Histogram
+
+from app.core.config import settings
+
+T = TypeVar("T")
+
+SUPABASE_EXECUTOR_IN_FLIGHT = Gauge(
+    "supabase_executor_in_flight",
+    "Supabase service calls currently running on the executor",
+)
+SUPABASE_EXECUTOR_QUEUED = Gauge(
+    "supabase_executor_queued",
+    "Supabase service calls waiting for a free executor thread",
+)
+SUPABASE_EXECUTOR_WAIT_SECONDS = Histogram(
+    "supabase_executor_wait_seconds",
+    "Time a Supabase service call waited for a free executor thread",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+SUPABASE_EXECUTOR_WORKERS = Gauge(
+    "supabase_executor_workers",
+    "Size of the Supabase service executor",
+)
+
+_executor: ThreadPoolExecutor | None = None
+_executor_lock = threading.Lock()
+
+
+def get_supabase_executor() -> ThreadPoolExecutor:
+    """
+    Get the bounded thread pool that runs synchronous Supabase service calls.
+
+    Sized by SUPABASE_EXECUTOR_WORKERS; saturation shows up as a non-zero
+    supabase_executor_queued gauge and a growing wait histogram.
+    """
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.SUPABASE_EXECUTOR_WORKERS,
+                    thread_name_prefix="supabase",
+                )
+                SUPABASE_EXECUTOR_WORKERS.set(settings.SUPABASE_EXECUTOR_WORKERS)
+    return _executor
+
+
+def shutdown_supabase_executor() -> None:
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown(wait=False, cancel_futures=True)
+            _executor = None
+
+
+async def run_supabase_call(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """
+    Run a blocking Supabase service call without stalling the event loop.
+
+    Args:
+        func: The synchronous service method
+        args: Positional arguments for func
+        kwargs: Keyword arguments for func
+
+    Returns:
+        The result of func
+    """
+    submitted = time.perf_counter()
+    # Whoever takes this first (the worker thread, or cleanup after a cancel) dequeues
+    dequeued = threading.Lock()
+    SUPABASE_EXECUTOR_QUEUED.inc()
+
+    def call() -> T:
+        if dequeued.acquire(blocking=False):
+            SUPABASE_EXECUTOR_QUEUED.dec()
+        SUPABASE_EXECUTOR_WAIT_SECONDS.observe(time.perf_counter() - submitted)
+        with SUPABASE_EXECUTOR_IN_FLIGHT.track_inprogress():
+            return func(*args, **kwargs)
+
+    try:
+        return await asyncio.get_running_loop().run_in_executor(get_supabase_executor(), call)
+    finally:
+        if dequeued.acquire(blocking=False):
+            SUPABASE_EXECUTOR_QUEUED.dec()
@@ -0,0 +1,79 @@
+import dataclasses
+import datetime
+import decimal
+import enum
+import uuid
+from typing import Any
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def _default(value: Any) -> Any:
+    # Types orjson cannot encode natively
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    if isinstance(value, decimal.Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, set | frozenset):
+        return list(value)
+    if isinstance(value, bytes):
+        return value.decode(errors="replace")
+    if numpy is not None and isinstance(value, numpy.generic | numpy.ndarray):
+        return value.tolist()
+    if isinstance(value, datetime.datetime | datetime.date | datetime.time):
+        return value.isoformat()
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    # Anything else gets what jsonable_encoder did before this response class
+    try:
+        return jsonable_encoder(value)
+    except ValueError:
+        raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps_json(content: Any) -> bytes:
+    """
+    Encode content as JSON with orjson.
+
+    Handles datetimes, UUIDs, numpy values, Decimals, enums and pydantic models
+    directly, and falls back to FastAPI's jsonable_encoder for other objects.
+    """
+    return orjson.dumps(
+        content,
+        default=_default,
+        option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+    )
+
+
+def loads_json(data: bytes | str) -> Any:
+    """
+    Decode JSON with orjson.
+
+    Raises:
+        ValueError: If data is not valid JSON
+    """
+    return orjson.loads(data)
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response rendered with orjson.
+
+    Returning an instance from a route skips FastAPI's jsonable_encoder pass,
+    so plain dicts and lists are encoded exactly once.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps_json(content)
@@ -0,0 +1,56 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.api.utils.executor import (
+    SUPABASE_EXECUTOR_IN_FLIGHT,
+    SUPABASE_EXECUTOR_QUEUED,
+    run_supabase_call,
+    shutdown_supabase_executor,
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_executor():
+    shutdown_supabase_executor()
+    yield
+    shutdown_supabase_executor()
+
+
+@pytest.mark.anyio
+async def test_run_supabase_call_runs_off_the_event_loop():
+    loop_thread = threading.current_thread()
+
+    def call(value, *, suffix):
+        return threading.current_thread(), f"{value}{suffix}"
+
+    thread, result = await run_supabase_call(call, "bucket", suffix="-1")
+    assert result == "bucket-1"
+    assert thread is not loop_thread
+    assert thread.name.startswith("supabase")
+
+
+@pytest.mark.anyio
+async def test_run_supabase_call_propagates_errors():
+    def fail():
+        raise ValueError("bucket not found")
+
+    with pytest.raises(ValueError, match="bucket not found"):
+        await run_supabase_call(fail)
+    assert SUPABASE_EXECUTOR_QUEUED._value.get() == 0
+    assert SUPABASE_EXECUTOR_IN_FLIGHT._value.get() == 0
+
+
+@pytest.mark.anyio
+async def test_run_supabase_call_keeps_the_loop_responsive():
+    release = threading.Event()
+    call = asyncio.ensure_future(run_supabase_call(release.wait, 5))
+    # The blocked call leaves the loop free to run other coroutines
+    await asyncio.sleep(0.05)
+    assert not call.done()
+    assert SUPABASE_EXECUTOR_IN_FLIGHT._value.get() == 1
+    release.set()
+    assert await call is True
+    assert SUPABASE_EXECUTOR_QUEUED._value.get() == 0
+    assert SUPABASE_EXECUTOR_IN_FLIGHT._value.get() == 0
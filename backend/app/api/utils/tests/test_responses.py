@@ -0,0 +1,93 @@
+import dataclasses
+import datetime
+import decimal
+import enum
+import json
+import pathlib
+import uuid
+
+import pytest
+from pydantic import BaseModel
+
+from app.api.utils.responses import FastJSONResponse, dumps_json, loads_json
+
+
+class Color(enum.Enum):
+    RED = "red"
+
+
+class Item(BaseModel):
+    name: str
+    created: datetime.date
+
+
+@dataclasses.dataclass
+class Point:
+    x: int
+    y: int
+
+
+class Record:
+    # A plain object, as a Supabase client result may hold
+    def __init__(self):
+        self.id = 7
+        self.tags = {"a"}
+
+
+def test_dumps_json_handles_common_python_types():
+    value = {
+        "when": datetime.datetime(2024, 5, 1, 12, 30),
+        "id": uuid.UUID(int=1),
+        "whole": decimal.Decimal("3"),
+        "fraction": decimal.Decimal("0.5"),
+        "color": Color.RED,
+        "set": {1},
+        "bytes": b"hi",
+        "model": Item(name="a", created=datetime.date(2024, 1, 2)),
+        "point": Point(1, 2),
+        1: "non-string key",
+    }
+    assert json.loads(dumps_json(value)) == {
+        "when": "2024-05-01T12:30:00",
+        "id": "00000000-0000-0000-0000-000000000001",
+        "whole": 3,
+        "fraction": 0.5,
+        "color": "red",
+        "set": [1],
+        "bytes": "hi",
+        "model": {"name": "a", "created": "2024-01-02"},
+        "point": {"x": 1, "y": 2},
+        "1": "non-string key",
+    }
+
+
+def test_dumps_json_falls_back_to_jsonable_encoder():
+    value = {
+        "record": Record(),
+        "path": pathlib.PurePosixPath("/tmp/a"),
+        "delta": datetime.timedelta(seconds=90),
+    }
+    assert json.loads(dumps_json(value)) == {
+        "record": {"id": 7, "tags": ["a"]},
+        "path": "/tmp/a",
+        "delta": 90.0,
+    }
+
+
+def test_dumps_json_rejects_unencodable_objects():
+    with pytest.raises(TypeError):
+        dumps_json({"value": object()})
+
+
+def test_loads_json_round_trips_and_rejects_invalid_input():
+    assert loads_json(dumps_json({"a": [1, None]})) == {"a": [1, None]}
+    assert loads_json('{"a": 1}') == {"a": 1}
+    with pytest.raises(ValueError):
+        loads_json(b"{nope")
+
+
+def test_fast_json_response_renders_compact_json():
+    response = FastJSONResponse({"id": uuid.UUID(int=2), "ok": True}, status_code=201)
+    assert response.status_code == 201
+    assert response.body == b'{"id":"00000000-0000-0000-0000-000000000002","ok":true}'
+    assert response.headers["content-type"] == "application/json"
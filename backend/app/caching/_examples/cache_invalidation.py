@@ -5,6 +5,13 @@ from typing import Any
 from fastapi import APIRouter
 from fastapi.responses import JSONResponse
 import asyncio
+from app.caching.utils.invalidation import (
+    abump_namespace_version,
+    aversioned_key,
+    bump_namespace_version,
+    get_namespace_version,
+    invalidate_pattern,
+)
 from app.caching.utils.redis_cache import invalidate_cache
 
 logger = logging.getLogger(__name__)
@@ -37,6 +44,9 @@ async def invalidate_model_caches(model_type: str, instance_id: Any = None) -> N
             specific_key = pattern.replace('*', str(instance_id))
             invalidate_cache(specific_key)
             logger.debug(f"Invalidated cache key: {specific_key}")
+        elif '*' in pattern:
+            deleted = invalidate_pattern(pattern)
+            logger.debug(f"Invalidated {deleted} cache keys matching: {pattern}")
         else:
             invalidate_cache(pattern)
             logger.debug(f"Invalidated cache key: {pattern}")
@@ -46,18 +56,16 @@ class VersionedCache:
     """
     Utility for managing versioned cache keys.
     Allows instant invalidation of all caches for a resource type by incrementing the version.
+    Versions live in Redis, so a bump in one worker is seen by all of them.
     """
-    _versions = {}
 
     @classmethod
     def get_version(cls, resource_type: str) -> str:
-        return str(cls._versions.get(resource_type, 1))
+        return str(get_namespace_version(resource_type))
 
     @classmethod
     def increment_version(cls, resource_type: str) -> str:
-        cls._versions[resource_type] = cls._versions.get(resource_type, 1) + 1
-        logger.info(f"Incremented cache version for {resource_type}: {cls._versions[resource_type]}")
-        return str(cls._versions[resource_type])
+        return str(bump_namespace_version(resource_type))
 
     @classmethod
     def get_key(cls, resource_type: str, key_suffix: str) -> str:
@@ -70,7 +78,7 @@ async def get_cached_products(category: str = None) -> dict:
     """
     Get a list of products with versioned caching.
     """
-    cache_key = VersionedCache.get_key('product', f"list:{category or 'all'}")
+    cache_key = await aversioned_key('product', f"list:{category or 'all'}")
     # Simulate fetching from cache (replace with actual cache lookup)
     logger.info(f"Fetching products with cache key: {cache_key}")
     await asyncio.sleep(1)  # Simulate delay
@@ -87,8 +95,8 @@ async def invalidate_product_cache() -> str:
     """
     Invalidate all product-related caches by incrementing the version.
     """
-    new_version = VersionedCache.increment_version('product')
-    return new_version
+    new_version = await abump_namespace_version('product')
+    return str(new_version)
 
 # API endpoints for demonstration
 @router.get("/cached-products", summary="Get cached products", tags=["Caching Examples"])
@@ -0,0 +1,45 @@
+import pytest
+
+from app.caching.utils.redis_cache import (
+    aget_or_set_many,
+    get_cached_result,
+    get_many,
+    get_or_set_many,
+    redis_cache,
+    set_many,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_redis_cache():
+    redis_cache.flushdb()
+    yield
+    redis_cache.flushdb()
+
+def test_set_many_and_get_many():
+    assert set_many({"user:1": {"id": 1}, "user:2": {"id": 2}}, expire_seconds=10) is True
+    assert get_many(["user:1", "user:2", "user:3"]) == {"user:1": {"id": 1}, "user:2": {"id": 2}}
+    assert get_cached_result("user:2") == {"id": 2}
+    assert 0 < redis_cache.ttl("user:1") <= 10
+
+def test_get_or_set_many_loads_only_missing_keys():
+    set_many({"row:1": "one"})
+    requested = []
+    def loader(keys):
+        requested.append(keys)
+        return {key: key.upper() for key in keys if key != "row:4"}
+    result = get_or_set_many(["row:1", "row:2", "row:3", "row:4"], loader, expire_seconds=10)
+    assert requested == [["row:2", "row:3", "row:4"]]
+    assert result == {"row:1": "one", "row:2": "ROW:2", "row:3": "ROW:3"}
+    # Everything the loader returned is now cached
+    requested.clear()
+    get_or_set_many(["row:1", "row:2", "row:3"], loader)
+    assert requested == []
+
+@pytest.mark.anyio
+async def test_aget_or_set_many_with_async_loader():
+    async def loader(keys):
+        return {key: len(key) for key in keys}
+    result = await aget_or_set_many(["a", "bb", "a"], loader, expire_seconds=10)
+    assert result == {"a": 1, "bb": 2}
+    assert get_many(["a", "bb"]) == {"a": 1, "bb": 2}
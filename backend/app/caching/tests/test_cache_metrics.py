@@ -0,0 +1,49 @@
+import pytest
+
+from app.caching.utils import metrics
+from app.caching.utils.metrics import CACHE_REQUESTS, OTHER_PREFIX, key_prefix
+from app.caching.utils.redis_cache import (
+    get_cached_result,
+    get_or_set_cache,
+    redis_cache,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_redis_cache():
+    redis_cache.flushdb()
+    yield
+    redis_cache.flushdb()
+
+def requests_count(prefix, result):
+    return CACHE_REQUESTS.labels(prefix, result)._value.get()
+
+def test_key_prefix_uses_first_segment():
+    assert key_prefix("metrics_user:42") == "metrics_user"
+    assert key_prefix("metrics_bare_key") == "metrics_bare_key"
+
+def test_key_prefix_hides_hash_like_segments():
+    assert key_prefix("0123456789abcdef0123:payload") == OTHER_PREFIX
+    assert key_prefix(":leading") == OTHER_PREFIX
+
+def test_key_prefix_is_bounded(monkeypatch):
+    monkeypatch.setattr(metrics, "CACHE_METRICS_MAX_PREFIXES", len(metrics._known_prefixes) + 1)
+    assert key_prefix("metrics_first_new:1") == "metrics_first_new"
+    assert key_prefix("metrics_second_new:1") == OTHER_PREFIX
+    # Prefixes seen before the cap keep their own label
+    assert key_prefix("metrics_first_new:2") == "metrics_first_new"
+
+def test_hits_and_misses_are_counted():
+    hits = requests_count("metrics_counted", "hit")
+    misses = requests_count("metrics_counted", "miss")
+    get_or_set_cache("metrics_counted:1", lambda: "value", expire_seconds=10)
+    get_or_set_cache("metrics_counted:1", lambda: "value", expire_seconds=10)
+    get_cached_result("metrics_counted:2")
+    assert requests_count("metrics_counted", "hit") == hits + 1
+    assert requests_count("metrics_counted", "miss") == misses + 2
+
+def test_traffic_stats_track_compute_time():
+    get_or_set_cache("metrics_traffic:1", lambda: "value", expire_seconds=10)
+    stats = metrics.get_traffic_stats()["metrics_traffic"]
+    assert stats["misses"] >= 1
+    assert stats["compute_seconds"] >= 0
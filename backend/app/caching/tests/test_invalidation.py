@@ -0,0 +1,104 @@
+import time
+
+import pytest
+
+from app.caching.utils.invalidation import (
+    ainvalidate_tags,
+    bump_namespace_version,
+    get_namespace_version,
+    invalidate_pattern,
+    invalidate_tags,
+    tag_keys,
+    versioned_key,
+)
+from app.caching.utils.local_cache import CACHE_INVALIDATION_CHANNEL
+from app.caching.utils.redis_cache import (
+    aget_or_revalidate_cache,
+    aget_or_set_cache,
+    cache_result,
+    get_cached_result,
+    get_or_set_cache,
+    redis_cache,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_redis_cache():
+    redis_cache.flushdb()
+    yield
+    redis_cache.flushdb()
+
+def test_invalidate_tags_deletes_only_tagged_keys():
+    get_or_set_cache("user:1:profile", lambda: "p1", 60, tags=["user:1"])
+    get_or_set_cache("user:1:orders", lambda: "o1", 60, tags=["user:1", "orders"])
+    get_or_set_cache("user:2:profile", lambda: "p2", 60, tags=["user:2"])
+    assert invalidate_tags("user:1") == 2
+    assert get_cached_result("user:1:profile") is None
+    assert get_cached_result("user:1:orders") is None
+    assert get_cached_result("user:2:profile") == "p2"
+    assert not redis_cache.exists("tag:user:1")
+
+def test_tag_set_outlives_its_members():
+    get_or_set_cache("short", lambda: 1, 10, tags=["t"])
+    get_or_set_cache("long", lambda: 2, 100, tags=["t"])
+    assert 10 < redis_cache.ttl("tag:t") <= 100
+    get_or_set_cache("forever", lambda: 3, tags=["t"])
+    assert redis_cache.ttl("tag:t") == -1
+
+def test_cache_result_tags_and_manual_tagging():
+    calls = {"count": 0}
+    @cache_result(expire_seconds=60, key_prefix="tagged", tags=["products"])
+    def list_products():
+        calls["count"] += 1
+        return ["a", "b"]
+    list_products()
+    redis_cache.set("featured_products", b"raw")
+    tag_keys("featured_products", ["products"])
+    assert invalidate_tags("products") == 2
+    list_products()
+    assert calls["count"] == 2
+
+def test_invalidate_pattern_uses_scan():
+    for i in range(1200):
+        redis_cache.set(f"user_permissions:{i}", b"x")
+    redis_cache.set("user_list", b"x")
+    assert invalidate_pattern("user_permissions:*") == 1200
+    assert redis_cache.dbsize() == 1
+
+def test_namespace_versions_are_shared():
+    assert get_namespace_version("product") == 1
+    key_v1 = versioned_key("product", "list:all")
+    assert key_v1 == "product:list:all:v1"
+    assert bump_namespace_version("product") == 2
+    assert versioned_key("product", "list:all") == "product:list:all:v2"
+    assert redis_cache.get("ns_version:product") == b"2"
+
+@pytest.mark.anyio
+async def test_ainvalidate_tags():
+    await aget_or_set_cache("a", lambda: 1, 60, tags=["grp"])
+    await aget_or_set_cache("b", lambda: 2, 60, tags=["grp"])
+    assert await ainvalidate_tags("grp") == 2
+    assert get_cached_result("a") is None
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("single_flight", [False, True])
+async def test_aget_or_revalidate_cache_tags_misses(single_flight):
+    await aget_or_revalidate_cache(
+        "swr_tagged", lambda: 1, expire_seconds=60, single_flight=single_flight, tags=["swr"]
+    )
+    assert await ainvalidate_tags("swr") == 1
+    assert get_cached_result("swr_tagged") is None
+
+def test_tag_invalidation_is_announced_to_every_worker():
+    # No local tier is registered here; other workers may still hold a copy
+    pubsub = redis_cache.pubsub(ignore_subscribe_messages=True)
+    pubsub.subscribe(CACHE_INVALIDATION_CHANNEL)
+    pubsub.get_message(timeout=1.0)
+    get_or_set_cache("remote:1", lambda: 1, 60, tags=["remote"])
+    assert invalidate_tags("remote") == 1
+    deadline = time.time() + 2
+    message = None
+    while message is None and time.time() < deadline:
+        message = pubsub.get_message(timeout=0.1)
+    pubsub.close()
+    assert message is not None and message["data"] == b"remote:1"
@@ -0,0 +1,86 @@
+import pytest
+from starlette.requests import Request
+
+from app.caching.utils.keys import make_key_builder, register_ignored_key_type
+from app.caching.utils.redis_cache import cache_result, redis_cache
+
+
+@pytest.fixture(autouse=True)
+def clear_redis_cache():
+    redis_cache.flushdb()
+    yield
+    redis_cache.flushdb()
+
+class FakeService:
+    pass
+
+class RegisteredService:
+    def __repr__(self):
+        return f"RegisteredService(id={id(self)})"
+
+def fetch(table, limit=10, request=None, service=None): ...
+
+def make_request():
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": []})
+
+def test_key_has_static_readable_prefix():
+    build = make_key_builder(fetch, "db")
+    key = build(("users",), {})
+    assert key.startswith(f"db:{__name__}.fetch:")
+    assert len(key.rsplit(":", 1)[1]) == 32
+
+def test_positional_and_keyword_calls_share_a_key():
+    build = make_key_builder(fetch)
+    assert build(("users", 5), {}) == build((), {"table": "users", "limit": 5})
+    assert build(("users", 5), {}) != build(("users", 6), {})
+
+def test_injected_dependencies_do_not_change_the_key():
+    build = make_key_builder(fetch)
+    key1 = build(("users",), {"request": make_request()})
+    key2 = build(("users",), {"request": make_request()})
+    assert key1 == key2
+    register_ignored_key_type(RegisteredService)
+    key3 = build(("users",), {"service": RegisteredService()})
+    key4 = build(("users",), {"service": RegisteredService()})
+    assert key3 == key4
+
+def test_objects_without_a_repr_are_not_collapsed_to_their_type():
+    build = make_key_builder(fetch)
+    assert build(("users",), {"service": FakeService()}) is None
+    assert build((FakeService(),), {}) is None
+
+def test_omitted_defaults_share_a_key_with_explicit_ones():
+    build = make_key_builder(fetch)
+    assert build(("users",), {}) == build(("users", 10), {})
+    assert build(("users",), {}) != build(("users", 11), {})
+
+def test_integers_beyond_64_bits_are_keyed():
+    build = make_key_builder(fetch)
+    assert build((2**70,), {}) != build((2**70 + 1,), {})
+
+def test_vary_on_and_key_func():
+    build = make_key_builder(fetch, vary_on=["table"])
+    assert build(("users", 5), {}) == build(("users", 50), {})
+    custom = make_key_builder(fetch, "db", key_func=lambda table, **_: table)
+    assert custom(("users",), {"limit": 3}) == f"db:{__name__}.fetch:users"
+    with pytest.raises(ValueError):
+        make_key_builder(fetch, vary_on=["missing"])
+
+def test_cache_result_hits_when_request_is_passed():
+    calls = {"count": 0}
+    @cache_result(expire_seconds=10, key_prefix="req_test")
+    def handler(_request, item_id):
+        calls["count"] += 1
+        return item_id
+    handler(make_request(), 1)
+    handler(make_request(), 1)
+    assert calls["count"] == 1
+
+def test_cache_result_runs_unkeyable_calls_uncached():
+    calls = {"count": 0}
+    @cache_result(expire_seconds=10, key_prefix="unkeyable_test")
+    def handler(_query):
+        calls["count"] += 1
+        return calls["count"]
+    assert handler(FakeService()) == 1
+    assert handler(FakeService()) == 2
@@ -0,0 +1,86 @@
+import time
+
+import pytest
+
+from app.caching.utils.local_cache import (
+    CACHE_INVALIDATION_CHANNEL,
+    LocalCache,
+    local_cache,
+)
+from app.caching.utils.redis_cache import (
+    disable_local_cache,
+    enable_local_cache,
+    get_cached_result,
+    get_or_set_cache,
+    invalidate_cache,
+    redis_cache,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    redis_cache.flushdb()
+    local_cache.clear()
+    yield
+    disable_local_cache("settings:")
+    redis_cache.flushdb()
+    local_cache.clear()
+
+def test_local_cache_evicts_lru_by_bytes():
+    cache = LocalCache(max_bytes=100, max_entries=10)
+    cache.set("a", "A", size=40, ttl=60)
+    cache.set("b", "B", size=40, ttl=60)
+    cache.get("a")  # "b" becomes least recently used
+    cache.set("c", "C", size=40, ttl=60)
+    assert cache.get("a") == "A"
+    assert cache.get("b", None) is None
+    assert cache.get("c") == "C"
+    assert cache.size == 80
+
+def test_local_cache_expires_entries():
+    cache = LocalCache()
+    cache.set("a", "A", size=1, ttl=0.05)
+    time.sleep(0.1)
+    assert cache.get("a", None) is None
+    assert len(cache) == 0
+
+def test_local_cache_longest_prefix_wins():
+    cache = LocalCache()
+    cache.register("settings:", 5)
+    cache.register("settings:flags:", 1)
+    assert cache.ttl_for("settings:flags:beta") == 1
+    assert cache.ttl_for("settings:theme") == 5
+    assert cache.ttl_for("user:1") is None
+
+def test_opted_in_keys_are_served_from_process_memory():
+    enable_local_cache("settings:", ttl=60)
+    get_or_set_cache("settings:theme", lambda: {"theme": "dark"}, 60)
+    # Changing Redis behind our back is not seen until the local entry expires
+    redis_cache.delete("settings:theme")
+    assert get_cached_result("settings:theme") == {"theme": "dark"}
+    # Keys outside the prefix always go to Redis
+    get_or_set_cache("other", lambda: 1, 60)
+    redis_cache.delete("other")
+    assert get_cached_result("other") is None
+
+def wait_for_listener(timeout=2.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if dict(redis_cache.pubsub_numsub(CACHE_INVALIDATION_CHANNEL)).get(CACHE_INVALIDATION_CHANNEL.encode()):
+            return
+        time.sleep(0.02)
+
+def test_invalidation_is_broadcast_to_workers():
+    enable_local_cache("settings:", ttl=60)
+    wait_for_listener()
+    get_or_set_cache("settings:lang", lambda: "en", 60)
+    assert local_cache.get("settings:lang") == "en"
+    assert invalidate_cache("settings:lang") is True
+    assert get_cached_result("settings:lang") is None
+    # Simulate another worker's eviction message for an entry we still hold
+    local_cache.set("settings:tz", "UTC", size=3, ttl=60)
+    redis_cache.publish(CACHE_INVALIDATION_CHANNEL, "settings:tz")
+    deadline = time.time() + 2
+    while time.time() < deadline and local_cache.get("settings:tz", None) is not None:
+        time.sleep(0.02)
+    assert local_cache.get("settings:tz", None) is None
@@ -4,6 +4,9 @@ import pytest
 import hashlib
 from unittest.mock import patch, MagicMock
 from app.caching.utils.redis_cache import (
+    aget_cached_result,
+    aget_or_set_cache,
+    ainvalidate_cache,
     cache_result,
     get_cached_result,
     get_or_set_cache,
@@ -11,6 +14,7 @@ from app.caching.utils.redis_cache import (
     redis_cache,
 )
 
+
 @pytest.fixture(autouse=True)
 def clear_redis_cache():
     redis_cache.flushdb()
@@ -63,3 +67,30 @@ def test_cache_result_decorator_cache_expires():
     assert result1 == 6
     assert result2 == 6
     assert calls["count"] == 2  # Called again after cache expired
+
+@pytest.mark.anyio
+async def test_aget_or_set_cache_sets_and_gets_value():
+    key = "test_aget_or_set_key"
+    value = {"foo": "bar"}
+    async def compute():
+        return value
+    result = await aget_or_set_cache(key, compute, expire_seconds=5)
+    assert result == value
+    # Shares storage with the sync API
+    assert get_cached_result(key) == value
+    assert await aget_cached_result(key) == value
+    assert await ainvalidate_cache(key) is True
+    assert await aget_cached_result(key) is None
+
+@pytest.mark.anyio
+async def test_cache_result_decorator_awaits_coroutines():
+    calls = {"count": 0}
+    @cache_result(expire_seconds=5, key_prefix="async_decorator_test")
+    async def slow_add(a, b):
+        calls["count"] += 1
+        return a + b
+    result1 = await slow_add(1, 2)
+    result2 = await slow_add(1, 2)
+    assert result1 == 3
+    assert result2 == 3
+    assert calls["count"] == 1
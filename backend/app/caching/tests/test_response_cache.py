@@ -0,0 +1,127 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.caching.utils.redis_cache import redis_cache
+from app.caching.utils.response_cache import (
+    ResponseCacheMiddleware,
+    cache_response,
+    invalidates_response_cache,
+)
+
+calls = {"list": 0}
+items = {"a": ["one"]}
+
+app = FastAPI()
+app.add_middleware(ResponseCacheMiddleware)
+
+
+@app.get("/buckets/{bucket_id}/files")
+@cache_response(expire_seconds=30, resources=["bucket:{bucket_id}"])
+def list_files(bucket_id: str, limit: int = 10):
+    calls["list"] += 1
+    return items.get(bucket_id, [])[:limit]
+
+
+@app.post("/buckets/{bucket_id}/upload")
+@invalidates_response_cache("bucket:{bucket_id}")
+def upload(bucket_id: str, name: str):
+    items.setdefault(bucket_id, []).append(name)
+    return {"ok": True}
+
+
+@app.get("/streamed")
+@cache_response(expire_seconds=30)
+def streamed():
+    return StreamingResponse(iter([b"a\n", b"b\n"]), media_type="application/x-ndjson")
+
+
+@app.get("/uncached")
+def uncached():
+    calls["list"] += 1
+    return {"ok": True}
+
+
+@pytest.fixture(autouse=True)
+def clear_state():
+    redis_cache.flushdb()
+    calls["list"] = 0
+    items.clear()
+    items["a"] = ["one"]
+    yield
+    redis_cache.flushdb()
+
+@pytest.fixture
+def client():
+    with TestClient(app) as client:
+        yield client
+
+def test_second_request_is_served_from_cache(client):
+    first = client.get("/buckets/a/files")
+    second = client.get("/buckets/a/files")
+    assert first.json() == second.json() == ["one"]
+    assert first.headers["x-cache"] == "MISS"
+    assert second.headers["x-cache"] == "HIT"
+    assert first.headers["etag"] == second.headers["etag"]
+    assert calls["list"] == 1
+
+def test_if_none_match_returns_304(client):
+    etag = client.get("/buckets/a/files").headers["etag"]
+    response = client.get("/buckets/a/files", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    assert response.headers["vary"] == "Authorization, Cookie"
+
+def test_key_varies_on_query_and_auth(client):
+    client.get("/buckets/a/files?limit=5")
+    client.get("/buckets/a/files?limit=5", headers={"Authorization": "Bearer one"})
+    client.get("/buckets/a/files?limit=5", headers={"Authorization": "Bearer two"})
+    client.get("/buckets/a/files?limit=1")
+    assert calls["list"] == 4
+    client.get("/buckets/a/files?limit=5", headers={"Authorization": "Bearer one"})
+    assert calls["list"] == 4
+
+def test_key_varies_on_cookies_without_authorization(client):
+    first = client.get("/buckets/a/files", headers={"Cookie": "session=one"})
+    client.get("/buckets/a/files", headers={"Cookie": "session=two"})
+    assert calls["list"] == 2
+    assert first.headers["vary"] == "Authorization, Cookie"
+
+def test_mutation_invalidates_resource(client):
+    client.get("/buckets/a/files")
+    assert client.post("/buckets/a/upload?name=two").status_code == 200
+    response = client.get("/buckets/a/files")
+    assert response.json() == ["one", "two"]
+    assert response.headers["x-cache"] == "MISS"
+
+def test_failed_mutation_keeps_cache(client):
+    client.get("/buckets/a/files")
+    assert client.post("/buckets/a/upload").status_code == 422
+    assert client.get("/buckets/a/files").headers["x-cache"] == "HIT"
+
+def test_no_cache_request_bypasses_lookup(client):
+    client.get("/buckets/a/files")
+    response = client.get("/buckets/a/files", headers={"Cache-Control": "no-cache"})
+    assert response.headers["x-cache"] == "MISS"
+    assert calls["list"] == 2
+
+def test_unmarked_routes_pass_through(client):
+    response = client.get("/uncached")
+    assert "x-cache" not in response.headers
+
+def test_streamed_responses_pass_through(client):
+    response = client.get("/streamed")
+    assert response.text == "a\nb\n"
+    assert "x-cache" not in response.headers
+    assert redis_cache.dbsize() == 0
+
+def test_only_marked_routes_are_matched_by_the_middleware(client, monkeypatch):
+    route = next(route for route in app.routes if getattr(route, "path", "") == "/uncached")
+    matched = []
+    original = route.matches
+    monkeypatch.setattr(route, "matches", lambda scope: matched.append(1) or original(scope))
+    client.get("/uncached")
+    # Only the router's own match; the middleware skips unmarked routes
+    assert len(matched) == 1
@@ -0,0 +1,68 @@
+import pickle
+
+import pytest
+
+from app.caching.utils import serializers
+from app.caching.utils.redis_cache import (
+    get_cached_result,
+    get_or_set_cache,
+    redis_cache,
+)
+from app.caching.utils.serializers import decode, encode, set_serializer
+
+
+@pytest.fixture(autouse=True)
+def clear_redis_cache():
+    redis_cache.flushdb()
+    yield
+    serializers._prefix_serializers.clear()
+    redis_cache.flushdb()
+
+ROWS = [{"id": i, "name": f"row {i}", "active": i % 2 == 0} for i in range(200)]
+
+@pytest.mark.parametrize("name", ["pickle", "orjson", "msgpack"])
+def test_round_trip(name):
+    if name not in serializers._serializers:
+        pytest.skip(f"{name} is not installed")
+    raw = encode(ROWS, serializer=name)
+    assert raw[0] & 0x0F == serializers.get_serializer(name).codec_id
+    assert decode(raw) == ROWS
+
+def test_raw_bytes_passthrough():
+    raw = encode(b"\x00binary", serializer="raw")
+    assert decode(raw) == b"\x00binary"
+    with pytest.raises(TypeError):
+        encode("not bytes", serializer="raw")
+
+@pytest.mark.parametrize("name", ["zstd", "lz4"])
+def test_compression_above_threshold(monkeypatch, name):
+    if name not in serializers._compressors:
+        pytest.skip(f"{name} is not installed")
+    monkeypatch.setattr(serializers, "CACHE_COMPRESSION", name)
+    monkeypatch.setattr(serializers, "CACHE_COMPRESSION_THRESHOLD", 1024)
+    big = encode(ROWS, serializer="pickle")
+    assert big[0] >> 4 == serializers._compressors[name].codec_id
+    assert len(big) < len(pickle.dumps(ROWS))
+    assert decode(big) == ROWS
+    small = encode({"a": 1}, serializer="pickle")
+    assert small[0] >> 4 == 0
+
+def test_legacy_and_unknown_payloads_are_readable():
+    assert decode(pickle.dumps({"legacy": True})) == {"legacy": True}
+    assert decode(b"some value") == b"some value"
+
+def test_per_prefix_serializer_is_used_for_cache_writes():
+    if "orjson" not in serializers._serializers:
+        pytest.skip("orjson is not installed")
+    set_serializer("db_query:", "orjson")
+    get_or_set_cache("db_query:users", lambda: ROWS, 10)
+    assert redis_cache.get("db_query:users")[0] == serializers.get_serializer("orjson").codec_id
+    assert get_cached_result("db_query:users") == ROWS
+
+def test_missing_codecs_fail_the_startup_check(monkeypatch):
+    monkeypatch.delitem(serializers._compressors, "zstd", raising=False)
+    with pytest.raises(ValueError, match="cache extra"):
+        serializers.check_configured_codecs("pickle", "zstd")
+    with pytest.raises(ValueError, match="not available"):
+        serializers.check_configured_codecs("yaml", "none")
+    serializers.check_configured_codecs("orjson", "none")
@@ -0,0 +1,81 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.caching.utils.redis_cache import (
+    aget_or_set_cache,
+    get_or_set_cache,
+    redis_cache,
+)
+from app.caching.utils.single_flight import (
+    get_single_flight_stats,
+    reset_single_flight_stats,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_redis_cache():
+    redis_cache.flushdb()
+    reset_single_flight_stats()
+    yield
+    redis_cache.flushdb()
+
+def test_get_or_set_cache_single_flight_collapses_threads():
+    calls = {"count": 0}
+    def slow_compute():
+        calls["count"] += 1
+        time.sleep(0.2)
+        return {"value": 42}
+    results = []
+    def worker():
+        results.append(get_or_set_cache("sf_threads", slow_compute, 5, single_flight=True))
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == [{"value": 42}] * 8
+    assert calls["count"] == 1
+    stats = get_single_flight_stats()
+    assert stats["leader"] == 1
+    assert stats.get("coalesced_local", 0) >= 1
+
+def test_get_or_set_cache_waits_for_remote_lock_holder():
+    # Simulate another worker holding the recompute lock, then publishing the value
+    redis_cache.set("lock:sf_remote", b"other-worker", px=2000)
+    def publish():
+        time.sleep(0.2)
+        get_or_set_cache("sf_remote", lambda: "from-other-worker", 5)
+    threading.Thread(target=publish).start()
+    result = get_or_set_cache("sf_remote", lambda: "local", 5, single_flight=True)
+    assert result == "from-other-worker"
+    assert get_single_flight_stats()["coalesced_remote"] == 1
+
+def test_get_or_set_cache_lock_timeout_raises():
+    redis_cache.set("lock:sf_timeout", b"other-worker", px=2000)
+    with pytest.raises(TimeoutError):
+        get_or_set_cache(
+            "sf_timeout",
+            lambda: "local",
+            5,
+            single_flight=True,
+            wait_timeout=0.1,
+            on_lock_timeout="raise",
+        )
+    assert get_single_flight_stats()["lock_timeouts"] == 1
+
+@pytest.mark.anyio
+async def test_aget_or_set_cache_single_flight_collapses_tasks():
+    calls = {"count": 0}
+    async def slow_compute():
+        calls["count"] += 1
+        await asyncio.sleep(0.2)
+        return [1, 2, 3]
+    results = await asyncio.gather(
+        *(aget_or_set_cache("sf_tasks", slow_compute, 5, single_flight=True) for _ in range(10))
+    )
+    assert results == [[1, 2, 3]] * 10
+    assert calls["count"] == 1
+    assert get_single_flight_stats()["coalesced_local"] >= 1
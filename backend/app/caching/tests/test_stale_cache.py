@@ -0,0 +1,81 @@
+import asyncio
+import time
+import types
+
+import pytest
+
+from app.caching.utils.redis_cache import (
+    cache_result,
+    get_cached_result,
+    get_or_revalidate_cache,
+    redis_cache,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_redis_cache():
+    redis_cache.flushdb()
+    yield
+    redis_cache.flushdb()
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.02)
+    return False
+
+def test_stale_value_served_while_refreshing():
+    calls = {"count": 0}
+    @cache_result(expire_seconds=1, stale_ttl=5, key_prefix="swr_test")
+    def slow_value():
+        calls["count"] += 1
+        return calls["count"]
+    assert slow_value() == 1
+    time.sleep(1.1)
+    # Stale value is returned immediately, refresh happens in the background
+    assert slow_value() == 1
+    assert wait_for(lambda: calls["count"] == 2)
+    assert wait_for(lambda: slow_value() == 2)
+
+def test_refresh_ahead_recomputes_before_expiry(monkeypatch):
+    # compute() is near-instant, so the XFetch window is tiny even with a huge beta;
+    # pin the cache's random draw so a sample close to zero cannot skip the refresh
+    monkeypatch.setattr(
+        "app.caching.utils.redis_cache.random", types.SimpleNamespace(random=lambda: 0.999)
+    )
+    calls = {"count": 0}
+    def compute():
+        calls["count"] += 1
+        return "value"
+    get_or_revalidate_cache("xfetch_test", compute, expire_seconds=60, refresh_ahead=True)
+    get_or_revalidate_cache(
+        "xfetch_test", compute, expire_seconds=60, refresh_ahead=True, beta=1e9
+    )
+    assert wait_for(lambda: calls["count"] == 2)
+
+def test_stale_entries_are_unwrapped_by_get_cached_result():
+    get_or_revalidate_cache("swr_plain", lambda: {"a": 1}, expire_seconds=5, stale_ttl=5)
+    assert get_cached_result("swr_plain") == {"a": 1}
+    assert redis_cache.ttl("swr_plain") > 5
+
+def test_stale_ttl_requires_expire_seconds():
+    with pytest.raises(ValueError):
+        cache_result(stale_ttl=10)
+
+@pytest.mark.anyio
+async def test_async_stale_value_served_while_refreshing():
+    calls = {"count": 0}
+    @cache_result(expire_seconds=1, stale_ttl=5, key_prefix="async_swr_test")
+    async def slow_value():
+        calls["count"] += 1
+        return calls["count"]
+    assert await slow_value() == 1
+    await asyncio.sleep(1.1)
+    assert await slow_value() == 1
+    for _ in range(50):
+        if calls["count"] == 2:
+            break
+        await asyncio.sleep(0.02)
+    assert calls["count"] == 2
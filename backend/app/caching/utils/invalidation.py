@@ -0,0 +1,264 @@
+import logging
+import os
+from collections.abc import Iterable
+
+from app.caching.utils.local_cache import CACHE_INVALIDATION_CHANNEL, local_cache
+from app.caching.utils.redis_cache import (
+    _queue_tags,
+    _tag_key,
+    get_async_redis,
+    redis_cache,
+)
+
+logger = logging.getLogger(__name__)
+
+# Keys are unlinked (and pattern sweeps SCANned) in batches of this size
+CACHE_UNLINK_BATCH_SIZE = int(os.getenv("CACHE_UNLINK_BATCH_SIZE", 500))
+NAMESPACE_VERSION_PREFIX = "ns_version:"
+
+
+def _version_key(namespace: str) -> str:
+    return f"{NAMESPACE_VERSION_PREFIX}{namespace}"
+
+
+def _decode_keys(members: Iterable[bytes | str]) -> list[str]:
+    return [m.decode() if isinstance(m, bytes) else m for m in members]
+
+
+def _queue_unlink(pipe, keys: list[str]) -> None:
+    pipe.unlink(*keys)
+    # Evict our own in-process copies and tell other workers to do the same. Workers
+    # may cache prefixes this one never registered, so every key is announced.
+    for key in keys:
+        local_cache.delete(key)
+        pipe.publish(CACHE_INVALIDATION_CHANNEL, key)
+
+
+def _unlink(keys: list[str]) -> int:
+    deleted = 0
+    for start in range(0, len(keys), CACHE_UNLINK_BATCH_SIZE):
+        pipe = redis_cache.pipeline(transaction=False)
+        _queue_unlink(pipe, keys[start : start + CACHE_UNLINK_BATCH_SIZE])
+        deleted += pipe.execute()[0]
+    return deleted
+
+
+async def _aunlink(keys: list[str]) -> int:
+    deleted = 0
+    for start in range(0, len(keys), CACHE_UNLINK_BATCH_SIZE):
+        pipe = get_async_redis().pipeline(transaction=False)
+        _queue_unlink(pipe, keys[start : start + CACHE_UNLINK_BATCH_SIZE])
+        deleted += (await pipe.execute())[0]
+    return deleted
+
+
+def tag_keys(key: str, tags: Iterable[str], expire_seconds: int | None = None) -> None:
+    """
+    Record tags for a key that was written without going through get_or_set_cache.
+
+    Args:
+        key: The cache key to tag
+        tags: Tags to add the key to
+        expire_seconds: The key's expiration, so tag sets outlive their members
+    """
+    pipe = redis_cache.pipeline(transaction=False)
+    _queue_tags(pipe, key, tags, expire_seconds)
+    pipe.execute()
+
+
+async def atag_keys(key: str, tags: Iterable[str], expire_seconds: int | None = None) -> None:
+    """
+    Record tags for a key without blocking the event loop.
+
+    Args:
+        key: The cache key to tag
+        tags: Tags to add the key to
+        expire_seconds: The key's expiration, so tag sets outlive their members
+    """
+    pipe = get_async_redis().pipeline(transaction=False)
+    _queue_tags(pipe, key, tags, expire_seconds)
+    await pipe.execute()
+
+
+def invalidate_tags(*tags: str) -> int:
+    """
+    Invalidate every cache key recorded under the given tags.
+
+    Each tag set is read and deleted atomically, so keys tagged concurrently are
+    either invalidated now or kept in a fresh tag set. Cost is proportional to
+    the number of tagged keys, not to the size of the keyspace.
+
+    Args:
+        tags: Tags to invalidate
+
+    Returns:
+        The number of cache keys deleted
+    """
+    deleted = 0
+    try:
+        for tag in tags:
+            pipe = redis_cache.pipeline(transaction=True)
+            pipe.smembers(_tag_key(tag))
+            pipe.delete(_tag_key(tag))
+            members, _ = pipe.execute()
+            if members:
+                deleted += _unlink(_decode_keys(members))
+    except Exception as e:
+        logger.warning(f"Error invalidating Redis cache tags: {str(e)}")
+    return deleted
+
+
+async def ainvalidate_tags(*tags: str) -> int:
+    """
+    Invalidate every cache key recorded under the given tags (asyncio version).
+
+    Args:
+        tags: Tags to invalidate
+
+    Returns:
+        The number of cache keys deleted
+    """
+    deleted = 0
+    try:
+        for tag in tags:
+            pipe = get_async_redis().pipeline(transaction=True)
+            pipe.smembers(_tag_key(tag))
+            pipe.delete(_tag_key(tag))
+            members, _ = await pipe.execute()
+            if members:
+                deleted += await _aunlink(_decode_keys(members))
+    except Exception as e:
+        logger.warning(f"Error invalidating Redis cache tags: {str(e)}")
+    return deleted
+
+
+def invalidate_pattern(pattern: str) -> int:
+    """
+    Invalidate every cache key matching a glob pattern (e.g. "user_permissions:*").
+
+    Walks the keyspace with SCAN and deletes with UNLINK, so Redis is never
+    blocked the way KEYS would block it. Prefer tags where possible; this is
+    for sweeps over keys that were not tagged when written.
+
+    Args:
+        pattern: Redis glob pattern
+
+    Returns:
+        The number of cache keys deleted
+    """
+    deleted = 0
+    batch: list[str] = []
+    try:
+        for key in redis_cache.scan_iter(match=pattern, count=CACHE_UNLINK_BATCH_SIZE):
+            batch.append(key.decode() if isinstance(key, bytes) else key)
+            if len(batch) >= CACHE_UNLINK_BATCH_SIZE:
+                deleted += _unlink(batch)
+                batch = []
+        if batch:
+            deleted += _unlink(batch)
+    except Exception as e:
+        logger.warning(f"Error invalidating Redis cache pattern {pattern}: {str(e)}")
+    return deleted
+
+
+async def ainvalidate_pattern(pattern: str) -> int:
+    """
+    Invalidate every cache key matching a glob pattern (asyncio version).
+
+    Args:
+        pattern: Redis glob pattern
+
+    Returns:
+        The number of cache keys deleted
+    """
+    deleted = 0
+    batch: list[str] = []
+    try:
+        async for key in get_async_redis().scan_iter(
+            match=pattern, count=CACHE_UNLINK_BATCH_SIZE
+        ):
+            batch.append(key.decode() if isinstance(key, bytes) else key)
+            if len(batch) >= CACHE_UNLINK_BATCH_SIZE:
+                deleted += await _aunlink(batch)
+                batch = []
+        if batch:
+            deleted += await _aunlink(batch)
+    except Exception as e:
+        logger.warning(f"Error invalidating Redis cache pattern {pattern}: {str(e)}")
+    return deleted
+
+
+def get_namespace_version(namespace: str) -> int:
+    """
+    Get the current version of a cache namespace, shared by all workers.
+
+    Args:
+        namespace: Namespace name (e.g. "product")
+
+    Returns:
+        The namespace version, starting at 1
+    """
+    try:
+        value = redis_cache.get(_version_key(namespace))
+        return int(value) if value else 1
+    except Exception as e:
+        logger.warning(f"Error retrieving cache namespace version: {str(e)}")
+        return 1
+
+
+def bump_namespace_version(namespace: str) -> int:
+    """
+    Increment a namespace version, orphaning every key built with the old one.
+
+    Orphaned keys are not deleted; they age out through their own expiration.
+
+    Args:
+        namespace: Namespace name
+
+    Returns:
+        The new namespace version
+    """
+    pipe = redis_cache.pipeline(transaction=True)
+    pipe.set(_version_key(namespace), 1, nx=True)
+    pipe.incr(_version_key(namespace))
+    _, version = pipe.execute()
+    logger.info(f"Incremented cache version for {namespace}: {version}")
+    return int(version)
+
+
+def versioned_key(namespace: str, key_suffix: str) -> str:
+    """
+    Build a cache key that embeds the namespace's current version.
+    """
+    return f"{namespace}:{key_suffix}:v{get_namespace_version(namespace)}"
+
+
+async def aget_namespace_version(namespace: str) -> int:
+    """
+    Get the current version of a cache namespace (asyncio version).
+    """
+    try:
+        value = await get_async_redis().get(_version_key(namespace))
+        return int(value) if value else 1
+    except Exception as e:
+        logger.warning(f"Error retrieving cache namespace version: {str(e)}")
+        return 1
+
+
+async def abump_namespace_version(namespace: str) -> int:
+    """
+    Increment a namespace version (asyncio version).
+    """
+    pipe = get_async_redis().pipeline(transaction=True)
+    pipe.set(_version_key(namespace), 1, nx=True)
+    pipe.incr(_version_key(namespace))
+    _, version = await pipe.execute()
+    logger.info(f"Incremented cache version for {namespace}: {version}")
+    return int(version)
+
+
+async def aversioned_key(namespace: str, key_suffix: str) -> str:
+    """
+    Build a cache key that embeds the namespace's current version (asyncio version).
+    """
+    return f"{namespace}:{key_suffix}:v{await aget_namespace_version(namespace)}"
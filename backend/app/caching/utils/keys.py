@@ -0,0 +1,167 @@
+import dataclasses
+import enum
+import hashlib
+import inspect
+import json
+import logging
+from collections.abc import Callable, Iterable, Mapping
+from typing import Any
+
+from pydantic import BaseModel
+from starlette.background import BackgroundTasks
+from starlette.requests import HTTPConnection
+from starlette.responses import Response
+
+try:
+    from sqlalchemy.orm import Session
+except ImportError:
+    Session = None
+
+# Arguments of these types are injected dependencies; they never affect the result
+_ignored_key_types: tuple[type, ...] = (HTTPConnection, Response, BackgroundTasks)
+if Session is not None:
+    _ignored_key_types += (Session,)
+
+_SKIP = object()
+
+logger = logging.getLogger(__name__)
+
+
+class UnkeyableArgument(TypeError):
+    """
+    Raised for an argument that cannot be turned into key material.
+    """
+
+
+def register_ignored_key_type(*types: type) -> None:
+    """
+    Exclude arguments of the given types from cache keys (e.g. service clients).
+
+    Args:
+        types: Classes whose instances should be ignored by cache_result keys
+    """
+    global _ignored_key_types
+    _ignored_key_types += tuple(t for t in types if t not in _ignored_key_types)
+
+
+def _normalize(value: Any) -> Any:
+    if value is None or isinstance(value, str | int | float | bool):
+        return value
+    if isinstance(value, _ignored_key_types):
+        return _SKIP
+    if isinstance(value, enum.Enum):
+        return _normalize(value.value)
+    if isinstance(value, BaseModel):
+        return _normalize(value.model_dump(mode="json"))
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return _normalize(dataclasses.asdict(value))
+    if isinstance(value, dict):
+        return {
+            str(k): v
+            for k, v in ((k, _normalize(v)) for k, v in value.items())
+            if v is not _SKIP
+        }
+    if isinstance(value, list | tuple):
+        return [None if v is _SKIP else v for v in map(_normalize, value)]
+    if isinstance(value, set | frozenset):
+        return sorted((_normalize(v) for v in value), key=repr)
+    if isinstance(value, bytes):
+        return value.hex()
+    if type(value).__repr__ is object.__repr__:
+        # The default repr holds only the type and a memory address; neither identifies the value
+        raise UnkeyableArgument(
+            f"no cache key for {type(value).__module__}.{type(value).__qualname__} arguments; "
+            "use vary_on or key_func, or register_ignored_key_type if it never affects results"
+        )
+    return str(value)
+
+
+def _dumps(value: Any) -> bytes:
+    # Always the stdlib encoder: keys must not depend on what is installed, and it takes any int
+    return json.dumps(value, sort_keys=True, separators=(",", ":")).encode()
+
+
+def hash_key_material(data: bytes) -> str:
+    """
+    Hash key material with BLAKE2b (128-bit).
+
+    Always the same algorithm, so every process computes the same keys
+    whatever optional packages it has installed.
+    """
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def credential_identity(headers: Mapping[str, str]) -> str | None:
+    """
+    Hash the caller's credentials (Authorization header, else cookies) for use in keys.
+
+    Returns:
+        The hash, or None for anonymous callers
+    """
+    credentials = headers.get("authorization") or headers.get("cookie")
+    return hash_key_material(credentials.encode()) if credentials else None
+
+
+def make_key_builder(
+    func: Callable[..., Any],
+    key_prefix: str = "",
+    vary_on: Iterable[str] | None = None,
+    key_func: Callable[..., str] | None = None,
+) -> Callable[[tuple, dict], str | None]:
+    """
+    Build the cache key function used by cache_result for one decorated function.
+
+    The static part of the key ("<key_prefix>:<module>.<qualname>") is computed
+    once here. Per call, arguments are bound to parameter names with defaults
+    filled in (so positional, keyword and omitted-default calls share a key),
+    injected dependencies are dropped, and the rest is hashed. A call with an
+    argument that cannot be keyed gets None, and should not be cached.
+
+    Args:
+        func: The decorated function
+        key_prefix: Optional prefix for the cache key
+        vary_on: Parameter names that make up the key; all parameters if omitted
+        key_func: Custom function returning the variable part of the key from
+            the call's arguments; overrides vary_on
+
+    Returns:
+        Function mapping (args, kwargs) to the full cache key, or None
+    """
+    name = f"{func.__module__}.{func.__qualname__}"
+    static_prefix = f"{key_prefix}:{name}" if key_prefix else name
+
+    if key_func is not None:
+
+        def build_custom_key(args: tuple, kwargs: dict) -> str:
+            return f"{static_prefix}:{key_func(*args, **kwargs)}"
+
+        return build_custom_key
+
+    signature = inspect.signature(func)
+    vary_on = frozenset(vary_on) if vary_on is not None else None
+    if vary_on is not None:
+        unknown = vary_on - signature.parameters.keys()
+        if unknown:
+            raise ValueError(f"vary_on names unknown parameters of {name}: {sorted(unknown)}")
+
+    def build_key(args: tuple, kwargs: dict) -> str | None:
+        try:
+            bound = signature.bind_partial(*args, **kwargs)
+            bound.apply_defaults()
+            material = {
+                param: value
+                for param, value in (
+                    (param, _normalize(value))
+                    for param, value in bound.arguments.items()
+                    if vary_on is None or param in vary_on
+                )
+                if value is not _SKIP
+            }
+        except TypeError as e:
+            # Bad arguments fail in the call itself; unkeyable ones just skip the cache
+            if isinstance(e, UnkeyableArgument):
+                logger.warning(f"Not caching {name}: {e}")
+            return None
+        return f"{static_prefix}:{hash_key_material(_dumps(material))}"
+
+    return build_key
@@ -0,0 +1,184 @@
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, NamedTuple
+
+import redis
+
+logger = logging.getLogger(__name__)
+
+# Bounds for the in-process (L1) cache that sits in front of Redis
+CACHE_LOCAL_MAX_BYTES = int(os.getenv("CACHE_LOCAL_MAX_BYTES", 32 * 1024 * 1024))
+CACHE_LOCAL_MAX_ENTRIES = int(os.getenv("CACHE_LOCAL_MAX_ENTRIES", 10_000))
+CACHE_INVALIDATION_CHANNEL = os.getenv("CACHE_INVALIDATION_CHANNEL", "cache:invalidate")
+
+# Published on the invalidation channel to clear every worker's L1 cache
+FLUSH_ALL = "*"
+
+_MISSING = object()
+
+
+class _LocalEntry(NamedTuple):
+    value: Any
+    expires_at: float
+    size: int
+
+
+class LocalCache:
+    """
+    Bounded in-process LRU cache with per-entry TTLs.
+
+    Entries are evicted least-recently-used first once either the entry count or
+    the total byte size (measured on the serialized Redis payload) is exceeded.
+    Only keys that were opted in, by exact key or by prefix, are cached.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = CACHE_LOCAL_MAX_BYTES,
+        max_entries: int = CACHE_LOCAL_MAX_ENTRIES,
+    ) -> None:
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, _LocalEntry] = OrderedDict()
+        self._size = 0
+        self._prefixes: dict[str, float] = {}
+        self._listener: threading.Thread | None = None
+
+    def register(self, prefix: str, ttl: float) -> None:
+        """
+        Opt a key or key prefix into local caching.
+
+        Args:
+            prefix: Exact key or key prefix to cache locally
+            ttl: Seconds a value may be served from process memory
+        """
+        with self._lock:
+            self._prefixes[prefix] = ttl
+
+    def unregister(self, prefix: str) -> None:
+        """
+        Stop caching a key or key prefix locally and drop its entries.
+
+        Args:
+            prefix: Key or prefix previously passed to register
+        """
+        with self._lock:
+            self._prefixes.pop(prefix, None)
+            for key in [k for k in self._entries if k.startswith(prefix)]:
+                self._pop(key)
+
+    def ttl_for(self, key: str) -> float | None:
+        """
+        Get the local TTL for a key, or None if the key is not opted in.
+
+        The longest matching prefix wins.
+        """
+        best: str | None = None
+        for prefix in self._prefixes:
+            if key.startswith(prefix) and (best is None or len(prefix) > len(best)):
+                best = prefix
+        return None if best is None else self._prefixes[best]
+
+    def get(self, key: str, default: Any = _MISSING) -> Any:
+        """
+        Get a value from process memory.
+
+        Returns:
+            The cached value, or default (a private sentinel if omitted) on a miss
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            if entry.expires_at <= time.monotonic():
+                self._pop(key)
+                return default
+            self._entries.move_to_end(key)
+            return entry.value
+
+    def set(self, key: str, value: Any, size: int, ttl: float) -> None:
+        """
+        Store a value in process memory, evicting LRU entries to stay within bounds.
+
+        Args:
+            key: Cache key
+            value: Deserialized value to keep
+            size: Size in bytes charged against max_bytes
+            ttl: Seconds before the entry expires
+        """
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            self._pop(key)
+            self._entries[key] = _LocalEntry(value, time.monotonic() + ttl, size)
+            self._size += size
+            while self._size > self.max_bytes or len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._pop(oldest)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._pop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    @property
+    def size(self) -> int:
+        """Total bytes currently held."""
+        return self._size
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _pop(self, key: str) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._size -= entry.size
+
+    def start_invalidation_listener(self, client: redis.StrictRedis) -> None:
+        """
+        Subscribe to the invalidation channel so other workers can evict our entries.
+
+        Runs a daemon thread; calling it again is a no-op while the thread is alive.
+
+        Args:
+            client: Redis client used to open the pub/sub connection
+        """
+        with self._lock:
+            if self._listener is not None and self._listener.is_alive():
+                return
+            self._listener = threading.Thread(
+                target=self._listen,
+                args=(client,),
+                name="cache-invalidation-listener",
+                daemon=True,
+            )
+            self._listener.start()
+
+    def _listen(self, client: redis.StrictRedis) -> None:
+        while True:
+            try:
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(CACHE_INVALIDATION_CHANNEL)
+                # Anything cached before (re)subscribing may have missed an invalidation
+                self.clear()
+                for message in pubsub.listen():
+                    key = message["data"].decode()
+                    if key == FLUSH_ALL:
+                        self.clear()
+                    else:
+                        self.delete(key)
+            except Exception as e:
+                logger.warning(f"Cache invalidation listener error: {str(e)}")
+                self.clear()
+                time.sleep(1)
+
+
+local_cache = LocalCache()
@@ -0,0 +1,106 @@
+import os
+import re
+import threading
+from collections import defaultdict
+
+from prometheus_client import Counter, Histogram
+
+# Distinct key-prefix label values per process; further prefixes are reported as "other"
+CACHE_METRICS_MAX_PREFIXES = int(os.getenv("CACHE_METRICS_MAX_PREFIXES", 100))
+OTHER_PREFIX = "other"
+
+_HASH_LIKE = re.compile(r"^[0-9a-f]{16,}$")
+
+CACHE_REQUESTS = Counter(
+    "cache_requests_total",
+    "Cache lookups by key prefix and result (hit, local_hit, miss)",
+    ["prefix", "result"],
+)
+CACHE_ERRORS = Counter(
+    "cache_errors_total",
+    "Cache operations that raised, by key prefix and operation",
+    ["prefix", "operation"],
+)
+CACHE_COMPUTE_SECONDS = Histogram(
+    "cache_compute_seconds",
+    "Time spent computing a value after a cache miss",
+    ["prefix"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+CACHE_PAYLOAD_BYTES = Histogram(
+    "cache_payload_bytes",
+    "Size of serialized values written to the cache",
+    ["prefix"],
+    buckets=(64, 256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304),
+)
+
+_lock = threading.Lock()
+_known_prefixes: set[str] = set()
+# Per-process traffic summary backing the cache admin endpoint
+_traffic: defaultdict[str, dict[str, float]] = defaultdict(
+    lambda: {"hits": 0, "misses": 0, "errors": 0, "compute_seconds": 0.0}
+)
+
+
+def key_prefix(key: str) -> str:
+    """
+    Get the bounded metrics label for a cache key.
+
+    The label is the first ":"-separated segment. Hash-like segments and any
+    prefix beyond CACHE_METRICS_MAX_PREFIXES map to "other", keeping label
+    cardinality bounded.
+    """
+    prefix = key.split(":", 1)[0]
+    if not prefix or _HASH_LIKE.match(prefix):
+        return OTHER_PREFIX
+    if prefix in _known_prefixes:
+        return prefix
+    with _lock:
+        if len(_known_prefixes) >= CACHE_METRICS_MAX_PREFIXES:
+            return OTHER_PREFIX
+        _known_prefixes.add(prefix)
+    return prefix
+
+
+def _bump(prefix: str, field: str, amount: float = 1) -> None:
+    with _lock:
+        _traffic[prefix][field] += amount
+
+
+def record_hit(key: str, local: bool = False) -> None:
+    prefix = key_prefix(key)
+    CACHE_REQUESTS.labels(prefix, "local_hit" if local else "hit").inc()
+    _bump(prefix, "hits")
+
+
+def record_miss(key: str) -> None:
+    prefix = key_prefix(key)
+    CACHE_REQUESTS.labels(prefix, "miss").inc()
+    _bump(prefix, "misses")
+
+
+def record_error(key: str, operation: str) -> None:
+    prefix = key_prefix(key)
+    CACHE_ERRORS.labels(prefix, operation).inc()
+    _bump(prefix, "errors")
+
+
+def observe_compute(key: str, seconds: float) -> None:
+    prefix = key_prefix(key)
+    CACHE_COMPUTE_SECONDS.labels(prefix).observe(seconds)
+    _bump(prefix, "compute_seconds", seconds)
+
+
+def observe_payload(key: str, size: int) -> None:
+    CACHE_PAYLOAD_BYTES.labels(key_prefix(key)).observe(size)
+
+
+def get_traffic_stats() -> dict[str, dict[str, float]]:
+    """
+    Get this process's cache traffic per key prefix.
+
+    Returns:
+        Mapping of prefix to hits, misses, errors and total compute seconds
+    """
+    with _lock:
+        return {prefix: dict(stats) for prefix, stats in _traffic.items()}
@@ -1,13 +1,39 @@
-import hashlib
-import json
+import asyncio
+import inspect
 import logging
+import math
 import os
-import pickle
-from collections.abc import Callable
+import random
+import time
+import uuid
+import weakref
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from concurrent.futures import ThreadPoolExecutor
 from functools import wraps
-from typing import Any, Optional, TypeVar
+from typing import Any, Literal, NamedTuple, TypeVar
 
 import redis
+import redis.asyncio as aioredis
+
+from app.caching.utils.keys import make_key_builder
+from app.caching.utils.local_cache import (
+    _MISSING,
+    CACHE_INVALIDATION_CHANNEL,
+    local_cache,
+)
+from app.caching.utils.metrics import (
+    observe_compute,
+    observe_payload,
+    record_error,
+    record_hit,
+    record_miss,
+)
+from app.caching.utils.serializers import decode, encode
+from app.caching.utils.single_flight import (
+    AsyncSingleFlight,
+    SingleFlight,
+    record_single_flight,
+)
 
 # Type variable for generic return types
 T = TypeVar("T")
@@ -19,6 +45,23 @@ REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
 REDIS_PORT = int(os.getenv("REDIS_PORT", 6379))
 REDIS_DB = int(os.getenv("REDIS_DB", 0))
 REDIS_PASSWORD = os.getenv("REDIS_PASSWORD", None)
+REDIS_MAX_CONNECTIONS = int(os.getenv("REDIS_MAX_CONNECTIONS", 50))
+
+# Single-flight defaults: how long a recompute lock is held across workers, and
+# how long other workers wait for the lock holder before falling back
+CACHE_LOCK_TIMEOUT = float(os.getenv("CACHE_LOCK_TIMEOUT", 10))
+CACHE_LOCK_WAIT_TIMEOUT = float(os.getenv("CACHE_LOCK_WAIT_TIMEOUT", 5))
+CACHE_LOCK_POLL_INTERVAL = 0.05
+
+# Only delete the lock if we still own it (it may have expired and been re-acquired)
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+LockTimeoutFallback = Literal["compute", "raise"]
 
 redis_cache = redis.StrictRedis(
     host=REDIS_HOST,
@@ -28,6 +71,99 @@ redis_cache = redis.StrictRedis(
     decode_responses=False,  # We'll handle encoding/decoding
 )
 
+# redis.asyncio connection pools are bound to the event loop that created them,
+# so one shared pool is kept per running loop (normally just the server loop).
+_async_redis_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def get_async_redis() -> aioredis.StrictRedis:
+    """
+    Get the shared asyncio Redis client for the running event loop.
+
+    The client is backed by a bounded connection pool that is created lazily
+    on first use and reused by every async cache call on the same loop.
+
+    Returns:
+        An asyncio Redis client sharing a pooled set of connections
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_redis_clients.get(loop)
+    if client is None:
+        pool = aioredis.ConnectionPool(
+            host=REDIS_HOST,
+            port=REDIS_PORT,
+            db=REDIS_DB,
+            password=REDIS_PASSWORD,
+            max_connections=REDIS_MAX_CONNECTIONS,
+            decode_responses=False,
+        )
+        client = aioredis.StrictRedis(connection_pool=pool)
+        _async_redis_clients[loop] = client
+    return client
+
+
+async def close_async_redis() -> None:
+    """
+    Close the asyncio Redis pool of the running event loop, if one was created.
+    """
+    client = _async_redis_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+        await client.connection_pool.disconnect()
+
+
+class _StaleEntry(NamedTuple):
+    """Value stored by the stale-while-revalidate helpers alongside its soft expiry."""
+
+    value: Any
+    soft_expires_at: float
+    compute_time: float
+
+
+def _loads(raw: bytes) -> Any:
+    value = decode(raw)
+    if isinstance(value, _StaleEntry):
+        return decode(value.value)
+    return value
+
+
+def _remember_local(key: str, value: Any, raw: bytes) -> None:
+    ttl = local_cache.ttl_for(key)
+    if ttl is not None:
+        local_cache.set(key, value, len(raw), ttl)
+
+
+def _decode(key: str, raw: bytes) -> Any:
+    value = _loads(raw)
+    _remember_local(key, value, raw)
+    return value
+
+
+def enable_local_cache(prefix: str, ttl: float = 5.0) -> None:
+    """
+    Serve a key or key prefix from an in-process LRU cache in front of Redis.
+
+    Hot, small keys (permission maps, settings) then skip the Redis round-trip
+    and deserialization for up to ttl seconds. invalidate_cache publishes
+    evictions on CACHE_INVALIDATION_CHANNEL, so every worker drops its copy.
+
+    Args:
+        prefix: Exact key or key prefix to cache locally
+        ttl: Seconds a value may be served from process memory
+    """
+    local_cache.register(prefix, ttl)
+    local_cache.start_invalidation_listener(redis_cache)
+
+
+def disable_local_cache(prefix: str) -> None:
+    """
+    Stop serving a key or key prefix from the in-process cache.
+
+    Args:
+        prefix: Key or prefix previously passed to enable_local_cache
+    """
+    local_cache.unregister(prefix)
+
 
 def get_cached_result(key: str, default: Any = None) -> Any:
     """
@@ -40,12 +176,19 @@ def get_cached_result(key: str, default: Any = None) -> Any:
     Returns:
         The cached value or the default value if not found
     """
+    value = local_cache.get(key)
+    if value is not _MISSING:
+        record_hit(key, local=True)
+        return value
     try:
         value = redis_cache.get(key)
         if value is None:
+            record_miss(key)
             return default
-        return pickle.loads(value)
+        record_hit(key)
+        return _decode(key, value)
     except Exception as e:
+        record_error(key, "get")
         logger.warning(f"Error retrieving from Redis cache: {str(e)}")
         return default
 
@@ -60,59 +203,867 @@ def invalidate_cache(key: str) -> bool:
     Returns:
         True if the key was found and deleted, False otherwise
     """
+    local_cache.delete(key)
     try:
-        return bool(redis_cache.delete(key))
+        pipe = redis_cache.pipeline(transaction=False)
+        pipe.delete(key)
+        pipe.publish(CACHE_INVALIDATION_CHANNEL, key)
+        deleted, _ = pipe.execute()
+        return bool(deleted)
     except Exception as e:
+        record_error(key, "invalidate")
         logger.warning(f"Error invalidating Redis cache: {str(e)}")
         return False
 
 
+def _lock_key(key: str) -> str:
+    return f"lock:{key}"
+
+
+# Tag sets (tag:<name>) record the keys to drop when a tag is invalidated. A set
+# is kept alive at least as long as the longest-lived key written into it.
+TAG_KEY_PREFIX = "tag:"
+_TAG_KEY_SCRIPT = """
+local ttl = tonumber(ARGV[2])
+for _, tag in ipairs(KEYS) do
+    local existed = redis.call("exists", tag)
+    redis.call("sadd", tag, ARGV[1])
+    if ttl <= 0 then
+        redis.call("persist", tag)
+    elseif existed == 0 or (redis.call("ttl", tag) >= 0 and redis.call("ttl", tag) < ttl) then
+        redis.call("expire", tag, ttl)
+    end
+end
+return 1
+"""
+
+
+def _tag_key(tag: str) -> str:
+    return f"{TAG_KEY_PREFIX}{tag}"
+
+
+def _queue_tags(pipe: Any, key: str, tags: Iterable[str], expire_seconds: int | None) -> None:
+    tag_keys = [_tag_key(tag) for tag in tags]
+    if tag_keys:
+        pipe.eval(_TAG_KEY_SCRIPT, len(tag_keys), *tag_keys, key, expire_seconds or 0)
+
+
+def _store(
+    key: str, payload: bytes, expire_seconds: int | None, tags: Iterable[str] | None
+) -> None:
+    if not tags:
+        redis_cache.set(key, payload, ex=expire_seconds)
+        return
+    pipe = redis_cache.pipeline(transaction=False)
+    pipe.set(key, payload, ex=expire_seconds)
+    _queue_tags(pipe, key, tags, expire_seconds)
+    pipe.execute()
+
+
+async def _astore(
+    key: str, payload: bytes, expire_seconds: int | None, tags: Iterable[str] | None
+) -> None:
+    if not tags:
+        await get_async_redis().set(key, payload, ex=expire_seconds)
+        return
+    pipe = get_async_redis().pipeline(transaction=False)
+    pipe.set(key, payload, ex=expire_seconds)
+    _queue_tags(pipe, key, tags, expire_seconds)
+    await pipe.execute()
+
+
+def _compute_and_store(
+    key: str,
+    func: Callable[[], T],
+    expire_seconds: int | None,
+    tags: Iterable[str] | None = None,
+) -> T:
+    start = time.perf_counter()
+    result = func()
+    observe_compute(key, time.perf_counter() - start)
+    payload = encode(result, key)
+    observe_payload(key, len(payload))
+    _store(key, payload, expire_seconds, tags)
+    _remember_local(key, result, payload)
+    return result
+
+
+def _compute_with_lock(
+    key: str,
+    func: Callable[[], T],
+    expire_seconds: int | None,
+    lock_timeout: float,
+    wait_timeout: float,
+    on_lock_timeout: LockTimeoutFallback,
+    tags: Iterable[str] | None = None,
+) -> T:
+    lock_key = _lock_key(key)
+    token = uuid.uuid4().hex
+    if redis_cache.set(lock_key, token, nx=True, px=int(lock_timeout * 1000)):
+        record_single_flight("leader")
+        try:
+            # Another worker may have stored the value between our miss and the lock
+            value = redis_cache.get(key)
+            if value is not None:
+                return _decode(key, value)
+            return _compute_and_store(key, func, expire_seconds, tags)
+        finally:
+            redis_cache.eval(_RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+
+    deadline = time.monotonic() + wait_timeout
+    while time.monotonic() < deadline:
+        time.sleep(CACHE_LOCK_POLL_INTERVAL)
+        value = redis_cache.get(key)
+        if value is not None:
+            record_single_flight("coalesced_remote")
+            return _decode(key, value)
+        if not redis_cache.exists(lock_key):
+            # The lock holder gave up without storing a value
+            break
+    record_single_flight("lock_timeouts")
+    if on_lock_timeout == "raise":
+        raise TimeoutError(f"Timed out waiting for cache lock on {key}")
+    return _compute_and_store(key, func, expire_seconds, tags)
+
+
+_sync_flights = SingleFlight()
+
+
 def get_or_set_cache(
-    key: str, func: Callable[[], T], expire_seconds: int | None = None
+    key: str,
+    func: Callable[[], T],
+    expire_seconds: int | None = None,
+    single_flight: bool = False,
+    lock_timeout: float | None = None,
+    wait_timeout: float | None = None,
+    on_lock_timeout: LockTimeoutFallback = "compute",
+    tags: Iterable[str] | None = None,
 ) -> T:
     """
     Get a value from Redis, or compute and store it if not found.
 
+    With single_flight enabled, concurrent misses for the same key within this
+    process share one call to func, and a short Redis lock lets a single worker
+    recompute while the others wait for its result.
+
     Args:
         key: The cache key to retrieve or store
         func: Function to call if the key is not in the cache
         expire_seconds: Optional cache expiration in seconds
+        single_flight: Collapse concurrent misses into a single computation
+        lock_timeout: Seconds the cross-worker recompute lock is held (default: CACHE_LOCK_TIMEOUT)
+        wait_timeout: Seconds to wait for another worker's result (default: CACHE_LOCK_WAIT_TIMEOUT)
+        on_lock_timeout: "compute" to compute locally after waiting, or "raise" to raise TimeoutError
+        tags: Optional tags recorded for the key, for invalidate_tags
 
     Returns:
         The cached or computed value
     """
+    value = local_cache.get(key)
+    if value is not _MISSING:
+        record_hit(key, local=True)
+        return value
     try:
         value = redis_cache.get(key)
         if value is not None:
-            return pickle.loads(value)
-        result = func()
-        redis_cache.set(key, pickle.dumps(result), ex=expire_seconds)
+            record_hit(key)
+            return _decode(key, value)
+        record_miss(key)
+        if not single_flight:
+            return _compute_and_store(key, func, expire_seconds, tags)
+        result, shared = _sync_flights.do(
+            key,
+            lambda: _compute_with_lock(
+                key,
+                func,
+                expire_seconds,
+                CACHE_LOCK_TIMEOUT if lock_timeout is None else lock_timeout,
+                CACHE_LOCK_WAIT_TIMEOUT if wait_timeout is None else wait_timeout,
+                on_lock_timeout,
+                tags,
+            ),
+        )
+        if shared:
+            record_single_flight("coalesced_local")
         return result
     except Exception as e:
+        record_error(key, "get_or_set")
         logger.error(f"Error computing or caching result in Redis: {str(e)}")
         raise
 
 
-def cache_result(expire_seconds: int | None = None, key_prefix: str = ""):
+async def aget_cached_result(key: str, default: Any = None) -> Any:
     """
-    Decorator that caches the result of a function based on its arguments using Redis.
+    Get a result from the Redis cache without blocking the event loop.
+
+    Args:
+        key: The cache key to retrieve
+        default: Value to return if key is not found (default: None)
+
+    Returns:
+        The cached value or the default value if not found
+    """
+    value = local_cache.get(key)
+    if value is not _MISSING:
+        record_hit(key, local=True)
+        return value
+    try:
+        value = await get_async_redis().get(key)
+        if value is None:
+            record_miss(key)
+            return default
+        record_hit(key)
+        return _decode(key, value)
+    except Exception as e:
+        record_error(key, "get")
+        logger.warning(f"Error retrieving from Redis cache: {str(e)}")
+        return default
+
+
+async def ainvalidate_cache(key: str) -> bool:
+    """
+    Invalidate a specific cache key in Redis without blocking the event loop.
+
+    Args:
+        key: The cache key to invalidate
+
+    Returns:
+        True if the key was found and deleted, False otherwise
+    """
+    local_cache.delete(key)
+    try:
+        pipe = get_async_redis().pipeline(transaction=False)
+        pipe.delete(key)
+        pipe.publish(CACHE_INVALIDATION_CHANNEL, key)
+        deleted, _ = await pipe.execute()
+        return bool(deleted)
+    except Exception as e:
+        record_error(key, "invalidate")
+        logger.warning(f"Error invalidating Redis cache: {str(e)}")
+        return False
+
+
+async def _acompute_and_store(
+    key: str,
+    func: Callable[[], T] | Callable[[], Awaitable[T]],
+    expire_seconds: int | None,
+    tags: Iterable[str] | None = None,
+) -> T:
+    start = time.perf_counter()
+    result = func()
+    if inspect.isawaitable(result):
+        result = await result
+    observe_compute(key, time.perf_counter() - start)
+    payload = encode(result, key)
+    observe_payload(key, len(payload))
+    await _astore(key, payload, expire_seconds, tags)
+    _remember_local(key, result, payload)
+    return result
+
+
+async def _acompute_with_lock(
+    key: str,
+    func: Callable[[], T] | Callable[[], Awaitable[T]],
+    expire_seconds: int | None,
+    lock_timeout: float,
+    wait_timeout: float,
+    on_lock_timeout: LockTimeoutFallback,
+    tags: Iterable[str] | None = None,
+) -> T:
+    client = get_async_redis()
+    lock_key = _lock_key(key)
+    token = uuid.uuid4().hex
+    if await client.set(lock_key, token, nx=True, px=int(lock_timeout * 1000)):
+        record_single_flight("leader")
+        try:
+            value = await client.get(key)
+            if value is not None:
+                return _decode(key, value)
+            return await _acompute_and_store(key, func, expire_seconds, tags)
+        finally:
+            await client.eval(_RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+
+    deadline = time.monotonic() + wait_timeout
+    while time.monotonic() < deadline:
+        await asyncio.sleep(CACHE_LOCK_POLL_INTERVAL)
+        value = await client.get(key)
+        if value is not None:
+            record_single_flight("coalesced_remote")
+            return _decode(key, value)
+        if not await client.exists(lock_key):
+            break
+    record_single_flight("lock_timeouts")
+    if on_lock_timeout == "raise":
+        raise TimeoutError(f"Timed out waiting for cache lock on {key}")
+    return await _acompute_and_store(key, func, expire_seconds, tags)
+
+
+_async_flights = AsyncSingleFlight()
+
+
+async def aget_or_set_cache(
+    key: str,
+    func: Callable[[], T] | Callable[[], Awaitable[T]],
+    expire_seconds: int | None = None,
+    single_flight: bool = False,
+    lock_timeout: float | None = None,
+    wait_timeout: float | None = None,
+    on_lock_timeout: LockTimeoutFallback = "compute",
+    tags: Iterable[str] | None = None,
+) -> T:
+    """
+    Get a value from Redis, or compute and store it if not found (asyncio version).
 
     Args:
+        key: The cache key to retrieve or store
+        func: Function or coroutine function to call if the key is not in the cache
         expire_seconds: Optional cache expiration in seconds
+        single_flight: Collapse concurrent misses into a single computation
+        lock_timeout: Seconds the cross-worker recompute lock is held (default: CACHE_LOCK_TIMEOUT)
+        wait_timeout: Seconds to wait for another worker's result (default: CACHE_LOCK_WAIT_TIMEOUT)
+        on_lock_timeout: "compute" to compute locally after waiting, or "raise" to raise TimeoutError
+        tags: Optional tags recorded for the key, for invalidate_tags
+
+    Returns:
+        The cached or computed value
+    """
+    value = local_cache.get(key)
+    if value is not _MISSING:
+        record_hit(key, local=True)
+        return value
+    try:
+        value = await get_async_redis().get(key)
+        if value is not None:
+            record_hit(key)
+            return _decode(key, value)
+        record_miss(key)
+        if not single_flight:
+            return await _acompute_and_store(key, func, expire_seconds, tags)
+        result, shared = await _async_flights.do(
+            key,
+            lambda: _acompute_with_lock(
+                key,
+                func,
+                expire_seconds,
+                CACHE_LOCK_TIMEOUT if lock_timeout is None else lock_timeout,
+                CACHE_LOCK_WAIT_TIMEOUT if wait_timeout is None else wait_timeout,
+                on_lock_timeout,
+                tags,
+            ),
+        )
+        if shared:
+            record_single_flight("coalesced_local")
+        return result
+    except Exception as e:
+        record_error(key, "get_or_set")
+        logger.error(f"Error computing or caching result in Redis: {str(e)}")
+        raise
+
+
+def _decode_many(keys: list[str], values: list[bytes | None], found: dict[str, Any]) -> None:
+    for key, raw in zip(keys, values, strict=True):
+        if raw is None:
+            record_miss(key)
+            continue
+        try:
+            found[key] = _decode(key, raw)
+            record_hit(key)
+        except Exception as e:
+            record_error(key, "get")
+            logger.warning(f"Error decoding Redis cache value for {key}: {str(e)}")
+
+
+def get_many(keys: Iterable[str]) -> dict[str, Any]:
+    """
+    Get several results from the Redis cache in one round-trip (MGET).
+
+    Args:
+        keys: The cache keys to retrieve
+
+    Returns:
+        Mapping of the keys that were found to their cached values
+    """
+    found: dict[str, Any] = {}
+    remote: list[str] = []
+    for key in dict.fromkeys(keys):
+        value = local_cache.get(key)
+        if value is _MISSING:
+            remote.append(key)
+        else:
+            record_hit(key, local=True)
+            found[key] = value
+    if not remote:
+        return found
+    try:
+        _decode_many(remote, redis_cache.mget(remote), found)
+    except Exception as e:
+        logger.warning(f"Error retrieving from Redis cache: {str(e)}")
+    return found
+
+
+def set_many(mapping: Mapping[str, Any], expire_seconds: int | None = None) -> bool:
+    """
+    Store several values in Redis in one pipelined round-trip.
+
+    Args:
+        mapping: Cache keys and the values to store under them
+        expire_seconds: Optional cache expiration in seconds, applied to every key
+
+    Returns:
+        True if the values were stored, False on a Redis error
+    """
+    if not mapping:
+        return True
+    try:
+        pipe = redis_cache.pipeline(transaction=False)
+        for key, value in mapping.items():
+            payload = encode(value, key)
+            pipe.set(key, payload, ex=expire_seconds)
+            _remember_local(key, value, payload)
+        pipe.execute()
+        return True
+    except Exception as e:
+        logger.warning(f"Error storing values in Redis cache: {str(e)}")
+        return False
+
+
+def get_or_set_many(
+    keys: Iterable[str],
+    loader: Callable[[list[str]], Mapping[str, T]],
+    expire_seconds: int | None = None,
+) -> dict[str, T]:
+    """
+    Get several values from Redis, loading only the missing ones in a single batch.
+
+    Args:
+        keys: The cache keys to retrieve or store
+        loader: Function receiving the missing keys and returning a mapping of key to value;
+            keys it leaves out are not cached
+        expire_seconds: Optional cache expiration in seconds
+
+    Returns:
+        Mapping of key to cached or loaded value, in the order of keys
+    """
+    keys = list(dict.fromkeys(keys))
+    try:
+        found = get_many(keys)
+        missing = [key for key in keys if key not in found]
+        if missing:
+            loaded = loader(missing)
+            set_many(loaded, expire_seconds)
+            found.update(loaded)
+        return {key: found[key] for key in keys if key in found}
+    except Exception as e:
+        logger.error(f"Error computing or caching results in Redis: {str(e)}")
+        raise
+
+
+async def aget_many(keys: Iterable[str]) -> dict[str, Any]:
+    """
+    Get several results from the Redis cache in one round-trip (asyncio version).
+
+    Args:
+        keys: The cache keys to retrieve
+
+    Returns:
+        Mapping of the keys that were found to their cached values
+    """
+    found: dict[str, Any] = {}
+    remote: list[str] = []
+    for key in dict.fromkeys(keys):
+        value = local_cache.get(key)
+        if value is _MISSING:
+            remote.append(key)
+        else:
+            record_hit(key, local=True)
+            found[key] = value
+    if not remote:
+        return found
+    try:
+        _decode_many(remote, await get_async_redis().mget(remote), found)
+    except Exception as e:
+        logger.warning(f"Error retrieving from Redis cache: {str(e)}")
+    return found
+
+
+async def aset_many(mapping: Mapping[str, Any], expire_seconds: int | None = None) -> bool:
+    """
+    Store several values in Redis in one pipelined round-trip (asyncio version).
+
+    Args:
+        mapping: Cache keys and the values to store under them
+        expire_seconds: Optional cache expiration in seconds, applied to every key
+
+    Returns:
+        True if the values were stored, False on a Redis error
+    """
+    if not mapping:
+        return True
+    try:
+        pipe = get_async_redis().pipeline(transaction=False)
+        for key, value in mapping.items():
+            payload = encode(value, key)
+            pipe.set(key, payload, ex=expire_seconds)
+            _remember_local(key, value, payload)
+        await pipe.execute()
+        return True
+    except Exception as e:
+        logger.warning(f"Error storing values in Redis cache: {str(e)}")
+        return False
+
+
+async def aget_or_set_many(
+    keys: Iterable[str],
+    loader: Callable[[list[str]], Mapping[str, T]]
+    | Callable[[list[str]], Awaitable[Mapping[str, T]]],
+    expire_seconds: int | None = None,
+) -> dict[str, T]:
+    """
+    Get several values from Redis, loading only the missing ones in a single batch (asyncio version).
+
+    Args:
+        keys: The cache keys to retrieve or store
+        loader: Function or coroutine function receiving the missing keys and returning a
+            mapping of key to value; keys it leaves out are not cached
+        expire_seconds: Optional cache expiration in seconds
+
+    Returns:
+        Mapping of key to cached or loaded value, in the order of keys
+    """
+    keys = list(dict.fromkeys(keys))
+    try:
+        found = await aget_many(keys)
+        missing = [key for key in keys if key not in found]
+        if missing:
+            loaded = loader(missing)
+            if inspect.isawaitable(loaded):
+                loaded = await loaded
+            await aset_many(loaded, expire_seconds)
+            found.update(loaded)
+        return {key: found[key] for key in keys if key in found}
+    except Exception as e:
+        logger.error(f"Error computing or caching results in Redis: {str(e)}")
+        raise
+
+
+# Background refreshes for stale-while-revalidate entries. Sync callers refresh on
+# a small thread pool; async callers on tasks referenced here until they finish.
+CACHE_REFRESH_WORKERS = int(os.getenv("CACHE_REFRESH_WORKERS", 4))
+_refresh_executor = ThreadPoolExecutor(
+    max_workers=CACHE_REFRESH_WORKERS, thread_name_prefix="cache-refresh"
+)
+_refresh_tasks: set[asyncio.Task] = set()
+
+
+def _make_stale_entry(
+    key: str, value: Any, expire_seconds: int, compute_time: float
+) -> bytes:
+    # The envelope is always pickled; the value inside uses the key's own codec
+    entry = _StaleEntry(encode(value, key), time.time() + expire_seconds, compute_time)
+    return encode(entry, serializer="pickle")
+
+
+def _needs_refresh(entry: _StaleEntry, refresh_ahead: bool, beta: float) -> bool:
+    now = time.time()
+    if now >= entry.soft_expires_at:
+        return True
+    if not refresh_ahead:
+        return False
+    # XFetch: recompute early with a probability that rises as expiry approaches,
+    # scaled by how long the value took to compute
+    return now - entry.compute_time * beta * math.log(1.0 - random.random()) >= entry.soft_expires_at
+
+
+def _refresh_entry(
+    key: str,
+    func: Callable[[], Any],
+    expire_seconds: int,
+    stale_ttl: int,
+    tags: Iterable[str] | None = None,
+) -> Any:
+    start = time.monotonic()
+    result = func()
+    compute_time = time.monotonic() - start
+    observe_compute(key, compute_time)
+    payload = _make_stale_entry(key, result, expire_seconds, compute_time)
+    observe_payload(key, len(payload))
+    _store(key, payload, expire_seconds + stale_ttl, tags)
+    return result
+
+
+def _background_refresh(
+    key: str,
+    func: Callable[[], Any],
+    expire_seconds: int,
+    stale_ttl: int,
+    token: str,
+    tags: Iterable[str] | None = None,
+) -> None:
+    try:
+        _refresh_entry(key, func, expire_seconds, stale_ttl, tags)
+    except Exception as e:
+        logger.warning(f"Error refreshing stale Redis cache entry: {str(e)}")
+    finally:
+        redis_cache.eval(_RELEASE_LOCK_SCRIPT, 1, _lock_key(key), token)
+
+
+def get_or_revalidate_cache(
+    key: str,
+    func: Callable[[], T],
+    expire_seconds: int,
+    stale_ttl: int = 0,
+    refresh_ahead: bool = False,
+    beta: float = 1.0,
+    single_flight: bool = False,
+    tags: Iterable[str] | None = None,
+) -> T:
+    """
+    Get a value from Redis using stale-while-revalidate semantics.
+
+    Values are fresh for expire_seconds and then kept for another stale_ttl
+    seconds. A stale value is returned immediately while one worker (guarded by
+    the Redis lock) recomputes it in the background. With refresh_ahead, fresh
+    values are also recomputed early using XFetch probabilistic expiration.
+
+    Args:
+        key: The cache key to retrieve or store
+        func: Function to call if the key is missing or needs a refresh
+        expire_seconds: Seconds before a value is considered stale
+        stale_ttl: Extra seconds a stale value may still be served
+        refresh_ahead: Enable probabilistic early recomputation
+        beta: XFetch aggressiveness; values above 1.0 refresh earlier
+        single_flight: Collapse concurrent misses into a single computation
+        tags: Optional tags recorded for the key, for invalidate_tags
+
+    Returns:
+        The cached, stale or computed value
+    """
+    try:
+        value = redis_cache.get(key)
+        if value is not None:
+            record_hit(key)
+            entry = decode(value)
+            if not isinstance(entry, _StaleEntry):
+                return entry
+            if _needs_refresh(entry, refresh_ahead, beta):
+                token = uuid.uuid4().hex
+                lock_ms = int(CACHE_LOCK_TIMEOUT * 1000)
+                if redis_cache.set(_lock_key(key), token, nx=True, px=lock_ms):
+                    _refresh_executor.submit(
+                        _background_refresh, key, func, expire_seconds, stale_ttl, token, tags
+                    )
+            return decode(entry.value)
+        record_miss(key)
+        if not single_flight:
+            return _refresh_entry(key, func, expire_seconds, stale_ttl, tags)
+        result, shared = _sync_flights.do(
+            key, lambda: _refresh_entry(key, func, expire_seconds, stale_ttl, tags)
+        )
+        if shared:
+            record_single_flight("coalesced_local")
+        return result
+    except Exception as e:
+        record_error(key, "get_or_set")
+        logger.error(f"Error computing or caching result in Redis: {str(e)}")
+        raise
+
+
+async def _arefresh_entry(
+    key: str,
+    func: Callable[[], T] | Callable[[], Awaitable[T]],
+    expire_seconds: int,
+    stale_ttl: int,
+    tags: Iterable[str] | None = None,
+) -> T:
+    start = time.monotonic()
+    result = func()
+    if inspect.isawaitable(result):
+        result = await result
+    compute_time = time.monotonic() - start
+    observe_compute(key, compute_time)
+    payload = _make_stale_entry(key, result, expire_seconds, compute_time)
+    observe_payload(key, len(payload))
+    await _astore(key, payload, expire_seconds + stale_ttl, tags)
+    return result
+
+
+async def _abackground_refresh(
+    key: str,
+    func: Callable[[], Any] | Callable[[], Awaitable[Any]],
+    expire_seconds: int,
+    stale_ttl: int,
+    token: str,
+    tags: Iterable[str] | None = None,
+) -> None:
+    try:
+        await _arefresh_entry(key, func, expire_seconds, stale_ttl, tags)
+    except Exception as e:
+        logger.warning(f"Error refreshing stale Redis cache entry: {str(e)}")
+    finally:
+        await get_async_redis().eval(_RELEASE_LOCK_SCRIPT, 1, _lock_key(key), token)
+
+
+async def aget_or_revalidate_cache(
+    key: str,
+    func: Callable[[], T] | Callable[[], Awaitable[T]],
+    expire_seconds: int,
+    stale_ttl: int = 0,
+    refresh_ahead: bool = False,
+    beta: float = 1.0,
+    single_flight: bool = False,
+    tags: Iterable[str] | None = None,
+) -> T:
+    """
+    Get a value from Redis using stale-while-revalidate semantics (asyncio version).
+
+    Args:
+        key: The cache key to retrieve or store
+        func: Function or coroutine function to call if the key is missing or needs a refresh
+        expire_seconds: Seconds before a value is considered stale
+        stale_ttl: Extra seconds a stale value may still be served
+        refresh_ahead: Enable probabilistic early recomputation
+        beta: XFetch aggressiveness; values above 1.0 refresh earlier
+        single_flight: Collapse concurrent misses into a single computation
+        tags: Optional tags recorded for the key, for invalidate_tags
+
+    Returns:
+        The cached, stale or computed value
+    """
+    try:
+        client = get_async_redis()
+        value = await client.get(key)
+        if value is not None:
+            record_hit(key)
+            entry = decode(value)
+            if not isinstance(entry, _StaleEntry):
+                return entry
+            if _needs_refresh(entry, refresh_ahead, beta):
+                token = uuid.uuid4().hex
+                lock_ms = int(CACHE_LOCK_TIMEOUT * 1000)
+                if await client.set(_lock_key(key), token, nx=True, px=lock_ms):
+                    task = asyncio.create_task(
+                        _abackground_refresh(
+                            key, func, expire_seconds, stale_ttl, token, tags
+                        )
+                    )
+                    _refresh_tasks.add(task)
+                    task.add_done_callback(_refresh_tasks.discard)
+            return decode(entry.value)
+        record_miss(key)
+        if not single_flight:
+            return await _arefresh_entry(key, func, expire_seconds, stale_ttl, tags)
+        result, shared = await _async_flights.do(
+            key, lambda: _arefresh_entry(key, func, expire_seconds, stale_ttl, tags)
+        )
+        if shared:
+            record_single_flight("coalesced_local")
+        return result
+    except Exception as e:
+        record_error(key, "get_or_set")
+        logger.error(f"Error computing or caching result in Redis: {str(e)}")
+        raise
+
+
+def cache_result(
+    expire_seconds: int | None = None,
+    key_prefix: str = "",
+    single_flight: bool = False,
+    stale_ttl: int | None = None,
+    refresh_ahead: bool = False,
+    refresh_beta: float = 1.0,
+    tags: Iterable[str] | None = None,
+    vary_on: Iterable[str] | None = None,
+    key_func: Callable[..., str] | None = None,
+):
+    """
+    Decorator that caches the result of a function based on its arguments using Redis.
+
+    Keys look like "<key_prefix>:<module>.<qualname>:<hash>". Request objects,
+    sessions and other injected dependencies are left out of the hash (see
+    register_ignored_key_type), so they do not turn every call into a miss.
+    Calls with any other argument that has no meaningful repr are not cached
+    at all; give such functions vary_on or key_func.
+
+    Coroutine functions are detected and awaited, and their results are cached
+    through the asyncio client so the event loop is never blocked.
+
+    Setting stale_ttl or refresh_ahead switches to stale-while-revalidate: after
+    expire_seconds the cached value keeps being served for stale_ttl seconds
+    while a single background task recomputes it.
+
+    Args:
+        expire_seconds: Optional cache expiration in seconds (soft expiry with stale_ttl/refresh_ahead)
         key_prefix: Optional prefix for the cache key
+        single_flight: Collapse concurrent misses into a single computation
+        stale_ttl: Seconds a stale value may be served while it is refreshed
+        refresh_ahead: Recompute probabilistically before expiry (XFetch)
+        refresh_beta: XFetch aggressiveness; values above 1.0 refresh earlier
+        tags: Optional tags recorded for every cached result, for invalidate_tags
+        vary_on: Parameter names that make up the cache key (default: all of them)
+        key_func: Custom function returning the variable part of the key from the call's arguments
 
     Returns:
         Decorated function that uses Redis caching
     """
+    revalidate = stale_ttl is not None or refresh_ahead
+    tags = tuple(tags) if tags else None
+    if revalidate and expire_seconds is None:
+        raise ValueError("stale_ttl and refresh_ahead require expire_seconds")
 
     def decorator(func: Callable[..., T]) -> Callable[..., T]:
+        build_key = make_key_builder(func, key_prefix, vary_on=vary_on, key_func=key_func)
+
+        if inspect.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                key = build_key(args, kwargs)
+                if key is None:
+                    return await func(*args, **kwargs)
+                if revalidate:
+                    return await aget_or_revalidate_cache(
+                        key,
+                        lambda: func(*args, **kwargs),
+                        expire_seconds,
+                        stale_ttl=stale_ttl or 0,
+                        refresh_ahead=refresh_ahead,
+                        beta=refresh_beta,
+                        single_flight=single_flight,
+                        tags=tags,
+                    )
+                return await aget_or_set_cache(
+                    key,
+                    lambda: func(*args, **kwargs),
+                    expire_seconds,
+                    single_flight=single_flight,
+                    tags=tags,
+                )
+
+            return async_wrapper
+
         @wraps(func)
         def wrapper(*args, **kwargs):
-            key_args = json.dumps(args, sort_keys=True, default=str)
-            key_kwargs = json.dumps(kwargs, sort_keys=True, default=str)
-            raw_key = f"{key_prefix}:{func.__name__}:{key_args}:{key_kwargs}"
-            key = hashlib.md5(raw_key.encode()).hexdigest()
-            return get_or_set_cache(key, lambda: func(*args, **kwargs), expire_seconds)
+            key = build_key(args, kwargs)
+            if key is None:
+                return func(*args, **kwargs)
+            if revalidate:
+                return get_or_revalidate_cache(
+                    key,
+                    lambda: func(*args, **kwargs),
+                    expire_seconds,
+                    stale_ttl=stale_ttl or 0,
+                    refresh_ahead=refresh_ahead,
+                    beta=refresh_beta,
+                    single_flight=single_flight,
+                    tags=tags,
+                )
+            return get_or_set_cache(
+                key,
+                lambda: func(*args, **kwargs),
+                expire_seconds,
+                single_flight=single_flight,
+                tags=tags,
+            )
 
         return wrapper
 
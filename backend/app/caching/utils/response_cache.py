@@ -0,0 +1,305 @@
+import logging
+import os
+from collections.abc import Callable, Iterable
+from typing import Any, NamedTuple, TypeVar
+
+from starlette.datastructures import Headers, MutableHeaders, QueryParams
+from starlette.routing import BaseRoute, Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.caching.utils.invalidation import ainvalidate_tags
+from app.caching.utils.keys import credential_identity, hash_key_material
+from app.caching.utils.redis_cache import _astore, aget_cached_result
+from app.caching.utils.serializers import encode
+
+logger = logging.getLogger(__name__)
+
+# Responses with larger bodies are passed through without being cached
+CACHE_RESPONSE_MAX_BYTES = int(os.getenv("CACHE_RESPONSE_MAX_BYTES", 1024 * 1024))
+RESPONSE_CACHE_PREFIX = "http_response"
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_CACHED_HEADERS = ("content-type", "content-language", "content-disposition")
+_MUTATING_METHODS = frozenset({"POST", "PUT", "PATCH", "DELETE"})
+
+
+class ResponseCacheConfig(NamedTuple):
+    expire_seconds: int
+    resources: tuple[str, ...]
+
+
+class _CachedResponse(NamedTuple):
+    status: int
+    headers: list[tuple[bytes, bytes]]
+    body: bytes
+    etag: str
+
+
+def cache_response(expire_seconds: int = 60, resources: Iterable[str] = ()) -> Callable[[F], F]:
+    """
+    Enable the HTTP response cache for a GET endpoint.
+
+    Place it below the router decorator. Resources are templates filled from the
+    request's path and query parameters (e.g. "bucket:{bucket_id}"); a successful
+    request to an endpoint marked with invalidates_response_cache for the same
+    resource drops the cached responses.
+
+    Args:
+        expire_seconds: Time in seconds a response stays cached
+        resources: Resource names this response depends on
+    """
+
+    def decorator(func: F) -> F:
+        func._response_cache = ResponseCacheConfig(expire_seconds, tuple(resources))
+        return func
+
+    return decorator
+
+
+def invalidates_response_cache(*resources: str) -> Callable[[F], F]:
+    """
+    Mark a mutating endpoint as changing the given resources.
+
+    Cached responses for those resources are invalidated when the endpoint
+    answers with a 2xx status, before the response is sent to the client.
+    """
+
+    def decorator(func: F) -> F:
+        func._response_cache_invalidates = resources
+        return func
+
+    return decorator
+
+
+async def ainvalidate_response_cache(*resources: str) -> int:
+    """
+    Invalidate cached responses for resources changed outside a marked endpoint.
+
+    Args:
+        resources: Formatted resource names (e.g. "table:orders")
+
+    Returns:
+        The number of cached responses deleted
+    """
+    return await ainvalidate_tags(*(f"{RESPONSE_CACHE_PREFIX}:{r}" for r in resources))
+
+
+# Per HTTP method, the routes whose endpoint carries a response cache marker and that marker
+MarkedRoutes = dict[str, list[tuple[BaseRoute, Any]]]
+
+
+def _marked_routes(app: Any) -> MarkedRoutes:
+    marked: MarkedRoutes = {}
+    for route in getattr(getattr(app, "router", None), "routes", ()):
+        endpoint = getattr(route, "endpoint", None)
+        config = getattr(endpoint, "_response_cache", None)
+        resources = getattr(endpoint, "_response_cache_invalidates", None)
+        for method in getattr(route, "methods", None) or ():
+            if method == "GET" and config is not None:
+                marked.setdefault(method, []).append((route, config))
+            elif method in _MUTATING_METHODS and resources:
+                marked.setdefault(method, []).append((route, resources))
+    return marked
+
+
+def _match_marked(
+    routes: list[tuple[BaseRoute, Any]], scope: Scope
+) -> tuple[Any, dict[str, Any]]:
+    for route, marker in routes:
+        match, child_scope = route.matches(scope)
+        if match == Match.FULL:
+            return marker, child_scope.get("path_params", {})
+    return None, {}
+
+
+def _resource_params(scope: Scope, path_params: dict[str, Any]) -> dict[str, Any]:
+    return {**QueryParams(scope.get("query_string", b"")), **path_params}
+
+
+def _format_resources(resources: Iterable[str], params: dict[str, Any]) -> list[str]:
+    formatted = []
+    for resource in resources:
+        try:
+            formatted.append(f"{RESPONSE_CACHE_PREFIX}:{resource.format(**params)}")
+        except (KeyError, IndexError):
+            logger.warning(f"Response cache resource '{resource}' has unknown parameters")
+    return formatted
+
+
+# Request headers the cache key depends on, through credential_identity
+_VARY = "Authorization, Cookie"
+
+
+def _auth_identity(headers: Headers) -> str:
+    # Only a hash of the credentials ends up in the key
+    return credential_identity(headers) or "anonymous"
+
+
+def _cache_key(scope: Scope, headers: Headers) -> str:
+    material = b"\n".join(
+        (
+            scope["path"].encode(),
+            b"&".join(sorted(scope.get("query_string", b"").split(b"&"))),
+            _auth_identity(headers).encode(),
+        )
+    )
+    return f"{RESPONSE_CACHE_PREFIX}:{hash_key_material(material)}"
+
+
+def _etag_matches(headers: Headers, etag: str) -> bool:
+    if_none_match = headers.get("if-none-match")
+    if not if_none_match:
+        return False
+    candidates = {tag.strip() for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+class ResponseCacheMiddleware:
+    """
+    ASGI middleware serving endpoints marked with cache_response from Redis.
+
+    Keys cover the path, the sorted query string and a hash of the caller's
+    credentials. Cached and fresh responses carry a strong ETag, and requests
+    with a matching If-None-Match get an empty 304. Only 200 responses with a
+    Content-Length, without Set-Cookie and below CACHE_RESPONSE_MAX_BYTES are stored;
+    streamed responses are passed straight through.
+
+    Marked routes are collected once, on the first request, so only those are
+    matched against each request on top of the router's own match.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self._marked: MarkedRoutes | None = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        method = scope["method"]
+        if method not in _MUTATING_METHODS and method != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        if self._marked is None:
+            self._marked = _marked_routes(scope.get("app"))
+        marker, path_params = _match_marked(self._marked.get(method, []), scope)
+        if marker is None:
+            await self.app(scope, receive, send)
+        elif method == "GET":
+            await self._serve_cached(scope, receive, send, marker, path_params)
+        else:
+            await self._run_invalidating(scope, receive, send, marker, path_params)
+
+    async def _serve_cached(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+        config: ResponseCacheConfig,
+        path_params: dict[str, Any],
+    ) -> None:
+        headers = Headers(scope=scope)
+        key = _cache_key(scope, headers)
+        bypass = "no-cache" in headers.get("cache-control", "")
+
+        cached = None if bypass else await aget_cached_result(key)
+        if isinstance(cached, _CachedResponse):
+            await self._send_cached(send, headers, cached, "HIT")
+            return
+
+        start: Message | None = None
+        chunks: list[bytes] = []
+        size = 0
+        passthrough = False
+
+        async def capture(message: Message) -> None:
+            nonlocal start, size, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                start = message
+                response_headers = Headers(raw=message["headers"])
+                # Streamed responses (no Content-Length) are never buffered
+                if (
+                    message["status"] != 200
+                    or "set-cookie" in response_headers
+                    or "content-length" not in response_headers
+                ):
+                    passthrough = True
+                    await send(message)
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+            chunks.append(message.get("body", b""))
+            size += len(chunks[-1])
+            if size > CACHE_RESPONSE_MAX_BYTES:
+                # Too large to cache; flush what was buffered and stream the rest
+                passthrough = True
+                await send(start)
+                await send({**message, "body": b"".join(chunks)})
+                return
+            if message.get("more_body", False):
+                return
+            body = b"".join(chunks)
+            response = _CachedResponse(
+                status=start["status"],
+                headers=[
+                    (name, value)
+                    for name, value in start["headers"]
+                    if name.decode("latin-1").lower() in _CACHED_HEADERS
+                ],
+                body=body,
+                etag=f'"{hash_key_material(body)}"',
+            )
+            try:
+                await _astore(
+                    key,
+                    encode(response, key, serializer="pickle"),
+                    config.expire_seconds,
+                    _format_resources(config.resources, _resource_params(scope, path_params)),
+                )
+            except Exception as e:
+                logger.warning(f"Error storing response in Redis cache: {str(e)}")
+            await self._send_cached(send, headers, response, "MISS")
+
+        await self.app(scope, receive, capture)
+
+    async def _send_cached(
+        self, send: Send, request_headers: Headers, response: _CachedResponse, status: str
+    ) -> None:
+        if _etag_matches(request_headers, response.etag):
+            headers = MutableHeaders(raw=[])
+            headers["etag"] = response.etag
+            headers["x-cache"] = status
+            headers["vary"] = _VARY
+            await send({"type": "http.response.start", "status": 304, "headers": headers.raw})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        headers = MutableHeaders(raw=list(response.headers))
+        headers["content-length"] = str(len(response.body))
+        headers["etag"] = response.etag
+        headers["x-cache"] = status
+        headers.append("vary", _VARY)
+        await send({"type": "http.response.start", "status": response.status, "headers": headers.raw})
+        await send({"type": "http.response.body", "body": response.body})
+
+    async def _run_invalidating(
+        self,
+        scope: Scope,
+        receive: Receive,
+        send: Send,
+        resources: Iterable[str],
+        path_params: dict[str, Any],
+    ) -> None:
+        async def send_after_invalidating(message: Message) -> None:
+            if message["type"] == "http.response.start" and 200 <= message["status"] < 300:
+                tags = _format_resources(resources, _resource_params(scope, path_params))
+                if tags:
+                    await ainvalidate_tags(*tags)
+            await send(message)
+
+        await self.app(scope, receive, send_after_invalidating)
@@ -0,0 +1,228 @@
+import os
+import pickle
+from collections.abc import Callable
+from typing import Any, NamedTuple
+
+import orjson
+
+# msgpack, zstandard and lz4 come with the "cache" extra
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+# Default codec for cache values, and optional compression of large payloads
+CACHE_SERIALIZER = os.getenv("CACHE_SERIALIZER", "pickle")
+CACHE_COMPRESSION = os.getenv("CACHE_COMPRESSION", "none")
+CACHE_COMPRESSION_THRESHOLD = int(os.getenv("CACHE_COMPRESSION_THRESHOLD", 1024))
+
+# Values written before codecs existed are bare pickles (protocol 2+ starts with PROTO)
+_LEGACY_PICKLE_PREFIX = pickle.PROTO[0]
+
+
+class Serializer(NamedTuple):
+    codec_id: int
+    name: str
+    dumps: Callable[[Any], bytes]
+    loads: Callable[[bytes], Any]
+
+
+class Compressor(NamedTuple):
+    codec_id: int
+    name: str
+    compress: Callable[[bytes], bytes]
+    decompress: Callable[[bytes], bytes]
+
+
+_serializers: dict[str, Serializer] = {}
+_serializers_by_id: dict[int, Serializer] = {}
+_compressors: dict[str, Compressor] = {}
+_compressors_by_id: dict[int, Compressor] = {}
+_prefix_serializers: dict[str, str] = {}
+
+
+def register_serializer(
+    name: str, codec_id: int, dumps: Callable[[Any], bytes], loads: Callable[[bytes], Any]
+) -> None:
+    """
+    Register a value serializer.
+
+    The codec id is written into the header byte of every payload, so it must be
+    stable across deployments and between 1 and 15.
+
+    Args:
+        name: Name used to select the serializer
+        codec_id: Identifier stored in the payload header
+        dumps: Function encoding a value to bytes
+        loads: Function decoding bytes to a value
+    """
+    if not 1 <= codec_id <= 15:
+        raise ValueError("Serializer codec_id must be between 1 and 15")
+    serializer = Serializer(codec_id, name, dumps, loads)
+    _serializers[name] = serializer
+    _serializers_by_id[codec_id] = serializer
+
+
+def register_compressor(
+    name: str,
+    codec_id: int,
+    compress: Callable[[bytes], bytes],
+    decompress: Callable[[bytes], bytes],
+) -> None:
+    """
+    Register a payload compressor.
+
+    Args:
+        name: Name used to select the compressor (e.g. in CACHE_COMPRESSION)
+        codec_id: Identifier stored in the payload header, between 1 and 15
+        compress: Function compressing bytes
+        decompress: Function decompressing bytes
+    """
+    if not 1 <= codec_id <= 15:
+        raise ValueError("Compressor codec_id must be between 1 and 15")
+    compressor = Compressor(codec_id, name, compress, decompress)
+    _compressors[name] = compressor
+    _compressors_by_id[codec_id] = compressor
+
+
+def set_serializer(prefix: str, name: str) -> None:
+    """
+    Use a specific serializer for keys starting with prefix.
+
+    Args:
+        prefix: Exact key or key prefix
+        name: Registered serializer name (e.g. "orjson" for JSON-like query results)
+    """
+    get_serializer(name)
+    _prefix_serializers[prefix] = name
+
+
+def get_serializer(name: str) -> Serializer:
+    try:
+        return _serializers[name]
+    except KeyError:
+        raise ValueError(
+            f"Cache serializer '{name}' is not available (msgpack needs the cache extra); "
+            f"registered serializers: {', '.join(sorted(_serializers))}"
+        )
+
+
+def serializer_for(key: str) -> Serializer:
+    """
+    Get the serializer for a key; the longest matching prefix wins over CACHE_SERIALIZER.
+    """
+    best: str | None = None
+    for prefix in _prefix_serializers:
+        if key.startswith(prefix) and (best is None or len(prefix) > len(best)):
+            best = prefix
+    return get_serializer(CACHE_SERIALIZER if best is None else _prefix_serializers[best])
+
+
+def encode(value: Any, key: str = "", serializer: str | None = None) -> bytes:
+    """
+    Serialize a value for Redis, compressing it when above the size threshold.
+
+    Args:
+        value: Value to encode
+        key: Cache key, used to pick a per-prefix serializer
+        serializer: Explicit serializer name overriding the key's default
+
+    Returns:
+        A header byte (compressor id << 4 | serializer id) followed by the payload
+    """
+    codec = get_serializer(serializer) if serializer else serializer_for(key)
+    payload = codec.dumps(value)
+    compression = 0
+    compressor = _compressors.get(CACHE_COMPRESSION)
+    if compressor is not None and len(payload) >= CACHE_COMPRESSION_THRESHOLD:
+        payload = compressor.compress(payload)
+        compression = compressor.codec_id
+    return bytes(((compression << 4) | codec.codec_id,)) + payload
+
+
+def decode(raw: bytes) -> Any:
+    """
+    Decode a payload written by encode, or by older code that stored bare pickles.
+
+    Values with an unknown header are returned as the raw bytes.
+    """
+    if not raw:
+        return raw
+    header = raw[0]
+    if header == _LEGACY_PICKLE_PREFIX:
+        return pickle.loads(raw)
+    codec = _serializers_by_id.get(header & 0x0F)
+    compression = header >> 4
+    if codec is None or (compression and compression not in _compressors_by_id):
+        return raw
+    payload = raw[1:]
+    if compression:
+        payload = _compressors_by_id[compression].decompress(payload)
+    return codec.loads(payload)
+
+
+def _raw_dumps(value: Any) -> bytes:
+    if not isinstance(value, bytes | bytearray | memoryview):
+        raise TypeError(f"The raw cache serializer only accepts bytes, got {type(value).__name__}")
+    return bytes(value)
+
+
+register_serializer(
+    "pickle", 1, lambda v: pickle.dumps(v, protocol=pickle.HIGHEST_PROTOCOL), pickle.loads
+)
+register_serializer("raw", 4, _raw_dumps, bytes)
+register_serializer(
+    "orjson",
+    2,
+    lambda v: orjson.dumps(v, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS),
+    orjson.loads,
+)
+
+if msgpack is not None:
+    register_serializer(
+        "msgpack",
+        3,
+        lambda v: msgpack.packb(v, use_bin_type=True),
+        lambda b: msgpack.unpackb(b, raw=False),
+    )
+
+if zstandard is not None:
+    register_compressor(
+        "zstd",
+        1,
+        # Compressor objects are not thread-safe, so one is created per call
+        lambda b: zstandard.ZstdCompressor().compress(b),
+        lambda b: zstandard.ZstdDecompressor().decompress(b),
+    )
+
+if lz4_frame is not None:
+    register_compressor("lz4", 2, lz4_frame.compress, lz4_frame.decompress)
+
+
+def check_configured_codecs(serializer: str, compression: str) -> None:
+    """
+    Make sure the configured serializer and compressor are available.
+
+    Raises:
+        ValueError: If either is unknown or its package is not installed
+    """
+    get_serializer(serializer)
+    if compression not in ("none", "") and compression not in _compressors:
+        raise ValueError(
+            f"Cache compression '{compression}' is not available; install the cache "
+            f"extra (uv sync --extra cache) or pick one of: none, {', '.join(sorted(_compressors))}"
+        )
+
+
+# Refuse to start rather than fail every cache write or store values uncompressed
+check_configured_codecs(CACHE_SERIALIZER, CACHE_COMPRESSION)
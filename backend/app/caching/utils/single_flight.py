@@ -0,0 +1,148 @@
+import asyncio
+import threading
+import weakref
+from collections import Counter
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+# Counters describing how many cache misses were collapsed into a shared computation
+_stats: Counter = Counter()
+_stats_lock = threading.Lock()
+
+
+def record_single_flight(event: str, count: int = 1) -> None:
+    """
+    Increment a single-flight counter.
+
+    Args:
+        event: Counter name (e.g. "leader", "coalesced_local", "coalesced_remote")
+        count: Amount to add
+    """
+    with _stats_lock:
+        _stats[event] += count
+
+
+def get_single_flight_stats() -> dict[str, int]:
+    """
+    Get a snapshot of the single-flight counters for this process.
+
+    Returns:
+        Mapping of counter name to value
+    """
+    with _stats_lock:
+        return dict(_stats)
+
+
+def reset_single_flight_stats() -> None:
+    """
+    Reset all single-flight counters for this process.
+    """
+    with _stats_lock:
+        _stats.clear()
+
+
+class _Call:
+    __slots__ = ("event", "result", "error")
+
+    def __init__(self) -> None:
+        self.event = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    """
+    Collapse concurrent calls for the same key into one execution (thread-based).
+
+    The first caller for a key runs the function; callers arriving while it is
+    in flight block until it finishes and receive the same result or exception.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[str, _Call] = {}
+
+    def do(self, key: str, func: Callable[[], T]) -> tuple[T, bool]:
+        """
+        Run func once for all concurrent callers of key.
+
+        Args:
+            key: Key identifying the computation
+            func: Function to execute if no call for key is in flight
+
+        Returns:
+            Tuple of (result, shared) where shared is True if the result came
+            from another caller's execution
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = func()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.event.set()
+        return call.result, False
+
+
+class AsyncSingleFlight:
+    """
+    Collapse concurrent awaits for the same key into one execution (asyncio-based).
+
+    In-flight calls are tracked per event loop because asyncio futures cannot be
+    awaited from a different loop.
+    """
+
+    def __init__(self) -> None:
+        self._calls: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    async def do(self, key: str, func: Callable[[], Awaitable[T]]) -> tuple[T, bool]:
+        """
+        Await func once for all concurrent callers of key.
+
+        Args:
+            key: Key identifying the computation
+            func: Coroutine function to await if no call for key is in flight
+
+        Returns:
+            Tuple of (result, shared) where shared is True if the result came
+            from another caller's execution
+        """
+        loop = asyncio.get_running_loop()
+        calls = self._calls.setdefault(loop, {})
+        future = calls.get(key)
+        if future is not None:
+            # Shield so a cancelled waiter does not cancel the leader's computation
+            return await asyncio.shield(future), True
+
+        future = calls[key] = loop.create_future()
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved in case nobody else was waiting
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            calls.pop(key, None)
@@ -74,6 +74,20 @@ class Settings(BaseSettings):
     TEST_EDGE_FUNCTION: str | None = os.environ.get("TEST_EDGE_FUNCTION", "hello-world")
     SKIP_USER_CREATION: bool = os.environ.get("SKIP_USER_CREATION", "true") == "true"
     REDIS_URL: str | None = os.environ.get("REDIS_URL", "redis://redis:6379/0")
+    # Bearer token Prometheus sends to /monitoring/metrics; without one the endpoint is local-only
+    METRICS_TOKEN: str | None = os.environ.get("METRICS_TOKEN")
+    # Threads running blocking Supabase service calls for async routes
+    SUPABASE_EXECUTOR_WORKERS: int = int(os.environ.get("SUPABASE_EXECUTOR_WORKERS", 16))
+    # Largest object accepted by the storage upload endpoints
+    STORAGE_MAX_UPLOAD_BYTES: int = int(os.environ.get("STORAGE_MAX_UPLOAD_BYTES", 512 * 1024 * 1024))
+    # Connection pool for the data API when db_backend is "postgres"
+    POSTGRES_POOL_MIN_SIZE: int = int(os.environ.get("POSTGRES_POOL_MIN_SIZE", 1))
+    POSTGRES_POOL_MAX_SIZE: int = int(os.environ.get("POSTGRES_POOL_MAX_SIZE", 10))
+    # What the data API may reach when db_backend is "postgres": tables and functions of one
+    # schema, with comma-separated allowlists (no POSTGRES_DATA_TABLES means every table in it)
+    POSTGRES_DATA_SCHEMA: str = os.environ.get("POSTGRES_DATA_SCHEMA", "public")
+    POSTGRES_DATA_TABLES: str = os.environ.get("POSTGRES_DATA_TABLES", "")
+    POSTGRES_DATA_FUNCTIONS: str = os.environ.get("POSTGRES_DATA_FUNCTIONS", "apply_batch")
     CELERY_BROKER_URL: str | None = os.environ.get("CELERY_BROKER_URL", "redis://redis:6379/0")
     CELERY_RESULT_BACKEND: str | None = os.environ.get("CELERY_RESULT_BACKEND", "redis://redis:6379/0")
     SENTRY_DSN: HttpUrl | None = os.environ.get("SENTRY_DSN", "your_sentry_dsn_here")
@@ -1,13 +1,25 @@
+import asyncio
+import hmac
+
 import redis.asyncio as aioredis
 import sentry_sdk
 from fastapi import FastAPI
 from fastapi.routing import APIRoute
 from fastapi_limiter import FastAPILimiter
+from prometheus_client import make_asgi_app
+from starlette.datastructures import Headers
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.middleware.cors import CORSMiddleware
 from starlette.responses import Response
+from starlette.types import ASGIApp, Receive, Scope, Send
 
+from app.api.based_routes.db.filters import load_index_catalog
+from app.api.based_routes.db.storage_client import close_storage_http_client
 from app.api.main import api_router
+from app.api.utils.executor import shutdown_supabase_executor
+from app.api.utils.responses import FastJSONResponse
+from app.caching.utils.redis_cache import close_async_redis
+from app.caching.utils.response_cache import ResponseCacheMiddleware
 from app.core.config import settings
 
 
@@ -25,6 +37,7 @@ app = FastAPI(
     title=settings.PROJECT_NAME,
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     generate_unique_id_function=custom_generate_unique_id,
+    default_response_class=FastJSONResponse,
 )
 
 class SecurityHeadersMiddleware(BaseHTTPMiddleware):
@@ -38,11 +51,44 @@ class SecurityHeadersMiddleware(BaseHTTPMiddleware):
         response.headers['X-XSS-Protection'] = '1; mode=block'
         return response
 
+class MetricsAuthMiddleware:
+    """
+    Require "Authorization: Bearer <METRICS_TOKEN>" on the Prometheus endpoint.
+    """
+
+    def __init__(self, app: ASGIApp, token: str) -> None:
+        self.app = app
+        self.expected = f"Bearer {token}".encode()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] == "http":
+            authorization = Headers(scope=scope).get("authorization", "").encode()
+            if not hmac.compare_digest(authorization, self.expected):
+                response = Response(status_code=401, headers={"WWW-Authenticate": "Bearer"})
+                await response(scope, receive, send)
+                return
+        await self.app(scope, receive, send)
+
 @app.on_event("startup")
 async def startup():
     redis = aioredis.from_url(settings.REDIS_URL, encoding="utf-8", decode_responses=True)
     await FastAPILimiter.init(redis)
+    # Index metadata for unindexed-filter warnings, read once per process; the
+    # Supabase backend's tables are not in the local database
+    if settings.db_backend == "postgres":
+        await asyncio.to_thread(load_index_catalog)
 
+@app.on_event("shutdown")
+async def shutdown():
+    await close_async_redis()
+    shutdown_supabase_executor()
+    await close_storage_http_client()
+    if settings.db_backend == "postgres":
+        from app.api.based_routes.db.postgres import close_pool
+
+        await close_pool()
+
+app.add_middleware(ResponseCacheMiddleware)
 app.add_middleware(SecurityHeadersMiddleware)
 
 # Set all CORS enabled origins
@@ -63,3 +109,12 @@ if settings.all_cors_origins:
 #     return {"message": "This endpoint is rate limited to 5 requests per minute."}
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
+
+# Scraped by Prometheus (see core/prometheus/prometheus.yml). Metric labels name cache key
+# prefixes, so outside local development the endpoint is only served behind METRICS_TOKEN.
+if settings.METRICS_TOKEN:
+    app.mount(
+        "/monitoring/metrics", MetricsAuthMiddleware(make_asgi_app(), settings.METRICS_TOKEN)
+    )
+elif settings.ENVIRONMENT == "local":
+    app.mount("/monitoring/metrics", make_asgi_app())